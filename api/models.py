@@ -661,6 +661,13 @@ class AdvancedOptimizationParameters(BaseModel):
     intensification_threshold: int = Field(default=25, ge=5, le=200, description="Iterations for intensification")
     intensification_factor: float = Field(default=0.8, ge=0.1, le=1.0, description="Factor for intensification")
 
+    # Multi-start parameters
+    num_climbers: int = Field(default=1, ge=1, le=32, description="Independent searches run from different initial solutions")
+
+    # Neighborhood sampling parameters
+    neighborhood_sample_ratio: float = Field(default=1.0, gt=0.0, le=1.0, description="Fraction of generated neighbors evaluated per iteration")
+    exact_evaluation_top_k: Optional[int] = Field(default=None, ge=1, le=500, description="Evaluate only the K best neighbors by approximate score exactly")
+
     # Multi-objective weights
     weights: Optional[Dict[str, float]] = Field(default=None, description="Custom weights for evaluation criteria")
 
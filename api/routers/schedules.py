@@ -11,12 +11,12 @@ from .. import models  # Added import for models
 import json
 import logging
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Body
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy import and_, or_
 from pydantic import BaseModel, ConfigDict
 
 from db_config import get_db
-from models import Surgery, SurgeryRoomAssignment, OperatingRoom, Surgeon, User, SurgeryType, Patient, ScheduleHistory
+from models import Surgery, SurgeryRoomAssignment, OperatingRoom, Surgeon, User, ScheduleHistory
 from api.models import (
     ScheduleAssignment,
     CurrentScheduleResponse,
@@ -274,7 +274,14 @@ async def get_current_schedule(
     start_of_day = datetime.combine(today, datetime.min.time())
     end_of_day = datetime.combine(today, datetime.max.time())
 
-    current_assignments = db.query(SurgeryRoomAssignment).filter(
+    # Load each assignment's surgery and its related rows with batched IN
+    # queries instead of several queries per assignment
+    surgery_loader = selectinload(SurgeryRoomAssignment.surgery)
+    current_assignments = db.query(SurgeryRoomAssignment).options(
+        surgery_loader.selectinload(Surgery.surgeon),
+        surgery_loader.selectinload(Surgery.patient),
+        surgery_loader.selectinload(Surgery.surgery_type_details)
+    ).filter(
         SurgeryRoomAssignment.start_time >= start_of_day,
         SurgeryRoomAssignment.start_time <= end_of_day
     ).all()
@@ -294,18 +301,24 @@ async def get_current_schedule(
     # Process current assignments to build schedule response
     schedule_assignments = []
 
+    room_ids = {assignment.room_id for assignment in current_assignments}
+    rooms_by_id = {
+        room.room_id: room
+        for room in db.query(OperatingRoom).filter(OperatingRoom.room_id.in_(room_ids)).all()
+    }
+
     for assignment in current_assignments:
-        # Fetch surgery details
-        surgery_db = db.query(Surgery).filter(Surgery.surgery_id == assignment.surgery_id).first()
+        # Surgery details were eager-loaded with the assignment
+        surgery_db = assignment.surgery
         if not surgery_db:
             logger.warning(f"Surgery with ID {assignment.surgery_id} not found")
             continue
 
-        # Fetch related data
-        surgeon_db = db.query(Surgeon).filter(Surgeon.surgeon_id == surgery_db.surgeon_id).first()
-        patient_db = db.query(Patient).filter(Patient.patient_id == surgery_db.patient_id).first()
-        room_db = db.query(OperatingRoom).filter(OperatingRoom.room_id == assignment.room_id).first()
-        surgery_type_db = db.query(SurgeryType).filter(SurgeryType.type_id == surgery_db.surgery_type_id).first()
+        # Related data
+        surgeon_db = surgery_db.surgeon
+        patient_db = surgery_db.patient
+        room_db = rooms_by_id.get(assignment.room_id)
+        surgery_type_db = surgery_db.surgery_type_details
 
         # Handle enum conversion safely
         urgency_level = None
@@ -89,6 +89,32 @@ def create_db_engine(url):
             connect_args={"check_same_thread": False}  # Allow multi-threaded access
         )
 
+def create_script_engine(url=DATABASE_URL):
+    """
+    Create a SQLAlchemy engine for one-shot maintenance scripts.
+
+    The fix_* scripts run a short sequence of statements from a fresh
+    process, so this engine keeps a single pooled connection and skips the
+    pre-ping that the application engine issues on every checkout.
+
+    Args:
+        url (str): The database URL.
+
+    Returns:
+        Engine: A SQLAlchemy engine.
+    """
+    echo = os.getenv("SQL_ECHO", "False").lower() in ("true", "1", "t")
+
+    if url.startswith("mysql"):
+        return create_engine(
+            url,
+            echo=echo,
+            pool_size=1,
+            connect_args={"connect_timeout": 30}
+        )
+    else:
+        return create_engine(url, echo=echo)
+
 # Create the engine
 try:
     engine = create_db_engine(DATABASE_URL)
@@ -5,6 +5,7 @@ Debug script to identify frontend-backend authentication mismatches
 import requests
 import json
 from urllib.parse import urlencode
+from debug_secret_key import decode_token_locally
 
 def test_backend_endpoints():
     """Test backend endpoints directly"""
@@ -128,6 +129,13 @@ def test_auth_me_endpoint(token):
         return
     
     print("\n6. Testing /auth/me endpoint...")
+    # Validate the claims locally first; only hit the server for tokens that parse
+    payload = decode_token_locally(token)
+    if payload is None:
+        print("❌ Token failed local decode (bad signature or expired), skipping /auth/me")
+        return
+    print(f"✅ Token decoded locally for {payload['sub']}")
+
     try:
         response = requests.get('http://localhost:8000/api/auth/me',
                               headers={'Authorization': f'Bearer {token}'})
@@ -1,12 +1,17 @@
 from db_config import get_db
 from models import Surgery, SurgeryRoomAssignment, OperatingRoom, Surgeon, Patient, SurgeryType
 from api.models import UrgencyLevel, SurgeryStatus
+from debug_staff_model import fetch_table_counts
 from datetime import datetime, date
 
 def test_schedules_query():
     try:
         db = next(get_db())
 
+        # Probe all relevant tables in one round trip before the detailed checks
+        for table, count in fetch_table_counts(db).items():
+            print(f"{table}: {count} rows")
+
         # Test the query that's used in the schedules endpoint
         today = date.today()
         start_of_day = datetime.combine(today, datetime.min.time())
@@ -1,7 +1,39 @@
 #!/usr/bin/env python3
 import os
+import time
+from functools import lru_cache
 from dotenv import load_dotenv
 
+
+@lru_cache(maxsize=1)
+def get_auth_settings():
+    """Load SECRET_KEY and ALGORITHM once, mirroring api/auth.py defaults."""
+    load_dotenv()
+    secret_key = os.getenv("SECRET_KEY", "your-secret-key-for-development-only")
+    algorithm = os.getenv("ALGORITHM", "HS256")
+    return secret_key, algorithm
+
+
+@lru_cache(maxsize=128)
+def decode_token_locally(token):
+    """
+    Decode a JWT with the local secret, without contacting the server.
+
+    Returns:
+        dict: The token payload, or None if the token is invalid or expired.
+    """
+    from jose import jwt, JWTError
+
+    secret_key, algorithm = get_auth_settings()
+    try:
+        payload = jwt.decode(token, secret_key, algorithms=[algorithm])
+    except JWTError:
+        return None
+    if not payload.get("sub") or payload.get("exp", 0) <= time.time():
+        return None
+    return payload
+
+
 def debug_secret_key():
     """Debug SECRET_KEY configuration"""
     print("SECRET_KEY Debug")
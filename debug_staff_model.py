@@ -9,6 +9,18 @@ from db_config import get_database_url, get_db
 from models import Staff
 import traceback
 
+# Tables probed by the debug scripts, counted in a single UNION ALL round trip
+DEBUG_COUNT_TABLES = ("staff", "surgery", "surgeryroomassignment", "user")
+
+
+def fetch_table_counts(db, tables=DEBUG_COUNT_TABLES):
+    """Return {table: row_count} for the given tables using one SQL batch."""
+    count_sql = " UNION ALL ".join(
+        f"SELECT '{table}' AS table_name, COUNT(*) AS row_count FROM `{table}`" for table in tables
+    )
+    return {table: count for table, count in db.execute(text(count_sql))}
+
+
 def debug_staff_model():
     try:
         print("=== DEBUGGING STAFF MODEL ===")
@@ -47,9 +59,10 @@ def debug_staff_model():
 
         print("\n3. Testing raw SQL query...")
         try:
-            raw_result = db.execute(text("SELECT COUNT(*) FROM staff"))
-            count = raw_result.scalar()
-            print(f"✅ Raw SQL query successful, staff count: {count}")
+            counts = fetch_table_counts(db)
+            print(f"✅ Raw SQL query successful, staff count: {counts['staff']}")
+            for table, count in counts.items():
+                print(f"   {table}: {count}")
         except Exception as e:
             print(f"❌ Raw SQL query failed: {e}")
 
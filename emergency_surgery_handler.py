@@ -9,11 +9,19 @@ This module provides comprehensive emergency surgery handling capabilities inclu
 - Impact analysis and metrics
 """
 
+import copy
 import logging
 import uuid
 import time
-from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional, Tuple
+from bisect import bisect_left
+from functools import cached_property
+from operator import itemgetter
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from models import Surgery, OperatingRoom, Surgeon, Patient, SurgeryType, SurgeryRoomAssignment
@@ -29,13 +37,169 @@ from api.models import (
     UrgencyLevel,
     SurgeryStatus
 )
-from enhanced_tabu_optimizer import EnhancedTabuOptimizer
 from services.notification_service import notification_service, NotificationPriority, NotificationType
-from feasibility_checker import FeasibilityChecker
-from solution_evaluator import SolutionEvaluator
 
 logger = logging.getLogger(__name__)
 
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_US_PER_MINUTE = 60 * 1000 * 1000
+# Bit offset packing an urgency rank above a duration into one integer sort key
+_RANK_SHIFT = 32
+
+
+def _to_epoch_us(value: datetime) -> int:
+    """Convert a datetime to integer microseconds since the epoch for cheap comparisons."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def _from_epoch_us(value: int) -> datetime:
+    """Convert integer microseconds since the epoch back to a naive datetime."""
+    return _EPOCH + timedelta(microseconds=value)
+
+
+def _interval_overlaps(
+    intervals: Optional[Tuple[List[int], List[int]]],
+    start_us: int,
+    end_us: int,
+    _bisect_left=bisect_left
+) -> bool:
+    """
+    Overlap kernel for one resource's sorted (starts, running max ends) lists.
+
+    Intervals [0, i) start before end_us; one of them overlaps iff the
+    largest end among them is after start_us.
+    """
+    if intervals is None:
+        return False
+    starts, max_ends = intervals
+    i = _bisect_left(starts, end_us)
+    return i > 0 and max_ends[i - 1] > start_us
+
+
+@dataclass
+class EmergencyContext:
+    """Per-request values resolved once and shared by the insertion strategies."""
+    __slots__ = (
+        'request', 'max_wait_minutes', 'bump_rank_limit', 'duration',
+        'duration_us', 'earliest_start', 'latest_bump_start_us'
+    )
+
+    request: EmergencySurgeryRequest
+    max_wait_minutes: int
+    bump_rank_limit: int
+    duration: timedelta
+    duration_us: int
+    earliest_start: datetime
+    latest_bump_start_us: Optional[int]
+
+
+class DayScheduleIndex:
+    """
+    Busy intervals of one day's schedule, indexed by room and by surgeon.
+
+    Each key maps to parallel lists of interval start times and running
+    maximum end times (integer microseconds), sorted by start. An overlap
+    probe is then a bisect plus one comparison rather than a scan over every
+    assignment. A day's schedule is static once loaded, so these sorted lists
+    answer overlap queries in O(log N) like an interval tree would, without
+    the rebalancing cost or an extra dependency. Iterating the index yields
+    the underlying assignment rows; epoch_intervals holds their (start, end)
+    microseconds in the same order, and latest_end_us the latest end across
+    the day (None when empty).
+    """
+
+    def __init__(self, assignments: Iterable[Any]):
+        self.assignments = list(assignments)
+        self.epoch_intervals = [
+            (_to_epoch_us(assignment.start_time), _to_epoch_us(assignment.end_time))
+            for assignment in self.assignments
+        ]
+        self.latest_end_us = max((end_us for _, end_us in self.epoch_intervals), default=None)
+        self.by_room = self._group_intervals(lambda a: a.room_id)
+        self.by_surgeon = self._group_intervals(lambda a: a.surgeon_id)
+
+    def __iter__(self):
+        return iter(self.assignments)
+
+    def __len__(self):
+        return len(self.assignments)
+
+    def _group_intervals(self, key) -> Dict[int, Tuple[List[int], List[int]]]:
+        grouped = defaultdict(list)
+        for assignment, interval in zip(self.assignments, self.epoch_intervals):
+            resource_id = key(assignment)
+            if resource_id is not None:
+                grouped[resource_id].append(interval)
+
+        index = {}
+        for resource_id, intervals in grouped.items():
+            intervals.sort()
+            starts = [start for start, _ in intervals]
+            max_ends = list(accumulate((end for _, end in intervals), max))
+            index[resource_id] = (starts, max_ends)
+        return index
+
+    def starts_after_last_surgery(self, start_us: int) -> bool:
+        """Check whether a window starting at start_us begins after every busy interval ends."""
+        return self.latest_end_us is None or start_us >= self.latest_end_us
+
+    def is_free(self, room_id: int, surgeon_id: int, start_us: int, end_us: int) -> bool:
+        """Check that neither the room nor the surgeon is busy in [start_us, end_us)."""
+        if self.starts_after_last_surgery(start_us):
+            return True
+        return not (
+            _interval_overlaps(self.by_room.get(room_id), start_us, end_us)
+            or _interval_overlaps(self.by_surgeon.get(surgeon_id), start_us, end_us)
+        )
+
+    def first_free_pair(
+        self,
+        room_ids: Iterable[int],
+        surgeon_ids: Iterable[int],
+        start_us: int,
+        end_us: int
+    ) -> Optional[Tuple[int, int]]:
+        """
+        Find the first (room_id, surgeon_id) pair free in [start_us, end_us).
+
+        Room and surgeon availability are independent, so each resource is
+        probed once (rooms + surgeons) instead of once per combination
+        (rooms x surgeons). The result matches a nested room-then-surgeon scan.
+        Windows starting after every busy interval has ended (e.g. overtime
+        slots) skip the probes, since no resource can be busy then.
+        """
+        if self.starts_after_last_surgery(start_us):
+            room_id = next(iter(room_ids), None)
+            surgeon_id = next(iter(surgeon_ids), None)
+            if room_id is None or surgeon_id is None:
+                return None
+            return room_id, surgeon_id
+
+        overlaps = _interval_overlaps
+        room_intervals = self.by_room.get
+        surgeon_intervals = self.by_surgeon.get
+
+        free_rooms = (
+            room_id for room_id in room_ids
+            if not overlaps(room_intervals(room_id), start_us, end_us)
+        )
+        room_id = next(free_rooms, None)
+        if room_id is None:
+            return None
+
+        free_surgeons = (
+            surgeon_id for surgeon_id in surgeon_ids
+            if not overlaps(surgeon_intervals(surgeon_id), start_us, end_us)
+        )
+        surgeon_id = next(free_surgeons, None)
+        if surgeon_id is None:
+            return None
+
+        return room_id, surgeon_id
+
 
 class EmergencySurgeryHandler:
     """
@@ -49,6 +213,44 @@ class EmergencySurgeryHandler:
     - Impact analysis and metrics tracking
     """
 
+    # Map surgery urgency to priority weight (unknown levels count as Medium)
+    URGENCY_WEIGHTS = {
+        'Emergency': 1.0,
+        'High': 0.8,
+        'Medium': 0.5,
+        'Low': 0.3
+    }
+    # Integer rank of each urgency in ascending weight order, for cheap comparisons
+    URGENCY_RANKS = {
+        urgency: rank
+        for rank, urgency in enumerate(sorted(URGENCY_WEIGHTS, key=URGENCY_WEIGHTS.get))
+    }
+    DEFAULT_URGENCY_RANK = URGENCY_RANKS['Medium']
+
+    # Insertion strategies to try, in order, for each emergency priority
+    INSERTION_STRATEGIES = {
+        EmergencyPriority.IMMEDIATE: (
+            ConflictResolutionStrategy.BUMP_LOWER_PRIORITY,
+            ConflictResolutionStrategy.USE_BACKUP_ROOM,
+            ConflictResolutionStrategy.EXTEND_HOURS
+        ),
+        EmergencyPriority.URGENT: (
+            ConflictResolutionStrategy.USE_BACKUP_ROOM,
+            ConflictResolutionStrategy.BUMP_LOWER_PRIORITY,
+            ConflictResolutionStrategy.EXTEND_HOURS
+        ),
+        EmergencyPriority.SEMI_URGENT: (
+            ConflictResolutionStrategy.USE_BACKUP_ROOM,
+            ConflictResolutionStrategy.EXTEND_HOURS,
+            ConflictResolutionStrategy.BUMP_LOWER_PRIORITY
+        )
+    }
+    DEFAULT_INSERTION_STRATEGIES = (
+        ConflictResolutionStrategy.USE_BACKUP_ROOM,
+        ConflictResolutionStrategy.EXTEND_HOURS,
+        ConflictResolutionStrategy.MANUAL_REVIEW
+    )
+
     def __init__(self, db_session: Session):
         """
         Initialize the emergency surgery handler.
@@ -57,8 +259,6 @@ class EmergencySurgeryHandler:
             db_session: Database session
         """
         self.db_session = db_session
-        self.feasibility_checker = FeasibilityChecker(db_session)
-        self.solution_evaluator = SolutionEvaluator(db_session)
 
         # Priority mappings for emergency handling
         self.priority_weights = {
@@ -76,8 +276,35 @@ class EmergencySurgeryHandler:
             EmergencyPriority.SCHEDULED: 1440  # 24 hours
         }
 
+        # Strategy handlers, looked up once per strategy attempt
+        self._strategy_dispatch = {
+            ConflictResolutionStrategy.USE_BACKUP_ROOM: self._try_backup_room_insertion,
+            ConflictResolutionStrategy.BUMP_LOWER_PRIORITY: self._try_bump_lower_priority,
+            ConflictResolutionStrategy.EXTEND_HOURS: self._try_extend_hours_insertion
+        }
+
+        # Memoized insertion searches for repeated what-if requests, cleared on any schedule write
+        self._insertion_cache: Dict[Tuple, Dict[str, Any]] = {}
+
+        # Room lists by required room type and the full surgeon list, reused across
+        # back-to-back emergencies and cleared together with the insertion cache
+        self._rooms_cache: Dict[Optional[str], List[OperatingRoom]] = {}
+        self._all_surgeons_cache: Optional[List[Surgeon]] = None
+
         logger.info("Emergency surgery handler initialized")
 
+    @cached_property
+    def feasibility_checker(self):
+        """Feasibility checker, imported and built on first use."""
+        from feasibility_checker import FeasibilityChecker
+        return FeasibilityChecker(self.db_session)
+
+    @cached_property
+    def solution_evaluator(self):
+        """Solution evaluator, imported and built on first use."""
+        from solution_evaluator import SolutionEvaluator
+        return SolutionEvaluator(self.db_session)
+
     def insert_emergency_surgery(
         self,
         request: EmergencySurgeryRequest
@@ -97,6 +324,7 @@ class EmergencySurgeryHandler:
         logger.info(f"Processing emergency surgery insertion: {insertion_id}")
         logger.info(f"Emergency type: {request.emergency_type}, Priority: {request.emergency_priority}")
 
+        # The surgery record, its assignment and any bumps are committed together
         try:
             # Validate request
             self._validate_emergency_request(request)
@@ -110,6 +338,7 @@ class EmergencySurgeryHandler:
             if insertion_result['success']:
                 # Apply the insertion
                 self._apply_emergency_insertion(emergency_surgery, insertion_result, request)
+                self.db_session.commit()
 
                 # Send notifications
                 notifications_sent = self._send_emergency_notifications(
@@ -142,7 +371,8 @@ class EmergencySurgeryHandler:
                 return result
 
             else:
-                # Insertion failed
+                # Insertion failed; keep the unscheduled emergency surgery record
+                self.db_session.commit()
                 logger.warning(f"Failed to insert emergency surgery: {insertion_result.get('reason', 'Unknown')}")
                 return EmergencyInsertionResult(
                     success=False,
@@ -152,6 +382,7 @@ class EmergencySurgeryHandler:
                 )
 
         except Exception as e:
+            self.db_session.rollback()
             logger.error(f"Error inserting emergency surgery: {str(e)}")
             raise
 
@@ -200,9 +431,9 @@ class EmergencySurgeryHandler:
             surgeon_id=request.required_surgeon_id
         )
 
+        # Flush assigns surgery_id; the caller commits once the insertion is resolved
         self.db_session.add(emergency_surgery)
-        self.db_session.commit()
-        self.db_session.refresh(emergency_surgery)
+        self.db_session.flush()
 
         logger.info(f"Created emergency surgery record: {emergency_surgery.surgery_id}")
         return emergency_surgery
@@ -215,9 +446,38 @@ class EmergencySurgeryHandler:
         """
         Find optimal insertion point for emergency surgery.
 
+        Results are memoized per handler on every request field that affects
+        the search, so repeated what-if probes against an unchanged schedule
+        skip the search entirely.
+
         Returns:
             Dictionary with insertion details or failure reason
         """
+        cache_key = (
+            request.arrival_time,
+            request.preferred_start_time,
+            request.emergency_priority,
+            request.duration_minutes,
+            request.max_wait_time_minutes,
+            request.required_room_type,
+            request.required_surgeon_id,
+            request.allow_bumping,
+            request.allow_overtime
+        )
+        cached = self._insertion_cache.get(cache_key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+
+        result = self._search_optimal_insertion(emergency_surgery, request)
+        self._insertion_cache[cache_key] = copy.deepcopy(result)
+        return result
+
+    def _search_optimal_insertion(
+        self,
+        emergency_surgery: Surgery,
+        request: EmergencySurgeryRequest
+    ) -> Dict[str, Any]:
+        """Run the insertion strategies for an emergency surgery against the current schedule."""
         # Get current schedule for the day
         current_schedule = self._get_current_schedule(request.arrival_time.date())
 
@@ -233,10 +493,11 @@ class EmergencySurgeryHandler:
 
         # Try different insertion strategies based on priority
         strategies = self._get_insertion_strategies(request.emergency_priority)
+        context = self._build_emergency_context(request)
 
         for strategy in strategies:
             result = self._try_insertion_strategy(
-                emergency_surgery, request, current_schedule,
+                emergency_surgery, context, current_schedule,
                 available_rooms, available_surgeons, strategy
             )
 
@@ -246,64 +507,61 @@ class EmergencySurgeryHandler:
 
         return {'success': False, 'reason': 'No viable insertion strategy found'}
 
-    def _get_insertion_strategies(self, priority: EmergencyPriority) -> List[ConflictResolutionStrategy]:
+    def _build_emergency_context(self, request: EmergencySurgeryRequest) -> EmergencyContext:
+        """Resolve the per-request values the insertion strategies read repeatedly."""
+        duration = timedelta(minutes=request.duration_minutes)
+        latest_bump_start_us = None
+        if request.preferred_start_time:
+            latest_bump_start_us = _to_epoch_us(request.preferred_start_time + timedelta(hours=2))
+
+        return EmergencyContext(
+            request=request,
+            max_wait_minutes=request.max_wait_time_minutes or self.max_wait_times[request.emergency_priority],
+            bump_rank_limit=self._bump_rank_limit(request.emergency_priority),
+            duration=duration,
+            duration_us=request.duration_minutes * _US_PER_MINUTE,
+            earliest_start=max(request.arrival_time, request.preferred_start_time or request.arrival_time),
+            latest_bump_start_us=latest_bump_start_us
+        )
+
+    def _bump_rank_limit(self, priority: EmergencyPriority) -> int:
+        """
+        Get the urgency rank below which surgeries may be bumped for a priority.
+
+        Ranks follow ascending urgency weight, so weight < priority weight is
+        equivalent to rank < the number of urgency weights below it.
+        """
+        priority_weight = self.priority_weights[priority]
+        return sum(1 for weight in self.URGENCY_WEIGHTS.values() if weight < priority_weight)
+
+    def _get_insertion_strategies(self, priority: EmergencyPriority) -> Tuple[ConflictResolutionStrategy, ...]:
         """Get insertion strategies based on emergency priority."""
-        if priority == EmergencyPriority.IMMEDIATE:
-            return [
-                ConflictResolutionStrategy.BUMP_LOWER_PRIORITY,
-                ConflictResolutionStrategy.USE_BACKUP_ROOM,
-                ConflictResolutionStrategy.EXTEND_HOURS
-            ]
-        elif priority == EmergencyPriority.URGENT:
-            return [
-                ConflictResolutionStrategy.USE_BACKUP_ROOM,
-                ConflictResolutionStrategy.BUMP_LOWER_PRIORITY,
-                ConflictResolutionStrategy.EXTEND_HOURS
-            ]
-        elif priority == EmergencyPriority.SEMI_URGENT:
-            return [
-                ConflictResolutionStrategy.USE_BACKUP_ROOM,
-                ConflictResolutionStrategy.EXTEND_HOURS,
-                ConflictResolutionStrategy.BUMP_LOWER_PRIORITY
-            ]
-        else:
-            return [
-                ConflictResolutionStrategy.USE_BACKUP_ROOM,
-                ConflictResolutionStrategy.EXTEND_HOURS,
-                ConflictResolutionStrategy.MANUAL_REVIEW
-            ]
+        return self.INSERTION_STRATEGIES.get(priority, self.DEFAULT_INSERTION_STRATEGIES)
 
     def _try_insertion_strategy(
         self,
         emergency_surgery: Surgery,
-        request: EmergencySurgeryRequest,
-        current_schedule: List[SurgeryRoomAssignment],
+        context: EmergencyContext,
+        current_schedule: DayScheduleIndex,
         available_rooms: List[OperatingRoom],
         available_surgeons: List[Surgeon],
         strategy: ConflictResolutionStrategy
     ) -> Dict[str, Any]:
         """Try a specific insertion strategy."""
 
-        if strategy == ConflictResolutionStrategy.USE_BACKUP_ROOM:
-            return self._try_backup_room_insertion(
-                emergency_surgery, request, current_schedule, available_rooms, available_surgeons
-            )
-        elif strategy == ConflictResolutionStrategy.BUMP_LOWER_PRIORITY:
-            return self._try_bump_lower_priority(
-                emergency_surgery, request, current_schedule, available_rooms, available_surgeons
-            )
-        elif strategy == ConflictResolutionStrategy.EXTEND_HOURS:
-            return self._try_extend_hours_insertion(
-                emergency_surgery, request, current_schedule, available_rooms, available_surgeons
-            )
-        else:
+        strategy_handler = self._strategy_dispatch.get(strategy)
+        if strategy_handler is None:
             return {'success': False, 'reason': f'Strategy {strategy} not implemented'}
 
+        return strategy_handler(
+            emergency_surgery, context, current_schedule, available_rooms, available_surgeons
+        )
+
     def _try_backup_room_insertion(
         self,
         emergency_surgery: Surgery,
-        request: EmergencySurgeryRequest,
-        current_schedule: List[SurgeryRoomAssignment],
+        context: EmergencyContext,
+        current_schedule: DayScheduleIndex,
         available_rooms: List[OperatingRoom],
         available_surgeons: List[Surgeon]
     ) -> Dict[str, Any]:
@@ -311,14 +569,13 @@ class EmergencySurgeryHandler:
 
         # Find earliest available slot
         earliest_slot = self._find_earliest_available_slot(
-            request, available_rooms, available_surgeons, current_schedule
+            context, available_rooms, available_surgeons, current_schedule
         )
 
         if earliest_slot:
-            wait_time = (earliest_slot['start_time'] - request.arrival_time).total_seconds() / 60
-            max_wait = request.max_wait_time_minutes or self.max_wait_times[request.emergency_priority]
+            wait_time = (earliest_slot['start_time'] - context.request.arrival_time).total_seconds() / 60
 
-            if wait_time <= max_wait:
+            if wait_time <= context.max_wait_minutes:
                 return {
                     'success': True,
                     'room_id': earliest_slot['room_id'],
@@ -335,23 +592,23 @@ class EmergencySurgeryHandler:
     def _try_bump_lower_priority(
         self,
         emergency_surgery: Surgery,
-        request: EmergencySurgeryRequest,
-        current_schedule: List[SurgeryRoomAssignment],
+        context: EmergencyContext,
+        current_schedule: DayScheduleIndex,
         available_rooms: List[OperatingRoom],
         available_surgeons: List[Surgeon]
     ) -> Dict[str, Any]:
         """Try bumping lower priority surgeries."""
 
-        if not request.allow_bumping:
+        if not context.request.allow_bumping:
             return {'success': False, 'reason': 'Bumping not allowed'}
 
         # Find surgeries that can be bumped
-        bumpable_surgeries = self._find_bumpable_surgeries(request, current_schedule)
+        bumpable_surgeries = self._find_bumpable_surgeries(context, current_schedule)
 
         if bumpable_surgeries:
             # Select best candidate for bumping
             best_candidate = self._select_best_bump_candidate(
-                bumpable_surgeries, request, available_rooms, available_surgeons
+                bumpable_surgeries, context, available_rooms, available_surgeons
             )
 
             if best_candidate:
@@ -371,19 +628,19 @@ class EmergencySurgeryHandler:
     def _try_extend_hours_insertion(
         self,
         emergency_surgery: Surgery,
-        request: EmergencySurgeryRequest,
-        current_schedule: List[SurgeryRoomAssignment],
+        context: EmergencyContext,
+        current_schedule: DayScheduleIndex,
         available_rooms: List[OperatingRoom],
         available_surgeons: List[Surgeon]
     ) -> Dict[str, Any]:
         """Try inserting during extended hours."""
 
-        if not request.allow_overtime:
+        if not context.request.allow_overtime:
             return {'success': False, 'reason': 'Overtime not allowed'}
 
         # Find overtime slot
         overtime_slot = self._find_overtime_slot(
-            request, available_rooms, available_surgeons, current_schedule
+            context, available_rooms, available_surgeons, current_schedule
         )
 
         if overtime_slot:
@@ -401,24 +658,51 @@ class EmergencySurgeryHandler:
 
         return {'success': False, 'reason': 'No overtime slots available'}
 
-    def _get_current_schedule(self, schedule_date) -> List[SurgeryRoomAssignment]:
-        """Get current schedule for a specific date."""
-        return (
-            self.db_session.query(SurgeryRoomAssignment)
-            .join(Surgery)
+    def _get_current_schedule(self, schedule_date) -> DayScheduleIndex:
+        """
+        Get current schedule for a specific date.
+
+        The assignment columns are joined with the owning surgery's surgeon,
+        urgency and duration in a single query, and the rows are indexed by
+        room and surgeon once so later conflict checks issue no further SELECTs.
+        """
+        rows = (
+            self.db_session.query(
+                SurgeryRoomAssignment.surgery_id,
+                SurgeryRoomAssignment.room_id,
+                SurgeryRoomAssignment.start_time,
+                SurgeryRoomAssignment.end_time,
+                Surgery.surgeon_id,
+                Surgery.urgency_level,
+                Surgery.duration_minutes
+            )
+            .join(Surgery, Surgery.surgery_id == SurgeryRoomAssignment.surgery_id)
             .filter(Surgery.scheduled_date == schedule_date)
             .all()
         )
+        return DayScheduleIndex(rows)
+
+    def _invalidate_caches(self):
+        """Drop cached insertion searches and resource lists after a schedule write."""
+        self._insertion_cache.clear()
+        self._rooms_cache.clear()
+        self._all_surgeons_cache = None
 
     def _get_available_rooms(self, request: EmergencySurgeryRequest) -> List[OperatingRoom]:
         """Get available operating rooms."""
+        room_type = request.required_room_type or None
+        rooms = self._rooms_cache.get(room_type)
+        if rooms is not None:
+            return rooms
+
         query = self.db_session.query(OperatingRoom)
 
-        if request.required_room_type:
+        if room_type:
             # Filter by room type if specified
-            query = query.filter(OperatingRoom.room_type == request.required_room_type)
+            query = query.filter(OperatingRoom.room_type == room_type)
 
-        return query.all()
+        rooms = self._rooms_cache[room_type] = query.all()
+        return rooms
 
     def _get_available_surgeons(self, request: EmergencySurgeryRequest) -> List[Surgeon]:
         """Get available surgeons."""
@@ -430,38 +714,39 @@ class EmergencySurgeryHandler:
             return [surgeon] if surgeon else []
         else:
             # Get all available surgeons
-            return self.db_session.query(Surgeon).all()
+            if self._all_surgeons_cache is None:
+                self._all_surgeons_cache = self.db_session.query(Surgeon).all()
+            return self._all_surgeons_cache
 
     def _find_earliest_available_slot(
         self,
-        request: EmergencySurgeryRequest,
+        context: EmergencyContext,
         available_rooms: List[OperatingRoom],
         available_surgeons: List[Surgeon],
-        current_schedule: List[SurgeryRoomAssignment]
+        current_schedule: DayScheduleIndex
     ) -> Optional[Dict[str, Any]]:
         """Find the earliest available slot for the emergency surgery."""
 
         # This is a simplified implementation
         # In practice, this would use sophisticated scheduling algorithms
 
-        earliest_time = max(
-            request.arrival_time,
-            request.preferred_start_time or request.arrival_time
-        )
+        slot_start = context.earliest_start
+        slot_end = slot_start + context.duration
 
-        for room in available_rooms:
-            for surgeon in available_surgeons:
-                # Check if this combination is available
-                slot_start = earliest_time
-                slot_end = slot_start + timedelta(minutes=request.duration_minutes)
-
-                if self._is_slot_available(room.room_id, surgeon.surgeon_id, slot_start, slot_end, current_schedule):
-                    return {
-                        'room_id': room.room_id,
-                        'surgeon_id': surgeon.surgeon_id,
-                        'start_time': slot_start,
-                        'end_time': slot_end
-                    }
+        # Check every room and surgeon once rather than every combination
+        free_pair = current_schedule.first_free_pair(
+            (room.room_id for room in available_rooms),
+            (surgeon.surgeon_id for surgeon in available_surgeons),
+            _to_epoch_us(slot_start),
+            _to_epoch_us(slot_end)
+        )
+        if free_pair:
+            return {
+                'room_id': free_pair[0],
+                'surgeon_id': free_pair[1],
+                'start_time': slot_start,
+                'end_time': slot_end
+            }
 
         return None
 
@@ -471,155 +756,136 @@ class EmergencySurgeryHandler:
         surgeon_id: int,
         start_time: datetime,
         end_time: datetime,
-        current_schedule: List[SurgeryRoomAssignment]
+        current_schedule: DayScheduleIndex
     ) -> bool:
         """Check if a time slot is available for given room and surgeon."""
-
-        for assignment in current_schedule:
-            # Check room conflict
-            if assignment.room_id == room_id:
-                if (start_time < assignment.end_time and end_time > assignment.start_time):
-                    return False
-
-            # Check surgeon conflict
-            surgery = self.db_session.query(Surgery).filter(
-                Surgery.surgery_id == assignment.surgery_id
-            ).first()
-
-            if surgery and surgery.surgeon_id == surgeon_id:
-                if (start_time < assignment.end_time and end_time > assignment.start_time):
-                    return False
-
-        return True
+        return current_schedule.is_free(
+            room_id, surgeon_id, _to_epoch_us(start_time), _to_epoch_us(end_time)
+        )
 
     def _find_bumpable_surgeries(
         self,
-        request: EmergencySurgeryRequest,
-        current_schedule: List[SurgeryRoomAssignment]
+        context: EmergencyContext,
+        current_schedule: DayScheduleIndex
     ) -> List[Dict[str, Any]]:
         """Find surgeries that can be bumped for the emergency."""
 
-        bumpable = []
-        emergency_priority_weight = self.priority_weights[request.emergency_priority]
-
-        for assignment in current_schedule:
-            surgery = self.db_session.query(Surgery).filter(
-                Surgery.surgery_id == assignment.surgery_id
-            ).first()
-
-            if surgery:
-                # Check if surgery has lower priority
-                surgery_urgency = getattr(surgery, 'urgency_level', 'Medium')
-
-                # Map urgency to priority weight
-                urgency_weights = {
-                    'Emergency': 1.0,
-                    'High': 0.8,
-                    'Medium': 0.5,
-                    'Low': 0.3
-                }
-
-                surgery_priority_weight = urgency_weights.get(surgery_urgency, 0.5)
+        bump_rank_limit = context.bump_rank_limit
+        urgency_rank = self.URGENCY_RANKS.get
+        default_rank = self.DEFAULT_URGENCY_RANK
 
-                if emergency_priority_weight > surgery_priority_weight:
-                    bumpable.append({
-                        'assignment': assignment,
-                        'surgery': surgery,
-                        'priority_weight': surgery_priority_weight
-                    })
-
-        return bumpable
+        # Surgeries ranked below the emergency's limit have a lower priority weight and can be bumped
+        ranked = (
+            (assignment, interval, urgency_rank(assignment.urgency_level, default_rank))
+            for assignment, interval in zip(current_schedule, current_schedule.epoch_intervals)
+        )
+        return [
+            {
+                'assignment': assignment,
+                'start_us': interval[0],
+                'end_us': interval[1],
+                'urgency_rank': rank,
+                # Same order as (rank, duration) but compares as a single int
+                'sort_key': (rank << _RANK_SHIFT) + assignment.duration_minutes
+            }
+            for assignment, interval, rank in ranked
+            if rank < bump_rank_limit
+        ]
 
     def _select_best_bump_candidate(
         self,
         bumpable_surgeries: List[Dict[str, Any]],
-        request: EmergencySurgeryRequest,
+        context: EmergencyContext,
         available_rooms: List[OperatingRoom],
         available_surgeons: List[Surgeon]
     ) -> Optional[Dict[str, Any]]:
         """Select the best surgery to bump."""
 
-        # Sort by priority (lowest first) and other factors
-        bumpable_surgeries.sort(key=lambda x: (
-            x['priority_weight'],
-            x['surgery'].duration_minutes  # Prefer shorter surgeries
-        ))
+        # Sort by priority (lowest first), then shorter surgeries
+        bumpable_surgeries.sort(key=itemgetter('sort_key'))
+
+        latest_start_us = context.latest_bump_start_us
+        required_us = context.duration_us
 
         for candidate in bumpable_surgeries:
             assignment = candidate['assignment']
-            surgery = candidate['surgery']
 
             # Check if we can use this slot
-            if self._can_use_slot_for_emergency(assignment, request):
+            if self._can_use_slot_for_emergency(
+                candidate['start_us'], candidate['end_us'], latest_start_us, required_us
+            ):
                 return {
                     'room_id': assignment.room_id,
-                    'surgeon_id': surgery.surgeon_id,
+                    'surgeon_id': assignment.surgeon_id,
                     'start_time': assignment.start_time,
-                    'end_time': assignment.start_time + timedelta(minutes=request.duration_minutes),
-                    'bumped_surgery_id': surgery.surgery_id,
+                    'end_time': assignment.start_time + context.duration,
+                    'bumped_surgery_id': assignment.surgery_id,
                     'conflict': {
                         'type': 'priority_bump',
-                        'original_surgery': surgery.surgery_id,
-                        'reason': f'Bumped for emergency priority {request.emergency_priority}'
+                        'original_surgery': assignment.surgery_id,
+                        'reason': f'Bumped for emergency priority {context.request.emergency_priority}'
                     },
-                    'affected_staff': [surgery.surgeon_id] if surgery.surgeon_id else []
+                    'affected_staff': [assignment.surgeon_id] if assignment.surgeon_id else []
                 }
 
         return None
 
     def _can_use_slot_for_emergency(
         self,
-        assignment: SurgeryRoomAssignment,
-        request: EmergencySurgeryRequest
+        start_us: int,
+        end_us: int,
+        latest_start_us: Optional[int],
+        required_us: int
     ) -> bool:
-        """Check if an assignment slot can be used for emergency surgery."""
+        """Check if an assignment slot (epoch microseconds) can be used for emergency surgery."""
 
         # Check timing constraints
-        if request.preferred_start_time:
-            if assignment.start_time > request.preferred_start_time + timedelta(hours=2):
-                return False
-
-        # Check duration compatibility
-        available_duration = (assignment.end_time - assignment.start_time).total_seconds() / 60
-        if available_duration < request.duration_minutes:
+        if latest_start_us is not None and start_us > latest_start_us:
             return False
 
-        return True
+        # Check duration compatibility
+        return end_us - start_us >= required_us
 
     def _find_overtime_slot(
         self,
-        request: EmergencySurgeryRequest,
+        context: EmergencyContext,
         available_rooms: List[OperatingRoom],
         available_surgeons: List[Surgeon],
-        current_schedule: List[SurgeryRoomAssignment]
+        current_schedule: DayScheduleIndex
     ) -> Optional[Dict[str, Any]]:
         """Find an overtime slot for the emergency surgery."""
 
+        arrival_time = context.request.arrival_time
+
         # Find the latest scheduled surgery end time
-        latest_end = request.arrival_time.replace(hour=17, minute=0, second=0, microsecond=0)  # Default 5 PM
+        latest_end = arrival_time.replace(hour=17, minute=0, second=0, microsecond=0)  # Default 5 PM
+        latest_end_us = current_schedule.latest_end_us
 
-        for assignment in current_schedule:
-            if assignment.end_time > latest_end:
-                latest_end = assignment.end_time
+        if latest_end_us is not None and latest_end_us > _to_epoch_us(latest_end):
+            latest_end = _from_epoch_us(latest_end_us)
 
         # Try to schedule after the latest surgery
         overtime_start = latest_end + timedelta(minutes=30)  # 30-minute buffer
-        overtime_end = overtime_start + timedelta(minutes=request.duration_minutes)
+        overtime_end = overtime_start + context.duration
 
         # Check if within reasonable overtime limits (e.g., before 11 PM)
-        max_overtime = request.arrival_time.replace(hour=23, minute=0, second=0, microsecond=0)
+        max_overtime = arrival_time.replace(hour=23, minute=0, second=0, microsecond=0)
 
         if overtime_end <= max_overtime:
             # Find available room and surgeon
-            for room in available_rooms:
-                for surgeon in available_surgeons:
-                    if self._is_slot_available(room.room_id, surgeon.surgeon_id, overtime_start, overtime_end, current_schedule):
-                        return {
-                            'room_id': room.room_id,
-                            'surgeon_id': surgeon.surgeon_id,
-                            'start_time': overtime_start,
-                            'end_time': overtime_end
-                        }
+            free_pair = current_schedule.first_free_pair(
+                (room.room_id for room in available_rooms),
+                (surgeon.surgeon_id for surgeon in available_surgeons),
+                _to_epoch_us(overtime_start),
+                _to_epoch_us(overtime_end)
+            )
+            if free_pair:
+                return {
+                    'room_id': free_pair[0],
+                    'surgeon_id': free_pair[1],
+                    'start_time': overtime_start,
+                    'end_time': overtime_end
+                }
 
         return None
 
@@ -630,6 +896,7 @@ class EmergencySurgeryHandler:
         request: EmergencySurgeryRequest
     ):
         """Apply the emergency surgery insertion to the database."""
+        self._invalidate_caches()
 
         # Update emergency surgery with assignment details
         emergency_surgery.room_id = insertion_result['room_id']
@@ -647,37 +914,43 @@ class EmergencySurgeryHandler:
         self.db_session.add(assignment)
 
         # Handle bumped surgeries
-        for bumped_surgery_id in insertion_result.get('bumped_surgeries', []):
-            self._reschedule_bumped_surgery(bumped_surgery_id, request)
+        bumped_surgery_ids = insertion_result.get('bumped_surgeries', [])
+        if bumped_surgery_ids:
+            self._reschedule_bumped_surgeries(bumped_surgery_ids, request)
 
-        self.db_session.commit()
         logger.info(f"Applied emergency surgery insertion: {emergency_surgery.surgery_id}")
 
-    def _reschedule_bumped_surgery(self, surgery_id: int, emergency_request: EmergencySurgeryRequest):
-        """Reschedule a surgery that was bumped by emergency insertion."""
-
-        # Get the bumped surgery
-        bumped_surgery = self.db_session.query(Surgery).filter(
-            Surgery.surgery_id == surgery_id
-        ).first()
-
-        if not bumped_surgery:
-            logger.error(f"Bumped surgery {surgery_id} not found")
-            return
+    def _reschedule_bumped_surgeries(
+        self,
+        surgery_ids: List[int],
+        emergency_request: EmergencySurgeryRequest
+    ):
+        """Reschedule the surgeries bumped by an emergency insertion in bulk."""
+        self._invalidate_caches()
 
-        # Remove current assignment
+        # Remove current assignments
         self.db_session.query(SurgeryRoomAssignment).filter(
-            SurgeryRoomAssignment.surgery_id == surgery_id
-        ).delete()
+            SurgeryRoomAssignment.surgery_id.in_(surgery_ids)
+        ).delete(synchronize_session=False)
+
+        # Clear surgery scheduling details with a single UPDATE
+        updated = self.db_session.query(Surgery).filter(
+            Surgery.surgery_id.in_(surgery_ids)
+        ).update(
+            {
+                Surgery.room_id: None,
+                Surgery.surgeon_id: None,
+                Surgery.start_time: None,
+                Surgery.end_time: None,
+                Surgery.status: SurgeryStatus.SCHEDULED.value
+            },
+            synchronize_session=False
+        )
 
-        # Clear surgery scheduling details
-        bumped_surgery.room_id = None
-        bumped_surgery.surgeon_id = None
-        bumped_surgery.start_time = None
-        bumped_surgery.end_time = None
-        bumped_surgery.status = SurgeryStatus.SCHEDULED.value
+        if updated < len(set(surgery_ids)):
+            logger.error(f"Some bumped surgeries were not found: {surgery_ids}")
 
-        logger.info(f"Rescheduled bumped surgery: {surgery_id}")
+        logger.info(f"Rescheduled bumped surgeries: {surgery_ids}")
 
     def _send_emergency_notifications(
         self,
@@ -712,20 +985,23 @@ class EmergencySurgeryHandler:
                     )
                     notifications_sent.append(f"surgeon_{surgeon.surgeon_id}")
 
-            # Notifications for bumped surgeries
-            for bumped_surgery_id in insertion_result.get('bumped_surgeries', []):
-                bumped_surgery = self.db_session.query(Surgery).filter(
-                    Surgery.surgery_id == bumped_surgery_id
-                ).first()
+            # Notifications for bumped surgeries, with their surgeons fetched in one query
+            bumped_surgery_ids = insertion_result.get('bumped_surgeries', [])
+            if bumped_surgery_ids:
+                bumped_rows = (
+                    self.db_session.query(Surgery.surgery_id, Surgeon.surgeon_id)
+                    .join(Surgeon, Surgery.surgeon_id == Surgeon.surgeon_id)
+                    .filter(Surgery.surgery_id.in_(bumped_surgery_ids))
+                    .all()
+                )
+                surgeon_by_surgery = dict(bumped_rows)
 
-                if bumped_surgery and bumped_surgery.surgeon_id:
-                    surgeon = self.db_session.query(Surgeon).filter(
-                        Surgeon.surgeon_id == bumped_surgery.surgeon_id
-                    ).first()
+                for bumped_surgery_id in bumped_surgery_ids:
+                    surgeon_id = surgeon_by_surgery.get(bumped_surgery_id)
 
-                    if surgeon:
+                    if surgeon_id:
                         notification_service.send_notification(
-                            recipient_email=f"surgeon_{surgeon.surgeon_id}@hospital.com",
+                            recipient_email=f"surgeon_{surgeon_id}@hospital.com",
                             subject="Surgery Rescheduled Due to Emergency",
                             body=f"Surgery {bumped_surgery_id} has been rescheduled due to emergency priority. "
                                  f"Please check the updated schedule.",
@@ -736,7 +1012,7 @@ class EmergencySurgeryHandler:
                                 'emergency_surgery_id': emergency_surgery.surgery_id
                             }
                         )
-                        notifications_sent.append(f"bumped_surgeon_{surgeon.surgeon_id}")
+                        notifications_sent.append(f"bumped_surgeon_{surgeon_id}")
 
             # Notification to OR staff
             if insertion_result.get('room_id'):
@@ -808,21 +1084,43 @@ class EmergencySurgeryHandler:
     ) -> EmergencyMetrics:
         """Get emergency surgery metrics for a date range."""
 
-        # Query emergency surgeries in date range
-        emergency_surgeries = (
-            self.db_session.query(Surgery)
+        # Count emergency surgeries per type, room and surgeon in one grouped query
+        rows = (
+            self.db_session.query(
+                SurgeryType.name,
+                OperatingRoom.location,
+                Surgeon.name,
+                func.count(Surgery.surgery_id)
+            )
+            .select_from(Surgery)
+            .outerjoin(SurgeryType, Surgery.surgery_type_id == SurgeryType.type_id)
+            .outerjoin(OperatingRoom, Surgery.room_id == OperatingRoom.room_id)
+            .outerjoin(Surgeon, Surgery.surgeon_id == Surgeon.surgeon_id)
             .filter(Surgery.urgency_level == UrgencyLevel.EMERGENCY.value)
             .filter(Surgery.scheduled_date >= start_date.date())
             .filter(Surgery.scheduled_date <= end_date.date())
+            .group_by(SurgeryType.name, OperatingRoom.location, Surgeon.name)
             .all()
         )
 
-        # Calculate metrics
-        total_emergencies = len(emergency_surgeries)
-
-        # Group by type and priority (simplified - would need additional fields)
-        emergencies_by_type = {"Trauma": 5, "Cardiac": 3, "General": 2}  # Example data
-        emergencies_by_priority = {"Immediate": 3, "Urgent": 5, "Semi-Urgent": 2}  # Example data
+        # Roll the grouped counts up into each breakdown
+        total_emergencies = 0
+        emergencies_by_type = defaultdict(int)
+        rooms_used = defaultdict(int)
+        surgeons_involved = defaultdict(int)
+        for type_name, room_location, surgeon_name, count in rows:
+            total_emergencies += count
+            emergencies_by_type[type_name or "Unknown"] += count
+            if room_location:
+                rooms_used[room_location] += count
+            if surgeon_name:
+                surgeons_involved[surgeon_name] += count
+
+        # Surgeries do not store their emergency priority and the filter fixes the
+        # urgency level, so every emergency falls under the one level
+        emergencies_by_priority = {}
+        if total_emergencies:
+            emergencies_by_priority[UrgencyLevel.EMERGENCY.value] = total_emergencies
 
         # Performance metrics (simplified calculations)
         average_wait_time = 45.0  # Would calculate from actual data
@@ -838,7 +1136,7 @@ class EmergencySurgeryHandler:
             date_range_start=start_date.date(),
             date_range_end=end_date.date(),
             total_emergencies=total_emergencies,
-            emergencies_by_type=emergencies_by_type,
+            emergencies_by_type=dict(emergencies_by_type),
             emergencies_by_priority=emergencies_by_priority,
             average_wait_time_minutes=average_wait_time,
             average_insertion_time_seconds=average_insertion_time,
@@ -846,6 +1144,6 @@ class EmergencySurgeryHandler:
             surgeries_bumped=surgeries_bumped,
             overtime_hours_generated=overtime_hours_generated,
             average_disruption_score=average_disruption_score,
-            rooms_used_for_emergencies={"OR-1": 3, "OR-2": 2},  # Example data
-            surgeons_involved={"Dr. Smith": 2, "Dr. Johnson": 3}  # Example data
+            rooms_used_for_emergencies=dict(rooms_used),
+            surgeons_involved=dict(surgeons_involved)
         )
\ No newline at end of file
@@ -9,13 +9,14 @@ This module provides an enhanced Tabu Search optimizer with:
 - Performance monitoring
 """
 
+import heapq
 import logging
 import random
-import copy
 import time
 import uuid
-import hashlib
 import json
+from array import array
+from collections import OrderedDict, deque
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional, Tuple, Callable
 from dataclasses import dataclass
@@ -37,6 +38,65 @@ from api.models import (
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class AssignmentSnapshot:
+    """Plain copy of the assignment fields read from the best solution."""
+    __slots__ = ('surgery_id', 'room_id', 'start_time', 'end_time')
+
+    surgery_id: int
+    room_id: int
+    start_time: datetime
+    end_time: datetime
+
+    @classmethod
+    def take(cls, solution: List[SurgeryRoomAssignment]) -> List['AssignmentSnapshot']:
+        """Snapshot a solution without deep-copying its ORM instance state."""
+        return [cls(a.surgery_id, a.room_id, a.start_time, a.end_time) for a in solution]
+
+
+class ConvergenceTrace:
+    """
+    Per-iteration score history stored as typed columns instead of one dict per entry.
+
+    An entry takes 24 bytes, and max_iterations is capped at 10,000 per climber,
+    so a full trace stays in memory (about 240 KB per climber).
+    """
+    __slots__ = ('iterations', 'current_scores', 'best_scores', 'timestamps')
+
+    def __init__(self):
+        self.iterations = array('l')
+        # Scores are kept as float32: the history is only reported for analysis,
+        # and single precision (~7 significant digits) is well beyond the
+        # objective's meaningful resolution; selection still uses full floats
+        self.current_scores = array('f')
+        self.best_scores = array('f')
+        self.timestamps = array('d')
+
+    def __len__(self) -> int:
+        return len(self.iterations)
+
+    def append(self, iteration: int, current_score: float, best_score: float, timestamp: float):
+        """Record one iteration."""
+        self.iterations.append(iteration)
+        self.current_scores.append(current_score)
+        self.best_scores.append(best_score)
+        self.timestamps.append(timestamp)
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Expand the columns into the per-iteration dicts used by OptimizationResult."""
+        return [
+            {
+                'iteration': iteration,
+                'current_score': current_score,
+                'best_score': best_score,
+                'timestamp': timestamp
+            }
+            for iteration, current_score, best_score, timestamp in zip(
+                self.iterations, self.current_scores, self.best_scores, self.timestamps
+            )
+        ]
+
+
 @dataclass
 class ProgressCallback:
     """Callback for progress updates."""
@@ -56,6 +116,21 @@ class EnhancedTabuOptimizer:
     - Performance monitoring
     """
 
+    # Maximum number of solution scores kept for revisited solutions
+    EVAL_CACHE_SIZE = 4096
+
+    # Number of recent structure hashes kept by the reactive strategies
+    TENURE_HISTORY_SIZE = 20
+
+    # Iterations between recomputations of the cached surgery structure hash
+    STRUCTURE_HASH_REFRESH_INTERVAL = 500
+
+    # Smallest neighborhood kept when neighborhood_sample_ratio < 1
+    MIN_SAMPLED_NEIGHBORS = 8
+
+    # Minimum number of seconds between two progress callbacks
+    PROGRESS_MIN_INTERVAL_SECONDS = 0.1
+
     def __init__(
         self,
         db_session,
@@ -98,13 +173,23 @@ class EnhancedTabuOptimizer:
 
         # Progress tracking
         self.start_time = None
+        self.started_at = None
+        self._last_progress_emit = None
         self.current_iteration = 0
+        self.total_iterations = 0
         self.best_score = float('-inf')
         self.current_score = float('-inf')
         self.iterations_without_improvement = 0
-        self.convergence_data = []
+        self.convergence_data = ConvergenceTrace()
         self.status = OptimizationStatus.PENDING
 
+        # Scores of previously evaluated solutions, keyed by their assignment
+        # tuple so distinct solutions can never share an entry (LRU)
+        self._eval_cache: 'OrderedDict[Tuple[Tuple[Any, ...], ...], float]' = OrderedDict()
+
+        # Structure hash reused across reactive iterations
+        self._structure_hash = None
+
         # Algorithm-specific parameters
         self._setup_algorithm_parameters()
 
@@ -118,97 +203,48 @@ class EnhancedTabuOptimizer:
             self.current_tenure = self.parameters.tabu_tenure
 
         elif self.parameters.algorithm == OptimizationAlgorithm.REACTIVE_TABU:
-            self.tenure_history = []
+            self.tenure_history = deque(maxlen=self.TENURE_HISTORY_SIZE)
             self.repetition_threshold = 5
+            self._structure_hash = None
 
         elif self.parameters.algorithm == OptimizationAlgorithm.HYBRID_TABU:
             # Combine adaptive and reactive features
             self.min_tenure = self.parameters.min_tabu_tenure or max(1, self.parameters.tabu_tenure // 2)
             self.max_tenure = self.parameters.max_tabu_tenure or self.parameters.tabu_tenure * 2
             self.current_tenure = self.parameters.tabu_tenure
-            self.tenure_history = []
+            self.tenure_history = deque(maxlen=self.TENURE_HISTORY_SIZE)
+            self._structure_hash = None
 
     def optimize(self) -> OptimizationResult:
         """
         Run the optimization process.
 
+        With ``num_climbers`` greater than one, several independent searches
+        are run from different random initial solutions. They share the best
+        score found so far, which drives the aspiration criterion of every later
+        search, and the best solution across all of them is returned.
+
         Returns:
             OptimizationResult: Complete optimization result
         """
         try:
             self.status = OptimizationStatus.RUNNING
             self.start_time = time.time()
-
-            # Generate initial solution
-            current_solution = self._generate_initial_solution()
-            if not current_solution:
-                raise ValueError("Failed to generate initial solution")
-
-            # Initialize tracking variables
-            best_solution = copy.deepcopy(current_solution)
-            self.current_score = self.solution_evaluator.evaluate_solution(current_solution)
-            self.best_score = self.current_score
-
-            # Initialize tabu list based on algorithm
-            tabu_list = self._create_tabu_list()
-
-            # Record initial convergence data
-            self._record_convergence_data()
-
-            # Main optimization loop
-            for iteration in range(self.parameters.max_iterations):
-                self.current_iteration = iteration + 1
-
-                # Check termination conditions
-                if self._should_terminate():
-                    break
-
-                # Update tabu list
-                tabu_list.decrement_tenure()
-
-                # Generate neighbors
-                neighbors = self.neighborhood_generator.generate_neighbor_solutions(
-                    current_solution, tabu_list
-                )
-
-                if not neighbors:
-                    logger.warning(f"No neighbors found at iteration {self.current_iteration}")
-                    break
-
-                # Select best neighbor
-                best_neighbor, best_neighbor_score, best_move = self._select_best_neighbor(
-                    neighbors, tabu_list
-                )
-
-                if best_neighbor is None:
-                    logger.warning(f"No valid neighbor found at iteration {self.current_iteration}")
-                    break
-
-                # Update current solution
-                current_solution = best_neighbor
-                self.current_score = best_neighbor_score
-
-                # Update best solution if improved
-                if best_neighbor_score > self.best_score:
-                    best_solution = copy.deepcopy(best_neighbor)
-                    self.best_score = best_neighbor_score
-                    self.iterations_without_improvement = 0
-                    logger.info(f"New best score: {self.best_score:.4f} at iteration {self.current_iteration}")
-                else:
-                    self.iterations_without_improvement += 1
-
-                # Add move to tabu list
-                tabu_list.add(best_move, self._get_current_tenure())
-
-                # Apply algorithm-specific strategies
-                self._apply_algorithm_strategies(iteration, tabu_list)
-
-                # Record convergence data
-                self._record_convergence_data()
-
-                # Update progress
-                if self.parameters.enable_progress_tracking:
-                    self._update_progress()
+            self.started_at = datetime.now()
+
+            best_solution = None
+            with self.feasibility_checker.solving(self.surgeries):
+                for climber in range(self.parameters.num_climbers):
+                    if climber > 0:
+                        # Fresh algorithm state for the next climber; stop when out of time
+                        self._setup_algorithm_parameters()
+                        self.iterations_without_improvement = 0
+                        if self._should_terminate():
+                            break
+                        logger.info(f"Starting climber {climber + 1}/{self.parameters.num_climbers}")
+
+                    best_solution = self._run_climber(best_solution)
+                    self.total_iterations += self.current_iteration
 
             # Finalize optimization
             self.status = OptimizationStatus.COMPLETED
@@ -227,8 +263,105 @@ class EnhancedTabuOptimizer:
             logger.error(f"Optimization failed: {str(e)}")
             raise
 
+    def _run_climber(
+        self,
+        best_solution: Optional[List[AssignmentSnapshot]]
+    ) -> List[AssignmentSnapshot]:
+        """
+        Run one tabu search from a new initial solution.
+
+        Args:
+            best_solution: Best solution found by earlier climbers, if any
+
+        Returns:
+            The best solution found so far, across this and earlier climbers
+        """
+        # Generate initial solution
+        current_solution = self._generate_initial_solution()
+        if not current_solution:
+            raise ValueError("Failed to generate initial solution")
+
+        # Initialize tracking variables
+        self.current_score = self.solution_evaluator.evaluate_solution(current_solution)
+        if best_solution is None or self.current_score > self.best_score:
+            best_solution = AssignmentSnapshot.take(current_solution)
+            self.best_score = self.current_score
+
+        # Initialize tabu list based on algorithm
+        tabu_list = self._create_tabu_list()
+
+        # Record initial convergence data
+        self._record_convergence_data()
+
+        # Bind the per-iteration callables once; the loop runs thousands of times
+        generate_neighbors = self.neighborhood_generator.generate_neighbor_solutions
+        select_best_neighbor = self._select_best_neighbor
+        should_terminate = self._should_terminate
+        apply_algorithm_strategies = self._apply_algorithm_strategies
+        record_convergence_data = self._record_convergence_data
+        update_progress = self._update_progress if self.parameters.enable_progress_tracking else None
+        get_current_tenure = self._get_current_tenure
+        sample_ratio = self.parameters.neighborhood_sample_ratio
+
+        # Main optimization loop
+        for iteration in range(self.parameters.max_iterations):
+            self.current_iteration = iteration + 1
+
+            # Check termination conditions
+            if should_terminate():
+                break
+
+            # Update tabu list
+            tabu_list.decrement_tenure()
+
+            # Generate neighbors
+            neighbors = generate_neighbors(current_solution, tabu_list)
+            if sample_ratio < 1.0:
+                neighbors = self._sample_neighbors(neighbors, sample_ratio)
+
+            if not neighbors:
+                logger.warning(f"No neighbors found at iteration {self.current_iteration}")
+                break
+
+            # Select best neighbor
+            best_neighbor, best_neighbor_score, best_move = select_best_neighbor(
+                neighbors, tabu_list
+            )
+
+            if best_neighbor is None:
+                logger.warning(f"No valid neighbor found at iteration {self.current_iteration}")
+                break
+
+            # Update current solution
+            current_solution = best_neighbor
+            self.current_score = best_neighbor_score
+
+            # Update best solution if improved
+            if best_neighbor_score > self.best_score:
+                best_solution = AssignmentSnapshot.take(best_neighbor)
+                self.best_score = best_neighbor_score
+                self.iterations_without_improvement = 0
+                logger.info(f"New best score: {self.best_score:.4f} at iteration {self.current_iteration}")
+            else:
+                self.iterations_without_improvement += 1
+
+            # Add move to tabu list
+            tabu_list.add(best_move, get_current_tenure())
+
+            # Apply algorithm-specific strategies
+            apply_algorithm_strategies(iteration, tabu_list)
+
+            # Record convergence data
+            record_convergence_data()
+
+            # Update progress
+            if update_progress:
+                update_progress()
+
+        return best_solution
+
     def _generate_initial_solution(self) -> List[SurgeryRoomAssignment]:
-        """Generate initial solution using the base optimizer."""
+        """Generate initial solution using the base optimizer and this optimizer's components."""
         base_optimizer = TabuOptimizer(
             db_session=self.db_session,
             surgeries=self.surgeries,
@@ -236,7 +369,9 @@ class EnhancedTabuOptimizer:
             tabu_tenure=self.parameters.tabu_tenure,
             max_iterations=10,  # Quick initial solution
             max_no_improvement=5,
-            time_limit_seconds=30
+            time_limit_seconds=30,
+            feasibility_checker=self.feasibility_checker,
+            solution_evaluator=self.solution_evaluator
         )
         return base_optimizer.initialize_solution()
 
@@ -277,28 +412,108 @@ class EnhancedTabuOptimizer:
 
     def _select_best_neighbor(self, neighbors, tabu_list) -> Tuple[Optional[List], float, Optional[Any]]:
         """Select the best neighbor considering tabu restrictions."""
-        best_neighbor = None
+        # Score every neighbor first, then reduce with the tabu and aspiration rules
+        neighbor_scores = self._score_neighbors(neighbors, tabu_list)
+
+        # Single argmax pass over the scores; the tabu lookup only runs for
+        # neighbors that would beat the running best and cannot aspirate
+        is_tabu = tabu_list.is_tabu
+        aspiration_score = self.best_score
+        best_index = None
         best_score = float('-inf')
-        best_move = None
+        for index, neighbor_score in enumerate(neighbor_scores):
+            if neighbor_score > best_score and (
+                neighbor_score > aspiration_score or not is_tabu(neighbors[index]['move'])
+            ):
+                best_index = index
+                best_score = neighbor_score
 
-        for neighbor in neighbors:
-            neighbor_solution = neighbor['assignments']
-            neighbor_move = neighbor['move']
+        if best_index is None:
+            return None, best_score, None
 
-            # Evaluate neighbor
-            neighbor_score = self.solution_evaluator.evaluate_solution(neighbor_solution)
+        best_neighbor = neighbors[best_index]
+        return best_neighbor['assignments'], best_score, best_neighbor['move']
 
-            # Check if move is tabu
-            is_tabu = tabu_list.is_tabu(neighbor_move)
+    def _sample_neighbors(self, neighbors, ratio: float):
+        """
+        Keep a random subset of the neighborhood (reduced neighborhood sampling).
+
+        At least MIN_SAMPLED_NEIGHBORS are kept so small neighborhoods are not
+        reduced to a handful of moves.
+        """
+        sample_size = max(self.MIN_SAMPLED_NEIGHBORS, int(len(neighbors) * ratio))
+        if sample_size >= len(neighbors):
+            return neighbors
+        return random.sample(neighbors, sample_size)
 
-            # Apply aspiration criterion or accept non-tabu moves
-            if not is_tabu or neighbor_score > self.best_score:
-                if neighbor_score > best_score:
-                    best_neighbor = neighbor_solution
-                    best_score = neighbor_score
-                    best_move = neighbor_move
+    def _score_neighbors(self, neighbors, tabu_list=None) -> List[float]:
+        """
+        Evaluate each neighbor solution independently.
+
+        Evaluations do not depend on each other, but they run in-process because
+        the evaluator reads through the shared database session and ORM objects,
+        which cannot be handed to worker processes. Neighbors already scored on
+        an earlier iteration are served from the evaluation cache, and the rest
+        are scored as one batch.
+
+        With ``exact_evaluation_top_k`` set, the uncached neighbors are first
+        ranked by the evaluator's approximate score and only the top K are
+        evaluated exactly; the others score ``-inf``. When ``tabu_list`` is
+        given, tabu neighbors are dropped before ranking unless their
+        approximate score beats the best score so far (and so could aspirate),
+        which keeps the K exact evaluations for neighbors that can be selected.
+        """
+        scores: List[Optional[float]] = []
+        misses = []
+        for index, neighbor in enumerate(neighbors):
+            fingerprint = self._solution_fingerprint(neighbor['assignments'])
+            score = self._eval_cache.get(fingerprint)
+            if score is None:
+                misses.append((index, fingerprint))
+            else:
+                self._eval_cache.move_to_end(fingerprint)
+            scores.append(score)
 
-        return best_neighbor, best_score, best_move
+        top_k = self.parameters.exact_evaluation_top_k
+        if top_k and len(misses) > top_k:
+            approximate = self.solution_evaluator.approximate_scores(
+                [neighbors[index]['assignments'] for index, _ in misses]
+            )
+            candidates = range(len(misses))
+            if tabu_list is not None:
+                # Tabu mask before the partition, so a top K made up of tabu
+                # moves cannot leave no admissible neighbor
+                is_tabu = tabu_list.is_tabu
+                aspiration_score = self.best_score
+                candidates = [
+                    position for position in candidates
+                    if approximate[position] > aspiration_score
+                    or not is_tabu(neighbors[misses[position][0]]['move'])
+                ]
+            ranked = heapq.nlargest(top_k, candidates, key=approximate.__getitem__)
+            for position in set(range(len(misses))).difference(ranked):
+                scores[misses[position][0]] = float('-inf')
+            misses = [misses[position] for position in sorted(ranked)]
+
+        if misses:
+            miss_scores = self.solution_evaluator.evaluate_solutions(
+                [neighbors[index]['assignments'] for index, _ in misses]
+            )
+            for (index, fingerprint), score in zip(misses, miss_scores):
+                scores[index] = score
+                self._eval_cache[fingerprint] = score
+            while len(self._eval_cache) > self.EVAL_CACHE_SIZE:
+                self._eval_cache.popitem(last=False)
+
+        return scores
+
+    @staticmethod
+    def _solution_fingerprint(solution) -> Tuple[Tuple[Any, ...], ...]:
+        """Return the assignment state of a solution, which fully determines its score."""
+        return tuple(
+            (a.surgery_id, a.room_id, a.start_time, a.end_time)
+            for a in solution
+        )
 
     def _apply_algorithm_strategies(self, iteration: int, tabu_list: TabuList):
         """Apply algorithm-specific strategies."""
@@ -332,13 +547,12 @@ class EnhancedTabuOptimizer:
 
     def _apply_reactive_strategy(self, iteration: int):
         """Apply reactive tabu search strategy."""
-        # Track solution repetitions
-        solution_hash = self._hash_solution_structure()
-        self.tenure_history.append(solution_hash)
-
-        # Keep only recent history
-        if len(self.tenure_history) > 20:
-            self.tenure_history.pop(0)
+        # Track solution repetitions. The surgery structure does not change
+        # between iterations, so the hash is reused and only recomputed every
+        # STRUCTURE_HASH_REFRESH_INTERVAL iterations to pick up outside changes
+        if self._structure_hash is None or iteration % self.STRUCTURE_HASH_REFRESH_INTERVAL == 0:
+            self._structure_hash = self._hash_solution_structure()
+        self.tenure_history.append(self._structure_hash)
 
     def _apply_hybrid_strategy(self, iteration: int, tabu_list: TabuList):
         """Apply hybrid strategy combining adaptive and reactive features."""
@@ -351,62 +565,74 @@ class EnhancedTabuOptimizer:
         # This would implement diversification logic
         # For now, just log the event
 
-    def _hash_solution_structure(self) -> str:
-        """Create a hash of the current solution structure."""
-        # Simple hash based on room assignments
-        structure = []
-        for surgery in self.surgeries:
-            if hasattr(surgery, 'room_id') and surgery.room_id:
-                structure.append(f"{surgery.surgery_id}:{surgery.room_id}")
+    def _hash_solution_structure(self) -> int:
+        """
+        Create a hash of the current solution structure.
 
-        return hashlib.md5("|".join(sorted(structure)).encode()).hexdigest()[:8]
+        A frozenset hash is independent of order, so no sort or string join is
+        needed, and integer tuples hash the same in every process.
+        """
+        # Simple hash based on room assignments
+        return hash(frozenset(
+            (surgery.surgery_id, surgery.room_id)
+            for surgery in self.surgeries
+            if getattr(surgery, 'room_id', None)
+        ))
 
     def _record_convergence_data(self):
         """Record convergence data for analysis."""
-        self.convergence_data.append({
-            'iteration': self.current_iteration,
-            'current_score': self.current_score,
-            'best_score': self.best_score,
-            'timestamp': time.time() - self.start_time if self.start_time else 0
-        })
+        self.convergence_data.append(
+            self.current_iteration,
+            self.current_score,
+            self.best_score,
+            time.time() - self.start_time if self.start_time else 0
+        )
 
     def _update_progress(self):
-        """Update optimization progress."""
+        """Update optimization progress, emitting at most every PROGRESS_MIN_INTERVAL_SECONDS."""
         if not self.progress_callback:
             return
 
-        if self.current_iteration % self.parameters.progress_update_interval == 0:
-            elapsed_time = time.time() - self.start_time
-            progress_percentage = (self.current_iteration / self.parameters.max_iterations) * 100
+        if self.current_iteration % self.parameters.progress_update_interval != 0:
+            return
 
-            # Estimate remaining time
-            if self.current_iteration > 0:
-                avg_time_per_iteration = elapsed_time / self.current_iteration
-                remaining_iterations = self.parameters.max_iterations - self.current_iteration
-                estimated_remaining = avg_time_per_iteration * remaining_iterations
-            else:
-                estimated_remaining = None
-
-            progress = OptimizationProgress(
-                optimization_id=self.optimization_id,
-                status=self.status,
-                current_iteration=self.current_iteration,
-                total_iterations=self.parameters.max_iterations,
-                best_score=self.best_score,
-                current_score=self.current_score,
-                iterations_without_improvement=self.iterations_without_improvement,
-                elapsed_time_seconds=elapsed_time,
-                estimated_remaining_seconds=estimated_remaining,
-                progress_percentage=progress_percentage,
-                algorithm_used=self.parameters.algorithm,
-                last_update=datetime.now()
-            )
+        now = time.monotonic()
+        if (self._last_progress_emit is not None and
+                now - self._last_progress_emit < self.PROGRESS_MIN_INTERVAL_SECONDS):
+            return
+        self._last_progress_emit = now
+
+        elapsed_time = time.time() - self.start_time
+        progress_percentage = (self.current_iteration / self.parameters.max_iterations) * 100
+
+        # Estimate remaining time
+        if self.current_iteration > 0:
+            avg_time_per_iteration = elapsed_time / self.current_iteration
+            remaining_iterations = self.parameters.max_iterations - self.current_iteration
+            estimated_remaining = avg_time_per_iteration * remaining_iterations
+        else:
+            estimated_remaining = None
+
+        progress = OptimizationProgress(
+            optimization_id=self.optimization_id,
+            status=self.status,
+            current_iteration=self.current_iteration,
+            total_iterations=self.parameters.max_iterations,
+            best_score=self.best_score,
+            current_score=self.current_score,
+            iterations_without_improvement=self.iterations_without_improvement,
+            elapsed_time_seconds=elapsed_time,
+            estimated_remaining_seconds=estimated_remaining,
+            progress_percentage=progress_percentage,
+            algorithm_used=self.parameters.algorithm,
+            last_update=self.started_at + timedelta(seconds=elapsed_time)
+        )
 
-            self.progress_callback.callback(progress)
+        self.progress_callback.callback(progress)
 
     def _create_optimization_result(
         self,
-        best_solution: List[SurgeryRoomAssignment],
+        best_solution: List[AssignmentSnapshot],
         execution_time: float
     ) -> OptimizationResult:
         """Create the final optimization result."""
@@ -436,16 +662,16 @@ class EnhancedTabuOptimizer:
             assignments=assignments,  # Would be properly populated in full implementation
             score=self.best_score,
             detailed_metrics=detailed_metrics,
-            iteration_count=self.current_iteration,
+            iteration_count=self.total_iterations,
             execution_time_seconds=execution_time,
             algorithm_used=self.parameters.algorithm,
             parameters_used=self.parameters,
-            convergence_data=self.convergence_data,
+            convergence_data=self.convergence_data.to_records(),
             solution_quality_analysis=quality_analysis,
             cached=False
         )
 
-    def _analyze_solution_quality(self, solution: List[SurgeryRoomAssignment]) -> Dict[str, Any]:
+    def _analyze_solution_quality(self, solution: List[AssignmentSnapshot]) -> Dict[str, Any]:
         """Analyze solution quality and provide insights."""
         analysis = {
             'total_assignments': len(solution),
@@ -6,8 +6,11 @@ and checks all constraints for surgery scheduling.
 """
 
 import logging
-from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional, Union
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
+from datetime import datetime, time, timedelta
+from typing import List, Dict, Any, Optional, Tuple, Union
 from sqlalchemy.orm import Session
 
 from models import (
@@ -25,6 +28,9 @@ from models import (
 
 logger = logging.getLogger(__name__)
 
+# English day names by datetime.weekday(), as stored in SurgeonAvailability.day_of_week
+WEEKDAY_NAMES = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+
 class FeasibilityChecker:
     """
     Feasibility checker for surgery scheduling.
@@ -38,6 +44,12 @@ class FeasibilityChecker:
     - Patient constraints
     """
 
+    # Maximum number of cached equipment verdicts
+    VERDICT_CACHE_SIZE = 65536
+
+    # Maximum number of IDs per IN clause when prefetching (SQLite's parameter limit)
+    PREFETCH_CHUNK_SIZE = 999
+
     def __init__(self, db_session: Optional[Session] = None):
         """
         Initialize the feasibility checker.
@@ -54,6 +66,28 @@ class FeasibilityChecker:
         self.surgeon_preferences_cache = {}
         self.surgeon_availability_cache = {}
         self.room_equipment_cache = {}
+        self.equipment_usages_cache = {}
+
+        # Equipment names by room_id and required equipment names by surgery type_id
+        self.room_equipment_names_cache = {}
+        self.required_equipment_cache = {}
+
+        # Room suitability verdicts keyed by (room_id, surgery_id)
+        self.suitability_cache = {}
+
+        # Surgeon of each surgery, fixed for the duration of a solve; None outside one
+        self.solve_surgeon_ids = None
+
+        # Parsed availability windows by surgeon_id, as {day_of_week: [(start, end)]}
+        self.availability_windows_cache = {}
+
+        # Equipment usages by equipment_id as (starts, usages, longest duration),
+        # sorted by start time; None until loaded from the database
+        self.equipment_usage_index = None
+
+        # Equipment verdicts, which do not depend on the other assignments, keyed
+        # by (surgery_id, start_time, end_time, surgery_id_to_ignore)
+        self.verdict_cache = OrderedDict()
 
         # Load data into cache if db_session is provided
         if self.db_session:
@@ -105,6 +139,14 @@ class FeasibilityChecker:
                 if re.room_id not in self.room_equipment_cache:
                     self.room_equipment_cache[re.room_id] = []
                 self.room_equipment_cache[re.room_id].append(re)
+            self.room_equipment_names_cache = {
+                room_id: frozenset(re.equipment_name for re in equipment)
+                for room_id, equipment in self.room_equipment_cache.items()
+            }
+
+            # Load equipment usages
+            equipment_usages = self.db_session.query(SurgeryEquipmentUsage).all()
+            self.equipment_usage_index = self._build_equipment_usage_index(equipment_usages)
 
             logger.info("Cache data loaded successfully")
         except Exception as e:
@@ -135,7 +177,7 @@ class FeasibilityChecker:
         if self.db_session:
             surgeon = self.surgeons_cache.get(surgeon_id)
             if not surgeon:
-                surgeon = self.db_session.query(Surgeon).filter_by(surgeon_id=surgeon_id).first()
+                surgeon = self.db_session.get(Surgeon, surgeon_id)
                 if surgeon:
                     self.surgeons_cache[surgeon_id] = surgeon
 
@@ -143,28 +185,28 @@ class FeasibilityChecker:
             logger.warning(f"Surgeon {surgeon_id} not found")
             return False
 
-        # Check if surgeon is available (general availability flag)
-        if hasattr(surgeon, 'availability') and not surgeon.availability:
+        # Check if surgeon is available (general availability flag, if the model has one)
+        if not getattr(surgeon, 'availability', True):
             logger.info(f"Surgeon {surgeon_id} is marked as unavailable")
             return False
 
-        # Check for conflicts with existing assignments
+        # Check for conflicts with existing assignments, with the attributes
+        # used in the loop bound to locals
+        session = self.db_session
+        surgeries_cache = self.surgeries_cache
         for assignment in current_assignments:
             # Skip the assignment we're ignoring
             if surgery_id_to_ignore and assignment.surgery_id == surgery_id_to_ignore:
                 continue
 
-            # Get the surgery for this assignment
-            surgery = None
-            if hasattr(assignment, 'surgery') and assignment.surgery:
-                surgery = assignment.surgery
-            elif self.db_session:
-                surgery_id = assignment.surgery_id
-                surgery = self.surgeries_cache.get(surgery_id)
-                if not surgery:
-                    surgery = self.db_session.query(Surgery).filter_by(surgery_id=surgery_id).first()
-                    if surgery:
-                        self.surgeries_cache[surgery_id] = surgery
+            # Get the surgery for this assignment, preferring the cache so an
+            # unloaded surgery relationship does not lazy-load per assignment
+            surgery_id = assignment.surgery_id
+            surgery = surgeries_cache.get(surgery_id) or getattr(assignment, 'surgery', None)
+            if not surgery and session:
+                surgery = session.get(Surgery, surgery_id)
+                if surgery:
+                    surgeries_cache[surgery_id] = surgery
 
             if not surgery:
                 continue
@@ -181,28 +223,27 @@ class FeasibilityChecker:
         # Check surgeon's specific availability schedule if available
         if self.db_session:
             # Get day of week and time of day
-            day_of_week = start_time.strftime('%A')
+            day_of_week = WEEKDAY_NAMES[start_time.weekday()]
             start_time_of_day = start_time.time()
             end_time_of_day = end_time.time()
 
             # Check if we have specific availability data
-            availabilities = self.surgeon_availability_cache.get(surgeon_id, [])
-            if not availabilities:
-                availabilities = self.db_session.query(SurgeonAvailability).filter_by(surgeon_id=surgeon_id).all()
-                self.surgeon_availability_cache[surgeon_id] = availabilities
+            windows = self.availability_windows_cache.get(surgeon_id)
+            if windows is None:
+                availabilities = self.surgeon_availability_cache.get(surgeon_id)
+                if availabilities is None:
+                    availabilities = self.db_session.query(SurgeonAvailability).filter_by(surgeon_id=surgeon_id).all()
+                    self.surgeon_availability_cache[surgeon_id] = availabilities
+                windows = self._parse_availability_windows(availabilities)
+                self.availability_windows_cache[surgeon_id] = windows
 
             # If we have specific availability data, check it
-            if availabilities:
-                is_available = False
-                for avail in availabilities:
-                    if avail.day_of_week == day_of_week:
-                        avail_start = datetime.strptime(avail.start_time, '%H:%M').time()
-                        avail_end = datetime.strptime(avail.end_time, '%H:%M').time()
-
-                        # Check if the proposed time slot is within the availability window
-                        if start_time_of_day >= avail_start and end_time_of_day <= avail_end:
-                            is_available = True
-                            break
+            if windows:
+                # Check if the proposed time slot is within an availability window
+                is_available = any(
+                    start_time_of_day >= avail_start and end_time_of_day <= avail_end
+                    for avail_start, avail_end in windows.get(day_of_week, ())
+                )
 
                 if not is_available:
                     logger.info(f"Surgeon {surgeon_id} is not available on {day_of_week} from {start_time_of_day} to {end_time_of_day}")
@@ -210,6 +251,17 @@ class FeasibilityChecker:
 
         return True
 
+    @staticmethod
+    def _parse_availability_windows(availabilities) -> Dict[str, List[Tuple[time, time]]]:
+        """Parse a surgeon's "HH:MM" availability rows once into time windows by day."""
+        windows = defaultdict(list)
+        for avail in availabilities:
+            windows[avail.day_of_week].append((
+                datetime.strptime(avail.start_time, '%H:%M').time(),
+                datetime.strptime(avail.end_time, '%H:%M').time()
+            ))
+        return dict(windows)
+
     def is_equipment_available(
         self,
         equipment_id: int,
@@ -235,7 +287,7 @@ class FeasibilityChecker:
         if self.db_session:
             equipment = self.equipment_cache.get(equipment_id)
             if not equipment:
-                equipment = self.db_session.query(SurgeryEquipment).filter_by(equipment_id=equipment_id).first()
+                equipment = self.db_session.get(SurgeryEquipment, equipment_id)
                 if equipment:
                     self.equipment_cache[equipment_id] = equipment
 
@@ -243,27 +295,31 @@ class FeasibilityChecker:
             logger.warning(f"Equipment {equipment_id} not found")
             return False
 
-        # Check if equipment is available (general availability flag)
-        if hasattr(equipment, 'availability') and not equipment.availability:
+        # Check if equipment is available (general availability flag, if the model has one)
+        if not getattr(equipment, 'availability', True):
             logger.info(f"Equipment {equipment_id} is marked as unavailable")
             return False
 
         # Check for conflicts with existing equipment usages
-        if self.db_session:
+        if self.equipment_usage_index is not None:
+            equipment_usages = self._overlapping_equipment_usages(equipment_id, start_time, end_time)
+        elif self.db_session:
             # Get equipment usages that overlap with the proposed time slot
             equipment_usages = self.db_session.query(SurgeryEquipmentUsage).filter(
                 SurgeryEquipmentUsage.equipment_id == equipment_id,
                 SurgeryEquipmentUsage.usage_start_time < end_time,
                 SurgeryEquipmentUsage.usage_end_time > start_time
             ).all()
+        else:
+            equipment_usages = []
 
-            for usage in equipment_usages:
-                # Skip the usage for the surgery we're ignoring
-                if surgery_id_to_ignore and usage.surgery_id == surgery_id_to_ignore:
-                    continue
+        for usage in equipment_usages:
+            # Skip the usage for the surgery we're ignoring
+            if surgery_id_to_ignore and usage.surgery_id == surgery_id_to_ignore:
+                continue
 
-                logger.debug(f"Equipment {equipment_id} is in use for surgery {usage.surgery_id} during proposed slot")
-                return False
+            logger.debug(f"Equipment {equipment_id} is in use for surgery {usage.surgery_id} during proposed slot")
+            return False
 
         return True
 
@@ -292,7 +348,7 @@ class FeasibilityChecker:
         if self.db_session:
             room = self.rooms_cache.get(room_id)
             if not room:
-                room = self.db_session.query(OperatingRoom).filter_by(room_id=room_id).first()
+                room = self.db_session.get(OperatingRoom, room_id)
                 if room:
                     self.rooms_cache[room_id] = room
 
@@ -300,25 +356,23 @@ class FeasibilityChecker:
             logger.warning(f"Room {room_id} not found")
             return False
 
-        # Check for conflicts with existing assignments
-        for assignment in current_assignments:
-            # Skip the assignment we're ignoring
-            if surgery_id_to_ignore and assignment.surgery_id == surgery_id_to_ignore:
-                continue
-
-            # Skip if not the same room
-            if assignment.room_id != room_id:
-                continue
-
-            # Check for overlap
-            if (start_time < assignment.end_time and end_time > assignment.start_time):
-                logger.debug(f"Room {room_id} is busy with surgery {assignment.surgery_id} during proposed slot")
-                return False
+        # Check for conflicts with existing assignments in the same room, testing
+        # the cheap room match first and skipping the assignment we're ignoring
+        conflict = next((
+            assignment for assignment in current_assignments
+            if assignment.room_id == room_id
+            and start_time < assignment.end_time and end_time > assignment.start_time
+            and not (surgery_id_to_ignore and assignment.surgery_id == surgery_id_to_ignore)
+        ), None)
+        if conflict is not None:
+            logger.debug(f"Room {room_id} is busy with surgery {conflict.surgery_id} during proposed slot")
+            return False
 
         # Check room's operational hours if available
-        if hasattr(room, 'operational_start_time') and room.operational_start_time:
+        operational_start_time = getattr(room, 'operational_start_time', None)
+        if operational_start_time:
             # Get operational start and end times for the day
-            op_start_time = datetime.combine(start_time.date(), room.operational_start_time)
+            op_start_time = datetime.combine(start_time.date(), operational_start_time)
             # Assume 8-hour operational day if not specified
             op_end_time = op_start_time + timedelta(hours=8)
 
@@ -348,10 +402,27 @@ class FeasibilityChecker:
             # Without a database session, we can't check room suitability
             return True
 
+        key = (room_id, surgery_id)
+        suitable = self.suitability_cache.get(key)
+        if suitable is None:
+            suitable = self._is_room_suitable_impl(room_id, surgery_id)
+            self.suitability_cache[key] = suitable
+        return suitable
+
+    def invalidate_suitability_cache(self):
+        """Forget cached suitability verdicts, e.g. after room or surgery type equipment changed."""
+        self.suitability_cache.clear()
+        self.verdict_cache.clear()
+        self.room_equipment_cache.clear()
+        self.room_equipment_names_cache.clear()
+        self.required_equipment_cache.clear()
+
+    def _is_room_suitable_impl(self, room_id: int, surgery_id: int) -> bool:
+        """Check room suitability without consulting the suitability cache."""
         # Get the surgery
         surgery = self.surgeries_cache.get(surgery_id)
         if not surgery:
-            surgery = self.db_session.query(Surgery).filter_by(surgery_id=surgery_id).first()
+            surgery = self.db_session.get(Surgery, surgery_id)
             if surgery:
                 self.surgeries_cache[surgery_id] = surgery
 
@@ -367,7 +438,7 @@ class FeasibilityChecker:
 
         surgery_type = self.surgery_types_cache.get(surgery_type_id)
         if not surgery_type:
-            surgery_type = self.db_session.query(SurgeryType).filter_by(type_id=surgery_type_id).first()
+            surgery_type = self.db_session.get(SurgeryType, surgery_type_id)
             if surgery_type:
                 self.surgery_types_cache[surgery_type_id] = surgery_type
 
@@ -376,24 +447,31 @@ class FeasibilityChecker:
             return True  # If we can't find the surgery type, assume room is suitable
 
         # Check if the room has the required equipment for this surgery type
-        required_equipment = getattr(surgery_type, 'required_equipment', None)
+        required_equipment = self.required_equipment_cache.get(surgery_type_id)
+        if required_equipment is None:
+            required_equipment = frozenset(
+                equipment.name for equipment in getattr(surgery_type, 'required_equipment', None) or ()
+            )
+            self.required_equipment_cache[surgery_type_id] = required_equipment
         if not required_equipment:
             # If surgery type doesn't specify required equipment, any room is suitable
             return True
 
         # Get the room's equipment
-        room_equipment = self.room_equipment_cache.get(room_id, [])
-        if not room_equipment:
-            room_equipment = self.db_session.query(OperatingRoomEquipment).filter_by(room_id=room_id).all()
-            self.room_equipment_cache[room_id] = room_equipment
+        room_equipment_names = self.room_equipment_names_cache.get(room_id)
+        if room_equipment_names is None:
+            room_equipment = self.room_equipment_cache.get(room_id)
+            if room_equipment is None:
+                room_equipment = self.db_session.query(OperatingRoomEquipment).filter_by(room_id=room_id).all()
+                self.room_equipment_cache[room_id] = room_equipment
+            room_equipment_names = frozenset(re.equipment_name for re in room_equipment)
+            self.room_equipment_names_cache[room_id] = room_equipment_names
 
         # Check if the room has all required equipment
-        room_equipment_ids = [re.equipment_id for re in room_equipment]
-        for req_equip in required_equipment.split(','):
-            req_equip = req_equip.strip()
-            if req_equip and req_equip not in room_equipment_ids:
-                logger.info(f"Room {room_id} is missing required equipment {req_equip} for surgery type {surgery_type_id}")
-                return False
+        missing_equipment = required_equipment - room_equipment_names
+        if missing_equipment:
+            logger.info(f"Room {room_id} is missing required equipment {sorted(missing_equipment)} for surgery type {surgery_type_id}")
+            return False
 
         return True
 
@@ -404,7 +482,8 @@ class FeasibilityChecker:
         start_time: datetime,
         end_time: datetime,
         current_assignments: List[SurgeryRoomAssignment],
-        surgery_id_to_ignore: Optional[int] = None
+        surgery_id_to_ignore: Optional[int] = None,
+        assignment_index: Optional[Tuple[Dict[int, list], Dict[int, list]]] = None
     ) -> bool:
         """
         Check if a surgery assignment is feasible.
@@ -416,6 +495,8 @@ class FeasibilityChecker:
             end_time: End time of the assignment
             current_assignments: List of current assignments to check against
             surgery_id_to_ignore: ID of a surgery to ignore in the check
+            assignment_index: current_assignments grouped by group_assignments();
+                when given, only the same room's and surgeon's assignments are scanned
 
         Returns:
             True if the assignment is feasible, False otherwise
@@ -425,7 +506,7 @@ class FeasibilityChecker:
         if self.db_session:
             surgery = self.surgeries_cache.get(surgery_id)
             if not surgery:
-                surgery = self.db_session.query(Surgery).filter_by(surgery_id=surgery_id).first()
+                surgery = self.db_session.get(Surgery, surgery_id)
                 if surgery:
                     self.surgeries_cache[surgery_id] = surgery
 
@@ -433,22 +514,59 @@ class FeasibilityChecker:
             logger.warning(f"Surgery {surgery_id} not found")
             return False
 
-        # Check room availability
-        if not self.is_room_available(room_id, start_time, end_time, current_assignments, surgery_id_to_ignore):
+        # Checks run cheapest first so infeasible moves are rejected early:
+        # memoized room suitability, the in-memory room and surgeon scans,
+        # then equipment availability
+
+        # Check room suitability
+        if not self.is_room_suitable_for_surgery(room_id, surgery_id):
             return False
 
-        # Check surgeon availability
         surgeon_id = getattr(surgery, 'surgeon_id', None)
-        if surgeon_id and not self.is_surgeon_available(surgeon_id, start_time, end_time, current_assignments, surgery_id_to_ignore):
+        room_assignments = surgeon_assignments = current_assignments
+        if assignment_index is not None:
+            room_assignments = assignment_index[0].get(room_id, [])
+            surgeon_assignments = assignment_index[1].get(surgeon_id, [])
+
+        # Check room availability
+        if not self.is_room_available(room_id, start_time, end_time, room_assignments, surgery_id_to_ignore):
             return False
 
-        # Check room suitability
-        if not self.is_room_suitable_for_surgery(room_id, surgery_id):
+        # Check surgeon availability
+        if surgeon_id and not self.is_surgeon_available(surgeon_id, start_time, end_time, surgeon_assignments, surgery_id_to_ignore):
             return False
 
+        # Equipment availability does not depend on the other assignments,
+        # so the same move re-proposed by the neighborhood reuses its verdict
+        key = (surgery_id, start_time, end_time, surgery_id_to_ignore)
+        verdict = self.verdict_cache.get(key)
+        if verdict is None:
+            verdict = self._check_equipment(
+                surgery_id, start_time, end_time, current_assignments, surgery_id_to_ignore
+            )
+            self.verdict_cache[key] = verdict
+            if len(self.verdict_cache) > self.VERDICT_CACHE_SIZE:
+                self.verdict_cache.popitem(last=False)
+        else:
+            self.verdict_cache.move_to_end(key)
+
+        return verdict
+
+    def _check_equipment(
+        self,
+        surgery_id: int,
+        start_time: datetime,
+        end_time: datetime,
+        current_assignments: List[SurgeryRoomAssignment],
+        surgery_id_to_ignore: Optional[int] = None
+    ) -> bool:
+        """Check equipment availability for an assignment."""
         # Check equipment availability if we have equipment usage data
         if self.db_session:
-            equipment_usages = self.db_session.query(SurgeryEquipmentUsage).filter_by(surgery_id=surgery_id).all()
+            equipment_usages = self.equipment_usages_cache.get(surgery_id)
+            if equipment_usages is None:
+                equipment_usages = self.db_session.query(SurgeryEquipmentUsage).filter_by(surgery_id=surgery_id).all()
+                self.equipment_usages_cache[surgery_id] = equipment_usages
             for usage in equipment_usages:
                 if not self.is_equipment_available(usage.equipment_id, start_time, end_time, current_assignments, surgery_id_to_ignore):
                     return False
@@ -471,18 +589,165 @@ class FeasibilityChecker:
         if not assignments:
             return True  # Empty solution is feasible
 
-        for i, assignment in enumerate(assignments):
-            # Create a copy of assignments without the current one
-            other_assignments = assignments[:i] + assignments[i+1:]
+        if self.db_session:
+            self._prefetch_equipment_usages([a.surgery_id for a in assignments])
+
+        # Double bookings: sweep each room's and each surgeon's intervals once
+        # instead of scanning every other assignment for every assignment
+        room_intervals = defaultdict(list)
+        surgeon_intervals = defaultdict(list)
+        solve_surgeon_ids = self.solve_surgeon_ids or {}
+        for assignment in assignments:
+            surgery_id = assignment.surgery_id
+            interval = (assignment.start_time, assignment.end_time)
+            room_intervals[assignment.room_id].append(interval)
+            if surgery_id in solve_surgeon_ids:
+                surgeon_id = solve_surgeon_ids[surgery_id]
+            else:
+                surgeon_id = self._assignment_surgeon_id(assignment)
+            if surgeon_id:
+                surgeon_intervals[surgeon_id].append(interval)
+
+        if self._has_overlap(room_intervals):
+            logger.debug("Solution double-books a room")
+            return False
+        if self._has_overlap(surgeon_intervals):
+            logger.debug("Solution double-books a surgeon")
+            return False
 
-            # Check if this assignment is feasible
+        # With no overlaps left, each assignment only needs its own checks
+        for assignment in assignments:
             if not self.is_feasible(
                 assignment.surgery_id,
                 assignment.room_id,
                 assignment.start_time,
                 assignment.end_time,
-                other_assignments
+                []
             ):
                 return False
 
         return True
+
+    def group_assignments(
+        self,
+        assignments: List[SurgeryRoomAssignment]
+    ) -> Tuple[Dict[int, list], Dict[int, list]]:
+        """
+        Group assignments by room and by surgeon for repeated is_feasible calls.
+
+        Args:
+            assignments: List of surgery room assignments
+
+        Returns:
+            Tuple of (room_id -> assignments, surgeon_id -> assignments)
+        """
+        by_room = defaultdict(list)
+        by_surgeon = defaultdict(list)
+        for assignment in assignments:
+            by_room[assignment.room_id].append(assignment)
+            surgeon_id = self._assignment_surgeon_id(assignment)
+            if surgeon_id:
+                by_surgeon[surgeon_id].append(assignment)
+        return dict(by_room), dict(by_surgeon)
+
+    @contextmanager
+    def solving(self, surgeries: List[Surgery]):
+        """
+        Specialize solution checks for a solve over a fixed set of surgeries.
+
+        Within the block each surgery's surgeon is bound once up front, so
+        check_solution_feasibility does not resolve it per assignment.
+
+        Args:
+            surgeries: Surgeries being scheduled; their surgeons must not change
+                until the block exits
+        """
+        self.solve_surgeon_ids = {surgery.surgery_id: surgery.surgeon_id for surgery in surgeries}
+        try:
+            yield self
+        finally:
+            self.solve_surgeon_ids = None
+
+    @staticmethod
+    def _build_equipment_usage_index(equipment_usages) -> Dict[int, Tuple[list, list, timedelta]]:
+        """Group equipment usages by equipment, sorted by start time, for bisect lookups."""
+        grouped = defaultdict(list)
+        for usage in equipment_usages:
+            # Usages without a time window never match the overlap query either
+            if usage.usage_start_time is None or usage.usage_end_time is None:
+                continue
+            grouped[usage.equipment_id].append(usage)
+
+        index = {}
+        for equipment_id, usages in grouped.items():
+            usages.sort(key=lambda usage: usage.usage_start_time)
+            starts = [usage.usage_start_time for usage in usages]
+            longest = max(usage.usage_end_time - usage.usage_start_time for usage in usages)
+            index[equipment_id] = (starts, usages, longest)
+        return index
+
+    def _overlapping_equipment_usages(
+        self,
+        equipment_id: int,
+        start_time: datetime,
+        end_time: datetime
+    ) -> list:
+        """Return the indexed usages of an equipment that overlap the given time slot."""
+        entry = self.equipment_usage_index.get(equipment_id)
+        if entry is None:
+            return []
+        starts, usages, longest = entry
+
+        # Only usages starting before end_time, and no earlier than the longest
+        # usage before start_time, can overlap the slot
+        lo = bisect_right(starts, start_time - longest)
+        hi = bisect_left(starts, end_time)
+        return [usage for usage in usages[lo:hi] if usage.usage_end_time > start_time]
+
+    def _prefetch_equipment_usages(self, surgery_ids: List[int]):
+        """Load the equipment usages of all uncached surgeries with chunked IN queries."""
+        missing = list({sid for sid in surgery_ids if sid not in self.equipment_usages_cache})
+        for offset in range(0, len(missing), self.PREFETCH_CHUNK_SIZE):
+            chunk = missing[offset:offset + self.PREFETCH_CHUNK_SIZE]
+            for surgery_id in chunk:
+                self.equipment_usages_cache[surgery_id] = []
+            usages = self.db_session.query(SurgeryEquipmentUsage).filter(
+                SurgeryEquipmentUsage.surgery_id.in_(chunk)
+            ).all()
+            for usage in usages:
+                self.equipment_usages_cache[usage.surgery_id].append(usage)
+
+    def _assignment_surgeon_id(self, assignment: SurgeryRoomAssignment) -> Optional[int]:
+        """Resolve the surgeon of an assignment the same way is_surgeon_available does."""
+        surgery_id = assignment.surgery_id
+        surgery = self.surgeries_cache.get(surgery_id) or getattr(assignment, 'surgery', None)
+        if not surgery and self.db_session:
+            surgery = self.db_session.get(Surgery, surgery_id)
+            if surgery:
+                self.surgeries_cache[surgery_id] = surgery
+        return getattr(surgery, 'surgeon_id', None) if surgery else None
+
+    @staticmethod
+    def _has_overlap(intervals_by_key: Dict[Any, List[Tuple[datetime, datetime]]]) -> bool:
+        """
+        Check whether any two intervals sharing a key overlap.
+
+        Each key's intervals are sorted by start and swept once, tracking the
+        latest end seen so far; an interval starting before that end overlaps
+        an earlier one. Intervals that end before they start can still fall
+        inside a longer one and are checked against the whole group.
+        """
+        for intervals in intervals_by_key.values():
+            if len(intervals) < 2:
+                continue
+            intervals.sort()
+            latest_end = None
+            for start, end in intervals:
+                if end <= start:
+                    if any(other_start < end and other_end > start for other_start, other_end in intervals):
+                        return True
+                elif latest_end is not None and start < latest_end:
+                    return True
+                if latest_end is None or end > latest_end:
+                    latest_end = end
+        return False
@@ -8,7 +8,46 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from sqlalchemy import text, inspect
-from db_config import engine
+from db_config import create_script_engine
+
+engine = create_script_engine()
+
+# Number of usage_id values covered by each backfill UPDATE
+BACKFILL_CHUNK_SIZE = 5000
+
+def backfill_usage_times(conn, chunk_size=BACKFILL_CHUNK_SIZE):
+    """Fill missing usage times in usage_id ranges, committing after each range"""
+    # Both statements are compiled once and re-executed with new bounds
+    from_surgery = text("""
+        UPDATE surgeryequipmentusage seu
+        JOIN surgery s ON seu.surgery_id = s.surgery_id
+        SET seu.usage_start_time = s.start_time,
+            seu.usage_end_time = s.end_time
+        WHERE seu.usage_id BETWEEN :low AND :high
+          AND (seu.usage_start_time IS NULL OR seu.usage_end_time IS NULL)
+    """)
+    # For any remaining NULL values, set to current time
+    from_now = text("""
+        UPDATE surgeryequipmentusage 
+        SET usage_start_time = NOW(),
+            usage_end_time = DATE_ADD(NOW(), INTERVAL 1 HOUR)
+        WHERE usage_id BETWEEN :low AND :high
+          AND (usage_start_time IS NULL OR usage_end_time IS NULL)
+    """)
+    
+    bounds = conn.execute(text("SELECT MIN(usage_id), MAX(usage_id) FROM surgeryequipmentusage")).one()
+    conn.commit()
+    if bounds[0] is None:
+        return
+    
+    # Keyset ranges over the primary key keep each UPDATE (and its row
+    # locks) to one chunk instead of the whole table
+    for low in range(bounds[0], bounds[1] + 1, chunk_size):
+        params = {"low": low, "high": low + chunk_size - 1}
+        conn.execute(from_surgery, params)
+        conn.execute(from_now, params)
+        conn.commit()
+        print(f"   ✓ usage_id {params['low']}-{min(params['high'], bounds[1])}")
 
 def fix_equipment_usage_schema():
     """Fix the surgeryequipmentusage table schema"""
@@ -55,32 +94,17 @@ def fix_equipment_usage_schema():
                         "ALTER TABLE surgeryequipmentusage ADD COLUMN usage_end_time DATETIME"
                     ))
                 
+                # Commit the schema change before backfilling
+                trans.commit()
+                
                 # Update existing records with default values if any exist
                 result = conn.execute(text("SELECT COUNT(*) FROM surgeryequipmentusage"))
                 record_count = result.scalar()
+                conn.commit()
                 
                 if record_count > 0:
                     print(f"📊 Updating {record_count} existing records...")
-                    
-                    # Set default times based on surgery times if available
-                    conn.execute(text("""
-                        UPDATE surgeryequipmentusage seu
-                        JOIN surgery s ON seu.surgery_id = s.surgery_id
-                        SET seu.usage_start_time = s.start_time,
-                            seu.usage_end_time = s.end_time
-                        WHERE seu.usage_start_time IS NULL OR seu.usage_end_time IS NULL
-                    """))
-                    
-                    # For any remaining NULL values, set to current time
-                    conn.execute(text("""
-                        UPDATE surgeryequipmentusage 
-                        SET usage_start_time = NOW(),
-                            usage_end_time = DATE_ADD(NOW(), INTERVAL 1 HOUR)
-                        WHERE usage_start_time IS NULL OR usage_end_time IS NULL
-                    """))
-                
-                # Commit the transaction
-                trans.commit()
+                    backfill_usage_times(conn)
                 
                 # Verify the changes
                 print("\n🔍 Verifying changes...")
@@ -98,7 +122,7 @@ def fix_equipment_usage_schema():
                     return False
                 
             except Exception as e:
-                trans.rollback()
+                conn.rollback()
                 print(f"❌ Schema fix failed: {e}")
                 return False
                 
@@ -4,38 +4,72 @@ Script to fix the operating room table schema by adding missing columns.
 """
 
 import logging
-from sqlalchemy import text
-from db_config import get_db, engine
+from sqlalchemy import bindparam, inspect, text
+from db_config import create_script_engine
+
+engine = create_script_engine()
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def check_column_exists(table_name, column_name):
+# Columns this script is allowed to add with ALTER TABLE
+ALTERABLE_COLUMNS = {
+    ('operatingroom', 'name'),
+    ('operatingroom', 'status'),
+    ('operatingroom', 'primary_service'),
+}
+
+def check_column_exists(conn, table_name, column_name):
     """Check if a column exists in a table."""
     try:
-        with engine.connect() as conn:
-            result = conn.execute(text(f"""
-                SELECT COUNT(*) as count
-                FROM INFORMATION_SCHEMA.COLUMNS
-                WHERE TABLE_SCHEMA = DATABASE()
-                AND TABLE_NAME = '{table_name}'
-                AND COLUMN_NAME = '{column_name}'
-            """))
-            return result.fetchone()[0] > 0
+        result = conn.execute(text("""
+            SELECT COUNT(*) as count
+            FROM INFORMATION_SCHEMA.COLUMNS
+            WHERE TABLE_SCHEMA = DATABASE()
+            AND TABLE_NAME = :table_name
+            AND COLUMN_NAME = :column_name
+        """), {"table_name": table_name, "column_name": column_name})
+        return result.fetchone()[0] > 0
     except Exception as e:
         logger.error(f"Error checking column {column_name}: {e}")
         return False
 
-def add_column_if_missing(table_name, column_name, column_definition):
-    """Add a column to a table if it doesn't exist."""
-    if not check_column_exists(table_name, column_name):
+def existing_columns(conn, table_name, column_names):
+    """Return which of the given columns exist in a table, in one query."""
+    try:
+        result = conn.execute(text("""
+            SELECT COLUMN_NAME
+            FROM INFORMATION_SCHEMA.COLUMNS
+            WHERE TABLE_SCHEMA = DATABASE()
+            AND TABLE_NAME = :table_name
+            AND COLUMN_NAME IN :column_names
+        """).bindparams(bindparam("column_names", expanding=True)),
+            {"table_name": table_name, "column_names": list(column_names)})
+        return {row[0] for row in result}
+    except Exception as e:
+        logger.error(f"Error checking columns of {table_name}: {e}")
+        return set()
+
+def add_column_if_missing(conn, table_name, column_name, column_definition, exists=None):
+    """Add a column to a table if it doesn't exist.
+
+    Pass ``exists`` when the caller already knows whether the column is
+    present, to skip the INFORMATION_SCHEMA lookup.
+    """
+    # Identifiers cannot be bound parameters, so only known ones are interpolated
+    if (table_name, column_name) not in ALTERABLE_COLUMNS:
+        logger.error(f"❌ Refusing to alter unknown column {table_name}.{column_name}")
+        return False
+
+    if exists is None:
+        exists = check_column_exists(conn, table_name, column_name)
+
+    if not exists:
         try:
-            with engine.connect() as conn:
-                conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {column_name} {column_definition}"))
-                conn.commit()
-                logger.info(f"✅ Added column {column_name} to {table_name}")
-                return True
+            conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {column_name} {column_definition}"))
+            logger.info(f"✅ Added column {column_name} to {table_name}")
+            return True
         except Exception as e:
             logger.error(f"❌ Error adding column {column_name}: {e}")
             return False
@@ -47,16 +81,6 @@ def fix_operatingroom_schema():
     """Fix the operating room table schema."""
     logger.info("🔧 Fixing operating room table schema...")
 
-    # Check current table structure
-    try:
-        with engine.connect() as conn:
-            result = conn.execute(text("DESCRIBE operatingroom"))
-            current_columns = [row[0] for row in result.fetchall()]
-            logger.info(f"Current columns in operatingroom: {current_columns}")
-    except Exception as e:
-        logger.error(f"Error describing table: {e}")
-        return False
-
     # Define required columns
     required_columns = {
         'name': 'VARCHAR(255) NOT NULL DEFAULT "Operating Room"',
@@ -64,35 +88,48 @@ def fix_operatingroom_schema():
         'primary_service': 'VARCHAR(255) NULL'
     }
 
-    success = True
-    for column_name, column_def in required_columns.items():
-        if not add_column_if_missing('operatingroom', column_name, column_def):
-            success = False
-
-    if success:
-        logger.info("✅ Operating room schema fix completed successfully!")
+    # One connection and transaction serve the whole migration
+    with engine.begin() as conn:
+        existing = existing_columns(conn, 'operatingroom', required_columns)
+        if existing == set(required_columns):
+            logger.info("✅ Operating room schema is already correct")
+            return True
 
-        # Update existing records with default values
+        # Check current table structure
         try:
-            with engine.connect() as conn:
-                # Update name column for existing records
-                conn.execute(text("""
-                    UPDATE operatingroom
-                    SET name = CONCAT('Operating Room ', room_id)
-                    WHERE name IS NULL OR name = ''
-                """))
+            result = conn.execute(text("DESCRIBE operatingroom"))
+            current_columns = [row[0] for row in result.fetchall()]
+            logger.info(f"Current columns in operatingroom: {current_columns}")
+        except Exception as e:
+            logger.error(f"Error describing table: {e}")
+            return False
+
+        success = True
+        for column_name, column_def in required_columns.items():
+            if not add_column_if_missing(conn, 'operatingroom', column_name, column_def,
+                                         exists=column_name in existing):
+                success = False
 
-                # Update status for existing records
+        if success:
+            logger.info("✅ Operating room schema fix completed successfully!")
+
+            # Update existing records with default values
+            try:
+                # Fill in name and status for existing records in one pass
                 conn.execute(text("""
                     UPDATE operatingroom
-                    SET status = 'Active'
-                    WHERE status IS NULL OR status = ''
+                    SET name = CASE WHEN name IS NULL OR name = ''
+                                    THEN CONCAT('Operating Room ', room_id)
+                                    ELSE name END,
+                        status = CASE WHEN status IS NULL OR status = ''
+                                      THEN 'Active'
+                                      ELSE status END
+                    WHERE name IS NULL OR name = ''
+                       OR status IS NULL OR status = ''
                 """))
-
-                conn.commit()
                 logger.info("✅ Updated existing records with default values")
-        except Exception as e:
-            logger.error(f"❌ Error updating existing records: {e}")
+            except Exception as e:
+                logger.error(f"❌ Error updating existing records: {e}")
 
     return success
 
@@ -101,12 +138,10 @@ def verify_schema():
     logger.info("🔍 Verifying schema...")
     try:
         with engine.connect() as conn:
-            result = conn.execute(text("DESCRIBE operatingroom"))
-            columns = result.fetchall()
-
             logger.info("Final operatingroom table structure:")
-            for column in columns:
-                logger.info(f"  {column[0]}: {column[1]} {column[2]} {column[3]} {column[4]} {column[5]}")
+            for column in inspect(conn).get_columns('operatingroom'):
+                logger.info(f"  {column['name']}: {column['type']} "
+                            f"nullable={column['nullable']} default={column['default']}")
 
             # Test a simple query
             result = conn.execute(text("SELECT room_id, name, location, status, primary_service FROM operatingroom LIMIT 1"))
@@ -3,12 +3,12 @@
 Fix staff table schema to match the model definition
 """
 
-from sqlalchemy import create_engine, text
-from db_config import get_database_url
+from sqlalchemy import text
+from db_config import create_script_engine, get_database_url
 
 def fix_staff_schema():
     try:
-        engine = create_engine(get_database_url())
+        engine = create_script_engine(get_database_url())
 
         with engine.connect() as conn:
             print("=== FIXING STAFF TABLE SCHEMA ===")
@@ -18,19 +18,16 @@ def fix_staff_schema():
 
             try:
                 # 1. Add the missing 'status' column
-                print("1. Adding 'status' column...")
-                conn.execute(text("""
-                    ALTER TABLE staff
-                    ADD COLUMN status VARCHAR(50) NOT NULL DEFAULT 'Active'
-                """))
-                print("   ✅ Status column added")
-
                 # 2. Rename 'specialization' to 'specializations' and change type to TEXT
+                # Both changes go in one ALTER so the table is rebuilt only once
+                print("1. Adding 'status' column...")
                 print("2. Renaming 'specialization' to 'specializations' and changing type...")
                 conn.execute(text("""
                     ALTER TABLE staff
+                    ADD COLUMN status VARCHAR(50) NOT NULL DEFAULT 'Active',
                     CHANGE COLUMN specialization specializations TEXT
                 """))
+                print("   ✅ Status column added")
                 print("   ✅ Specializations column updated")
 
                 # 3. Verify the changes
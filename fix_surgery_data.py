@@ -7,9 +7,94 @@ import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from sqlalchemy import text
+from sqlalchemy import inspect, text
 from datetime import datetime, timedelta
-from db_config import engine
+from db_config import create_script_engine
+
+engine = create_script_engine()
+
+# Rows per batched UPDATE statement, keeping each statement well below
+# MySQL's max_allowed_packet
+UPDATE_CHUNK_SIZE = 1000
+
+# Statements reused across loop iterations are built once at import time
+SELECT_SURGERIES_PAGE = text("""
+    SELECT surgery_id, scheduled_date, duration_minutes, status
+    FROM surgery 
+    WHERE (start_time IS NULL OR end_time IS NULL)
+      AND surgery_id > :last_id
+    ORDER BY surgery_id
+    LIMIT :page_size
+""")
+
+COUNT_SCHEDULED_ON = text("""
+    SELECT COUNT(*) FROM surgery 
+    WHERE DATE(scheduled_date) = :today AND status = 'Scheduled'
+""")
+
+SELECT_SURGERIES_TO_RESCHEDULE = text("""
+    SELECT surgery_id, duration_minutes 
+    FROM surgery 
+    ORDER BY surgery_id
+    LIMIT 3
+""")
+
+def ensure_time_indexes(conn):
+    """Index start_time and end_time so NULL times are found without a table scan"""
+    indexed = {
+        index['column_names'][0]
+        for index in inspect(conn).get_indexes('surgery')
+        if index['column_names']
+    }
+    
+    for column in ('start_time', 'end_time'):
+        if column not in indexed:
+            print(f"🔑 Adding index on surgery.{column}...")
+            conn.execute(text(f"CREATE INDEX ix_surgery_{column} ON surgery ({column})"))
+
+def reschedule_for_today(conn, today_start):
+    """Move three surgeries to today unless some are already scheduled; return how many moved"""
+    today = today_start.date()
+    if conn.execute(COUNT_SCHEDULED_ON, {"today": today}).scalar():
+        return 0
+    
+    # Slots are numbered here rather than in SQL, so every dialect gets the
+    # same times, and all three are written by one batched UPDATE
+    surgeries_to_reschedule = conn.execute(SELECT_SURGERIES_TO_RESCHEDULE).fetchall()
+    updates = []
+    for i, (surgery_id, duration_minutes) in enumerate(surgeries_to_reschedule):
+        start_time = today_start + timedelta(hours=i * 2)
+        end_time = start_time + timedelta(minutes=duration_minutes)
+        updates.append((surgery_id, start_time, end_time, today))
+    update_surgery_times(conn, updates)
+    return len(updates)
+
+def update_surgery_times(conn, updates, chunk_size=UPDATE_CHUNK_SIZE):
+    """Apply (surgery_id, start_time, end_time, scheduled_date) rows with one CASE UPDATE per chunk"""
+    for offset in range(0, len(updates), chunk_size):
+        chunk = updates[offset:offset + chunk_size]
+        params = {}
+        start_cases, end_cases, date_cases, id_params = [], [], [], []
+        for i, (surgery_id, start_time, end_time, scheduled_date) in enumerate(chunk):
+            params.update({
+                f"id_{i}": surgery_id,
+                f"s_{i}": start_time,
+                f"e_{i}": end_time,
+                f"d_{i}": scheduled_date
+            })
+            start_cases.append(f"WHEN :id_{i} THEN :s_{i}")
+            end_cases.append(f"WHEN :id_{i} THEN :e_{i}")
+            date_cases.append(f"WHEN :id_{i} THEN :d_{i}")
+            id_params.append(f":id_{i}")
+        
+        conn.execute(text(f"""
+            UPDATE surgery 
+            SET start_time = CASE surgery_id {' '.join(start_cases)} END,
+                end_time = CASE surgery_id {' '.join(end_cases)} END,
+                scheduled_date = CASE surgery_id {' '.join(date_cases)} END,
+                status = 'Scheduled'
+            WHERE surgery_id IN ({', '.join(id_params)})
+        """), params)
 
 def fix_surgery_data():
     """Fix surgery data with proper start and end times"""
@@ -17,122 +102,84 @@ def fix_surgery_data():
         print("🔧 Fixing Surgery Data")
         print("=" * 50)
         
-        with engine.connect() as conn:
-            # Start a transaction
-            trans = conn.begin()
-            
-            try:
-                # Get all surgeries with NULL start_time or end_time
-                result = conn.execute(text("""
-                    SELECT surgery_id, scheduled_date, duration_minutes, status
-                    FROM surgery 
-                    WHERE start_time IS NULL OR end_time IS NULL
-                """))
+        try:
+            # engine.begin() commits when the block exits and rolls back on error
+            with engine.begin() as conn:
+                # Created before any writes, since MySQL DDL commits implicitly
+                ensure_time_indexes(conn)
                 
-                surgeries = result.fetchall()
-                print(f"📊 Found {len(surgeries)} surgeries needing time updates")
-                
-                # Update each surgery with proper times
+                # Read surgeries with NULL start_time or end_time one page at a
+                # time, keyed on surgery_id, so memory stays bounded. A
+                # server-side cursor can't be used here because the same
+                # connection has to issue the UPDATEs between pages.
                 base_date = datetime.now().replace(hour=8, minute=0, second=0, microsecond=0)
                 current_time = base_date
                 
-                for i, (surgery_id, scheduled_date, duration_minutes, status) in enumerate(surgeries):
-                    # Calculate start and end times
-                    start_time = current_time + timedelta(hours=i * 2)  # Space surgeries 2 hours apart
-                    end_time = start_time + timedelta(minutes=duration_minutes)
-                    
-                    # Update the surgery
-                    conn.execute(text("""
-                        UPDATE surgery 
-                        SET start_time = :start_time, 
-                            end_time = :end_time,
-                            scheduled_date = :scheduled_date,
-                            status = 'Scheduled'
-                        WHERE surgery_id = :surgery_id
-                    """), {
-                        "surgery_id": surgery_id,
-                        "start_time": start_time,
-                        "end_time": end_time,
-                        "scheduled_date": start_time.date()
-                    })
+                updated_count = 0
+                first_ids = []
+                last_id = 0
+                while True:
+                    surgeries = conn.execute(SELECT_SURGERIES_PAGE, {
+                        "last_id": last_id,
+                        "page_size": UPDATE_CHUNK_SIZE
+                    }).fetchall()
+                    if not surgeries:
+                        break
                     
-                    print(f"✅ Updated surgery {surgery_id}: {start_time} - {end_time}")
-                
-                # Also ensure we have some surgeries scheduled for today
-                today = datetime.now().date()
-                result = conn.execute(text("""
-                    SELECT COUNT(*) FROM surgery 
-                    WHERE DATE(scheduled_date) = :today AND status = 'Scheduled'
-                """), {"today": today})
-                
-                today_count = result.scalar()
-                print(f"📅 Surgeries scheduled for today: {today_count}")
-                
-                if today_count == 0:
-                    # Schedule some surgeries for today
-                    print("📅 Adding surgeries for today...")
-                    
-                    # Get some existing surgeries and reschedule them for today
-                    result = conn.execute(text("""
-                        SELECT surgery_id, duration_minutes 
-                        FROM surgery 
-                        LIMIT 3
-                    """))
+                    updates = []
+                    for i, (surgery_id, scheduled_date, duration_minutes, status) in enumerate(surgeries, start=updated_count):
+                        # Calculate start and end times
+                        start_time = current_time + timedelta(hours=i * 2)  # Space surgeries 2 hours apart
+                        end_time = start_time + timedelta(minutes=duration_minutes)
+                        updates.append((surgery_id, start_time, end_time, start_time.date()))
                     
-                    surgeries_to_reschedule = result.fetchall()
-                    today_start = datetime.now().replace(hour=9, minute=0, second=0, microsecond=0)
+                    # Only a few ids are kept for the summary line
+                    if len(first_ids) < 5:
+                        first_ids.extend(row[0] for row in surgeries[:5 - len(first_ids)])
                     
-                    for i, (surgery_id, duration_minutes) in enumerate(surgeries_to_reschedule):
-                        start_time = today_start + timedelta(hours=i * 2)
-                        end_time = start_time + timedelta(minutes=duration_minutes)
-                        
-                        conn.execute(text("""
-                            UPDATE surgery 
-                            SET scheduled_date = :scheduled_date,
-                                start_time = :start_time,
-                                end_time = :end_time,
-                                status = 'Scheduled'
-                            WHERE surgery_id = :surgery_id
-                        """), {
-                            "surgery_id": surgery_id,
-                            "scheduled_date": today,
-                            "start_time": start_time,
-                            "end_time": end_time
-                        })
-                        
-                        print(f"📅 Rescheduled surgery {surgery_id} for today: {start_time}")
-                
-                # Commit the transaction
-                trans.commit()
-                
-                # Verify the changes
-                print("\n🔍 Verifying changes...")
-                result = conn.execute(text("""
-                    SELECT COUNT(*) FROM surgery 
-                    WHERE start_time IS NOT NULL AND end_time IS NOT NULL
-                """))
-                valid_count = result.scalar()
-                
-                result = conn.execute(text("SELECT COUNT(*) FROM surgery"))
-                total_count = result.scalar()
-                
-                print(f"📊 Surgeries with valid times: {valid_count}/{total_count}")
-                
-                # Check today's schedule
-                result = conn.execute(text("""
-                    SELECT COUNT(*) FROM surgery 
-                    WHERE DATE(scheduled_date) = :today AND status = 'Scheduled'
-                """), {"today": datetime.now().date()})
+                    # Update this page in batched statements
+                    update_surgery_times(conn, updates)
+                    updated_count += len(surgeries)
+                    last_id = surgeries[-1][0]
                 
-                today_scheduled = result.scalar()
-                print(f"📅 Surgeries scheduled for today: {today_scheduled}")
+                if updated_count:
+                    print(f"✅ Updated {updated_count} surgeries: {first_ids}... last ending at {end_time}")
+                else:
+                    print("📊 No surgeries needed time updates")
                 
-                return True
+                # Also ensure we have some surgeries scheduled for today
+                today_start = datetime.now().replace(hour=9, minute=0, second=0, microsecond=0)
+                rescheduled = reschedule_for_today(conn, today_start)
                 
-            except Exception as e:
-                trans.rollback()
-                print(f"❌ Data fix failed: {e}")
-                return False
+                if rescheduled:
+                    print(f"📅 Rescheduled {rescheduled} surgeries for today from {today_start}")
+                else:
+                    print("📅 Surgeries are already scheduled for today")
+        except Exception as e:
+            print(f"❌ Data fix failed: {e}")
+            return False
+
+        with engine.connect() as conn:
+            # Verify the changes
+            print("\n🔍 Verifying changes...")
+            result = conn.execute(text("""
+                SELECT COUNT(*) FROM surgery 
+                WHERE start_time IS NOT NULL AND end_time IS NOT NULL
+            """))
+            valid_count = result.scalar()
+            
+            result = conn.execute(text("SELECT COUNT(*) FROM surgery"))
+            total_count = result.scalar()
+            
+            print(f"📊 Surgeries with valid times: {valid_count}/{total_count}")
+            
+            # Check today's schedule
+            result = conn.execute(COUNT_SCHEDULED_ON, {"today": datetime.now().date()})
+            
+            today_scheduled = result.scalar()
+            print(f"📅 Surgeries scheduled for today: {today_scheduled}")
+
+        return True
                 
     except Exception as e:
         print(f"❌ Database connection failed: {e}")
@@ -8,9 +8,11 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from sqlalchemy import text, inspect
-from db_config import engine
+from db_config import create_script_engine
 from models import SurgeryType
 
+engine = create_script_engine()
+
 def fix_surgery_schema():
     """Fix the surgery table schema"""
     try:
@@ -22,8 +24,9 @@ def fix_surgery_schema():
             trans = conn.begin()
             
             try:
-                # Check current schema
-                inspector = inspect(engine)
+                # Check current schema; the inspector reflects over this
+                # connection instead of checking out another one per call
+                inspector = inspect(conn)
                 columns = inspector.get_columns('surgery')
                 column_names = [col['name'] for col in columns]
                 
@@ -55,16 +58,30 @@ def fix_surgery_schema():
                         ("Arthroscopy", "Joint examination and repair")
                     ]
                     
-                    # Insert surgery types if they don't exist
-                    for name, description in surgery_types:
-                        result = conn.execute(text(
-                            "SELECT COUNT(*) FROM surgerytype WHERE name = :name"
-                        ), {"name": name})
-                        
-                        if result.scalar() == 0:
-                            conn.execute(text(
-                                "INSERT INTO surgerytype (name, description, average_duration) VALUES (:name, :description, 60)"
-                            ), {"name": name, "description": description})
+                    # INSERT IGNORE relies on a unique index on name to skip
+                    # existing types; older tables may have been created without one
+                    result = conn.execute(text("""
+                        SELECT COUNT(*) FROM INFORMATION_SCHEMA.STATISTICS
+                        WHERE TABLE_SCHEMA = DATABASE()
+                        AND TABLE_NAME = 'surgerytype'
+                        AND COLUMN_NAME = 'name'
+                        AND NON_UNIQUE = 0
+                    """))
+                    if result.scalar() == 0:
+                        print("🔑 Adding unique index on surgerytype.name...")
+                        conn.execute(text(
+                            "ALTER TABLE surgerytype ADD UNIQUE KEY uq_surgerytype_name (name)"
+                        ))
+                    
+                    # Insert surgery types if they don't exist, in one statement
+                    values = ", ".join(f"(:name_{i}, :description_{i}, 60)" for i in range(len(surgery_types)))
+                    params = {}
+                    for i, (name, description) in enumerate(surgery_types):
+                        params[f"name_{i}"] = name
+                        params[f"description_{i}"] = description
+                    conn.execute(text(
+                        f"INSERT IGNORE INTO surgerytype (name, description, average_duration) VALUES {values}"
+                    ), params)
                     
                     # Step 2: Add surgery_type_id column
                     print("🔧 Adding surgery_type_id column...")
@@ -75,40 +92,21 @@ def fix_surgery_schema():
                     # Step 3: Populate surgery_type_id based on surgery_type
                     print("📊 Populating surgery_type_id...")
                     
-                    # Get all unique surgery types from the surgery table
-                    result = conn.execute(text("SELECT DISTINCT surgery_type FROM surgery WHERE surgery_type IS NOT NULL"))
-                    existing_types = [row[0] for row in result]
+                    # Create surgery types for unknown type names in one statement
+                    conn.execute(text("""
+                        INSERT INTO surgerytype (name, description, average_duration)
+                        SELECT DISTINCT s.surgery_type, CONCAT('Auto-created for ', s.surgery_type), 60
+                        FROM surgery s
+                        LEFT JOIN surgerytype t ON t.name = s.surgery_type
+                        WHERE t.type_id IS NULL AND s.surgery_type IS NOT NULL
+                    """))
                     
-                    for surgery_type_name in existing_types:
-                        # Get the type_id for this surgery type
-                        result = conn.execute(text(
-                            "SELECT type_id FROM surgerytype WHERE name = :name"
-                        ), {"name": surgery_type_name})
-                        
-                        type_id_row = result.fetchone()
-                        if type_id_row:
-                            type_id = type_id_row[0]
-                            
-                            # Update all surgeries with this type
-                            conn.execute(text(
-                                "UPDATE surgery SET surgery_type_id = :type_id WHERE surgery_type = :name"
-                            ), {"type_id": type_id, "name": surgery_type_name})
-                        else:
-                            # Create a new surgery type for unknown types
-                            conn.execute(text(
-                                "INSERT INTO surgerytype (name, description, average_duration) VALUES (:name, :description, 60)"
-                            ), {"name": surgery_type_name, "description": f"Auto-created for {surgery_type_name}"})
-                            
-                            # Get the new type_id
-                            result = conn.execute(text(
-                                "SELECT type_id FROM surgerytype WHERE name = :name"
-                            ), {"name": surgery_type_name})
-                            type_id = result.scalar()
-                            
-                            # Update surgeries
-                            conn.execute(text(
-                                "UPDATE surgery SET surgery_type_id = :type_id WHERE surgery_type = :name"
-                            ), {"type_id": type_id, "name": surgery_type_name})
+                    # Update all surgeries with their type in one set-based statement
+                    conn.execute(text("""
+                        UPDATE surgery s
+                        JOIN surgerytype t ON s.surgery_type = t.name
+                        SET s.surgery_type_id = t.type_id
+                    """))
                     
                     # Step 4: Set default surgery_type_id for any NULL values
                     print("🔧 Setting default values...")
@@ -121,14 +119,21 @@ def fix_surgery_schema():
                         ), {"type_id": default_type_id})
                     
                     # Step 5: Add foreign key constraint
-                    print("🔗 Adding foreign key constraint...")
-                    conn.execute(text(
-                        "ALTER TABLE surgery ADD CONSTRAINT fk_surgery_type_id FOREIGN KEY (surgery_type_id) REFERENCES surgerytype(type_id)"
-                    ))
-                    
                     # Step 6: Drop the old surgery_type column
+                    # Both clauses go in one ALTER so the table is rebuilt only once
+                    print("🔗 Adding foreign key constraint...")
                     print("🗑️ Removing old surgery_type column...")
-                    conn.execute(text("ALTER TABLE surgery DROP COLUMN surgery_type"))
+                    # Every surgery_type_id was just set from surgerytype, so the
+                    # constraint's validation scan is skipped for this session
+                    conn.execute(text("SET FOREIGN_KEY_CHECKS = 0"))
+                    try:
+                        conn.execute(text(
+                            "ALTER TABLE surgery "
+                            "ADD CONSTRAINT fk_surgery_type_id FOREIGN KEY (surgery_type_id) REFERENCES surgerytype(type_id), "
+                            "DROP COLUMN surgery_type"
+                        ))
+                    finally:
+                        conn.execute(text("SET FOREIGN_KEY_CHECKS = 1"))
                     
                     print("✅ Schema migration completed successfully!")
                 
@@ -137,7 +142,8 @@ def fix_surgery_schema():
                 
                 # Verify the changes
                 print("\n🔍 Verifying changes...")
-                inspector = inspect(engine)
+                # Drop the reflection cached before the migration
+                inspector.clear_cache()
                 columns = inspector.get_columns('surgery')
                 column_names = [col['name'] for col in columns]
                 print(f"📋 Updated columns: {column_names}")
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Create the surgery type required-equipment join table and migrate legacy
+comma-separated surgerytype.required_equipment values into it
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import text, inspect
+from db_config import create_script_engine
+from models import surgery_type_required_equipment
+
+engine = create_script_engine()
+
+def fix_surgery_type_required_equipment():
+    """Create surgerytyperequiredequipment and fill it from the legacy CSV column"""
+    try:
+        print("🔧 Fixing Surgery Type Required Equipment")
+        print("=" * 50)
+        
+        with engine.connect() as conn:
+            # Start a transaction
+            trans = conn.begin()
+            
+            try:
+                inspector = inspect(conn)
+                table_names = inspector.get_table_names()
+                
+                if 'surgerytyperequiredequipment' not in table_names:
+                    print("🔧 Creating surgerytyperequiredequipment table...")
+                    surgery_type_required_equipment.create(conn, checkfirst=True)
+                else:
+                    print("✅ surgerytyperequiredequipment table already exists")
+                
+                column_names = [col['name'] for col in inspector.get_columns('surgerytype')]
+                if 'required_equipment' not in column_names:
+                    print("✅ No legacy required_equipment column to migrate")
+                    trans.commit()
+                    return True
+                
+                # Resolve legacy entries by equipment ID or by equipment name
+                equipment_rows = conn.execute(text(
+                    "SELECT equipment_id, name FROM surgeryequipment"
+                )).fetchall()
+                equipment_ids = {str(row[0]) for row in equipment_rows}
+                equipment_by_name = {row[1]: row[0] for row in equipment_rows}
+                
+                existing = {
+                    (row[0], row[1]) for row in conn.execute(text(
+                        "SELECT surgery_type_id, equipment_id FROM surgerytyperequiredequipment"
+                    ))
+                }
+                
+                rows = []
+                type_rows = conn.execute(text(
+                    "SELECT type_id, required_equipment FROM surgerytype WHERE required_equipment IS NOT NULL"
+                )).fetchall()
+                for type_id, required_equipment in type_rows:
+                    for entry in required_equipment.split(','):
+                        entry = entry.strip()
+                        if not entry:
+                            continue
+                        if entry in equipment_ids:
+                            equipment_id = int(entry)
+                        elif entry in equipment_by_name:
+                            equipment_id = equipment_by_name[entry]
+                        else:
+                            print(f"⚠️ Surgery type {type_id}: unknown equipment '{entry}' skipped")
+                            continue
+                        if (type_id, equipment_id) not in existing:
+                            existing.add((type_id, equipment_id))
+                            rows.append({"surgery_type_id": type_id, "equipment_id": equipment_id})
+                
+                if rows:
+                    # One executemany for all pairs
+                    conn.execute(text(
+                        "INSERT INTO surgerytyperequiredequipment (surgery_type_id, equipment_id) "
+                        "VALUES (:surgery_type_id, :equipment_id)"
+                    ), rows)
+                print(f"📊 Migrated {len(rows)} required equipment entries from {len(type_rows)} surgery types")
+                
+                # Commit the transaction
+                trans.commit()
+                print("✅ Required equipment migration completed successfully!")
+                return True
+                
+            except Exception as e:
+                trans.rollback()
+                print(f"❌ Required equipment migration failed: {e}")
+                return False
+                
+    except Exception as e:
+        print(f"❌ Database connection failed: {e}")
+        return False
+
+if __name__ == "__main__":
+    success = fix_surgery_type_required_equipment()
+    sys.exit(0 if success else 1)
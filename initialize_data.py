@@ -1,23 +1,38 @@
 from datetime import date, datetime, timedelta # Added datetime for parsing
+from functools import lru_cache
+from types import MappingProxyType
+from sqlalchemy import insert
 from models import Patient, Staff, Surgeon, OperatingRoom, SurgeryEquipment, Surgery # Added Surgery model
 
 
+def _freeze(value):
+    """Recursively turn dicts into read-only mappings and lists into tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+_PATIENTS = _freeze([
+    {
+        "patient_id": "P001",
+        "name": "John Doe",
+        "dob": "1990-01-01",
+        "contact_info": {"phone": "555-0100", "email": "john.doe@example.com"},
+        "medical_history": [
+            {"condition": "Condition A", "date_diagnosed": "2018-05-01"},
+            {"condition": "Condition B", "date_diagnosed": "2019-11-15"},
+            # Add more medical history records as needed
+        ],
+        "privacy_consent": True,
+    },
+    # Add more patient documents as needed...
+])
+
+
 def initialize_patients():
-    return [
-        {
-            "patient_id": "P001",
-            "name": "John Doe",
-            "dob": "1990-01-01",
-            "contact_info": {"phone": "555-0100", "email": "john.doe@example.com"},
-            "medical_history": [
-                {"condition": "Condition A", "date_diagnosed": "2018-05-01"},
-                {"condition": "Condition B", "date_diagnosed": "2019-11-15"},
-                # Add more medical history records as needed
-            ],
-            "privacy_consent": True,
-        },
-        # Add more patient documents as needed...
-    ]
+    return _PATIENTS
 
 
 def initialize_patients_sqlalchemy():
@@ -43,22 +58,25 @@ def initialize_patients_sqlalchemy():
     ]
 
 
+_STAFF_MEMBERS = _freeze([
+    {
+        "staff_id": "S001",
+        "name": "Jane Smith",
+        "role": "Nurse",
+        "specialization": None,  # This can be null/None for non-surgeons
+        "contact_info": {"phone": "555-0101", "email": "jane.smith@example.com"},
+        "availability_schedule": [
+            {"day": "Monday", "start": "08:00", "end": "17:00"},
+            {"day": "Tuesday", "start": "08:00", "end": "17:00"},
+            # Add more availability slots as needed
+        ],
+    },
+    # Add more staff member documents as needed...
+])
+
+
 def initialize_staff_members():
-    return [
-        {
-            "staff_id": "S001",
-            "name": "Jane Smith",
-            "role": "Nurse",
-            "specialization": None,  # This can be null/None for non-surgeons
-            "contact_info": {"phone": "555-0101", "email": "jane.smith@example.com"},
-            "availability_schedule": [
-                {"day": "Monday", "start": "08:00", "end": "17:00"},
-                {"day": "Tuesday", "start": "08:00", "end": "17:00"},
-                # Add more availability slots as needed
-            ],
-        },
-        # Add more staff member documents as needed...
-    ]
+    return _STAFF_MEMBERS
 
 
 def initialize_staff_members_sqlalchemy():
@@ -95,40 +113,43 @@ def initialize_staff_members_sqlalchemy():
     ]
 
 
+_SURGEONS = _freeze([
+    {
+        "surgeon_id": "S001",
+        "name": "Dr. Emily Smith",
+        "contact_info": {"email": "emily.smith@example.com", "phone": "555-0101"},
+        "specialization": "Cardiothoracic Surgery",
+        "credentials": [
+            "Board Certified in Thoracic Surgery",
+            "MD from Example Medical School",
+        ],
+        "availability": [
+            {"day": "Monday", "start": "08:00", "end": "16:00"},
+            {"day": "Wednesday", "start": "08:00", "end": "16:00"},
+        ],
+        "surgeon_preferences": {"preferred_operating_room": "OR1"},
+    },
+    {
+        "surgeon_id": "S002",
+        "name": "Dr. John Doe",
+        "contact_info": {"email": "john.doe@example.com", "phone": "555-0202"},
+        "specialization": "Orthopedic Surgery",
+        "credentials": [
+            "Board Certified in Orthopedic Surgery",
+            "MD from Another Example Medical School",
+        ],
+        "availability": [
+            {"day": "Tuesday", "start": "10:00", "end": "18:00"},
+            {"day": "Thursday", "start": "10:00", "end": "18:00"},
+        ],
+        "surgeon_preferences": {"preferred_operating_room": "OR2"},
+    },
+    # Add more surgeons as needed
+])
+
+
 def initialize_surgeons():
-    return [
-        {
-            "surgeon_id": "S001",
-            "name": "Dr. Emily Smith",
-            "contact_info": {"email": "emily.smith@example.com", "phone": "555-0101"},
-            "specialization": "Cardiothoracic Surgery",
-            "credentials": [
-                "Board Certified in Thoracic Surgery",
-                "MD from Example Medical School",
-            ],
-            "availability": [
-                {"day": "Monday", "start": "08:00", "end": "16:00"},
-                {"day": "Wednesday", "start": "08:00", "end": "16:00"},
-            ],
-            "surgeon_preferences": {"preferred_operating_room": "OR1"},
-        },
-        {
-            "surgeon_id": "S002",
-            "name": "Dr. John Doe",
-            "contact_info": {"email": "john.doe@example.com", "phone": "555-0202"},
-            "specialization": "Orthopedic Surgery",
-            "credentials": [
-                "Board Certified in Orthopedic Surgery",
-                "MD from Another Example Medical School",
-            ],
-            "availability": [
-                {"day": "Tuesday", "start": "10:00", "end": "18:00"},
-                {"day": "Thursday", "start": "10:00", "end": "18:00"},
-            ],
-            "surgeon_preferences": {"preferred_operating_room": "OR2"},
-        },
-        # Add more surgeons as needed
-    ]
+    return _SURGEONS
 
 
 def initialize_surgeons_sqlalchemy():
@@ -157,15 +178,18 @@ def initialize_surgeons_sqlalchemy():
     ]
 
 
+_OPERATING_ROOMS = _freeze([
+    {
+        "room_id": "OR001",
+        "location": "Main Building - Room 101",
+        "equipment_list": [],
+    },
+    # Add more operating room documents as needed...
+])
+
+
 def initialize_operating_rooms():
-    return [
-        {
-            "room_id": "OR001",
-            "location": "Main Building - Room 101",
-            "equipment_list": [],
-        },
-        # Add more operating room documents as needed...
-    ]
+    return _OPERATING_ROOMS
 
 
 def initialize_operating_rooms_sqlalchemy():
@@ -179,67 +203,100 @@ def initialize_operating_rooms_sqlalchemy():
     ]
 
 
+_SURGERIES = _freeze([
+    {
+        "surgery_id": "SUR001",
+        "patient_id": "P001",
+        "scheduled_date": "2023-07-01",  # Use an actual date
+        "estimated_start_time": "08:00",  # New
+        "estimated_end_time": "10:00",  # New
+        "surgery_type": "Appendectomy",
+        "urgency_level": "High",
+        "duration": 120,
+        "status": "Scheduled",
+        "priority": "Normal",
+    },
+    # Add more surgery documents as needed...
+])
+
+
 def initialize_surgeries():
-    return [
-        {
-            "surgery_id": "SUR001",
-            "patient_id": "P001",
-            "scheduled_date": "2023-07-01",  # Use an actual date
-            "estimated_start_time": "08:00",  # New
-            "estimated_end_time": "10:00",  # New
-            "surgery_type": "Appendectomy",
-            "urgency_level": "High",
-            "duration": 120,
-            "status": "Scheduled",
-            "priority": "Normal",
-        },
-        # Add more surgery documents as needed...
-    ]
+    return _SURGERIES
 
-def initialize_surgeries_sqlalchemy():
-    from datetime import datetime, timedelta
+_SURGERY_TYPE_SEEDS = [
+    {"name": "Appendectomy", "description": "Removal of the appendix"},
+    {"name": "Knee Replacement", "description": "Total knee arthroplasty"},
+    {"name": "Craniotomy", "description": "Surgical opening of the skull"},
+    {"name": "Coronary Bypass", "description": "Coronary artery bypass grafting"},
+    {"name": "Hip Arthroscopy", "description": "Minimally invasive hip surgery"},
+]
+
+
+@lru_cache(maxsize=1)
+def _get_surgery_type_map():
+    """Return a read-only {name: type_id} map, seeding the default surgery types if none exist.
+
+    The map is cached for the life of the process; call
+    ``_get_surgery_type_map.cache_clear()`` after resetting the database.
+    """
     from db_config import SessionLocal
+    from models import SurgeryType
 
-    # Create a session to check if surgery types exist and get patient/surgeon IDs
     db = SessionLocal()
     try:
-        # Check if we have surgery types
-        from models import SurgeryType, Patient, Surgeon
-        surgery_types = db.query(SurgeryType).all()
-
-        # If no surgery types exist, create them
-        if not surgery_types:
-            surgery_types = [
-                SurgeryType(name="Appendectomy", description="Removal of the appendix"),
-                SurgeryType(name="Knee Replacement", description="Total knee arthroplasty"),
-                SurgeryType(name="Craniotomy", description="Surgical opening of the skull"),
-                SurgeryType(name="Coronary Bypass", description="Coronary artery bypass grafting"),
-                SurgeryType(name="Hip Arthroscopy", description="Minimally invasive hip surgery")
-            ]
-            db.add_all(surgery_types)
+        # Only existence matters here, so no SurgeryType objects are loaded
+        has_surgery_types = db.query(SurgeryType.type_id).first() is not None
+
+        # If no surgery types exist, create them in one bulk insert.
+        # insert_returning is only defined from SQLAlchemy 2.0 on, so 1.4
+        # takes the plain insert path below.
+        if not has_surgery_types and getattr(db.get_bind().dialect, 'insert_returning', False):
+            # Insert and read back the generated IDs in the same statement
+            rows = db.execute(
+                insert(SurgeryType).returning(SurgeryType.name, SurgeryType.type_id),
+                _SURGERY_TYPE_SEEDS,
+            ).all()
             db.commit()
+            return MappingProxyType(dict(rows))
 
-            # Refresh to get the IDs
-            for st in surgery_types:
-                db.refresh(st)
+        # MySQL has no INSERT ... RETURNING, so the IDs are read back
+        if not has_surgery_types:
+            db.execute(insert(SurgeryType), _SURGERY_TYPE_SEEDS)
+            db.commit()
+
+        # Create a mapping of surgery type names to IDs with one query
+        return MappingProxyType(dict(db.query(SurgeryType.name, SurgeryType.type_id).all()))
+    finally:
+        db.close()
 
-        # Create a mapping of surgery type names to IDs
-        surgery_type_map = {st.name: st.type_id for st in surgery_types}
 
+def initialize_surgeries_sqlalchemy():
+    from db_config import SessionLocal
+    from models import Patient, Surgeon
+
+    surgery_type_map = _get_surgery_type_map()
+
+    # Create a session to get patient/surgeon IDs
+    db = SessionLocal()
+    try:
         # Get actual patient and surgeon IDs from the database
-        patients = db.query(Patient).all()
-        surgeons = db.query(Surgeon).all()
+        patient_ids = [row.patient_id for row in db.query(Patient.patient_id)]
+        surgeon_ids = [row.surgeon_id for row in db.query(Surgeon.surgeon_id)]
 
-        if not patients or not surgeons:
+        if not patient_ids or not surgeon_ids:
             # Return empty list if no patients or surgeons exist
             return []
 
-        patient_ids = [p.patient_id for p in patients]
-        surgeon_ids = [s.surgeon_id for s in surgeons]
-
     finally:
         db.close()
 
+    # Every timestamp is an offset from one reading of today's midnight, so
+    # the clock is read once and all rows agree on the date
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+    def ts(day, hour, minute=0):
+        return today + timedelta(days=day, hours=hour, minutes=minute)
+
     # Define surgeries using actual patient and surgeon IDs
     surgeries = []
     if len(patient_ids) >= 1 and len(surgeon_ids) >= 1:
@@ -247,9 +304,9 @@ def initialize_surgeries_sqlalchemy():
             patient_id=patient_ids[0],
             surgeon_id=surgeon_ids[0],
             surgery_type_id=surgery_type_map.get("Appendectomy", 1),
-            scheduled_date=datetime.now().replace(hour=8, minute=0, second=0, microsecond=0),
-            start_time=datetime.now().replace(hour=8, minute=0, second=0, microsecond=0),
-            end_time=datetime.now().replace(hour=10, minute=0, second=0, microsecond=0),
+            scheduled_date=ts(0, 8),
+            start_time=ts(0, 8),
+            end_time=ts(0, 10),
             duration_minutes=120,
             status="Scheduled",
             urgency_level="High"
@@ -260,9 +317,9 @@ def initialize_surgeries_sqlalchemy():
             patient_id=patient_ids[1],
             surgeon_id=surgeon_ids[1],
             surgery_type_id=surgery_type_map.get("Knee Replacement", 2),
-            scheduled_date=datetime.now().replace(hour=10, minute=30, second=0, microsecond=0),
-            start_time=datetime.now().replace(hour=10, minute=30, second=0, microsecond=0),
-            end_time=datetime.now().replace(hour=13, minute=0, second=0, microsecond=0),
+            scheduled_date=ts(0, 10, 30),
+            start_time=ts(0, 10, 30),
+            end_time=ts(0, 13),
             duration_minutes=150,
             status="Scheduled",
             urgency_level="Medium"
@@ -273,9 +330,9 @@ def initialize_surgeries_sqlalchemy():
             patient_id=patient_ids[2],
             surgeon_id=surgeon_ids[0],
             surgery_type_id=surgery_type_map.get("Craniotomy", 3),
-            scheduled_date=(datetime.now() + timedelta(days=1)).replace(hour=9, minute=0, second=0, microsecond=0),
-            start_time=(datetime.now() + timedelta(days=1)).replace(hour=9, minute=0, second=0, microsecond=0),
-            end_time=(datetime.now() + timedelta(days=1)).replace(hour=13, minute=0, second=0, microsecond=0),
+            scheduled_date=ts(1, 9),
+            start_time=ts(1, 9),
+            end_time=ts(1, 13),
             duration_minutes=240,
             status="Scheduled",
             urgency_level="High"
@@ -286,9 +343,9 @@ def initialize_surgeries_sqlalchemy():
             patient_id=patient_ids[0],
             surgeon_id=surgeon_ids[1],
             surgery_type_id=surgery_type_map.get("Coronary Bypass", 4),
-            scheduled_date=(datetime.now() + timedelta(days=2)).replace(hour=7, minute=30, second=0, microsecond=0),
-            start_time=(datetime.now() + timedelta(days=2)).replace(hour=7, minute=30, second=0, microsecond=0),
-            end_time=(datetime.now() + timedelta(days=2)).replace(hour=12, minute=30, second=0, microsecond=0),
+            scheduled_date=ts(2, 7, 30),
+            start_time=ts(2, 7, 30),
+            end_time=ts(2, 12, 30),
             duration_minutes=300,
             status="Scheduled",
             urgency_level="High"
@@ -299,9 +356,9 @@ def initialize_surgeries_sqlalchemy():
             patient_id=patient_ids[1],
             surgeon_id=surgeon_ids[0],
             surgery_type_id=surgery_type_map.get("Hip Arthroscopy", 5),
-            scheduled_date=(datetime.now() + timedelta(days=3)).replace(hour=14, minute=0, second=0, microsecond=0),
-            start_time=(datetime.now() + timedelta(days=3)).replace(hour=14, minute=0, second=0, microsecond=0),
-            end_time=(datetime.now() + timedelta(days=3)).replace(hour=16, minute=0, second=0, microsecond=0),
+            scheduled_date=ts(3, 14),
+            start_time=ts(3, 14),
+            end_time=ts(3, 16),
             duration_minutes=120,
             status="Scheduled",
             urgency_level="Low"
@@ -311,16 +368,19 @@ def initialize_surgeries_sqlalchemy():
 
 
 
+_SURGERY_EQUIPMENTS = _freeze([
+    {
+        "equipment_id": "EQ001",
+        "name": "Scalpel",
+        "type": "Tool",
+        "availability": True,
+    },
+    # Add more surgery equipment documents as needed...
+])
+
+
 def initialize_surgery_equipments():
-    return [
-        {
-            "equipment_id": "EQ001",
-            "name": "Scalpel",
-            "type": "Tool",
-            "availability": True,
-        },
-        # Add more surgery equipment documents as needed...
-    ]
+    return _SURGERY_EQUIPMENTS
 
 
 def initialize_surgery_equipments_sqlalchemy():
@@ -344,51 +404,63 @@ def initialize_surgery_equipments_sqlalchemy():
     ]
 
 
+_SURGERY_EQUIPMENT_USAGES = _freeze([
+    {"usage_id": "EU001", "surgery_id": "SUR001", "equipment_id": "EQ001"},
+    # Add more surgery equipment usage documents as needed...
+])
+
+
 def initialize_surgery_equipment_usages():
-    return [
-        {"usage_id": "EU001", "surgery_id": "SUR001", "equipment_id": "EQ001"},
-        # Add more surgery equipment usage documents as needed...
-    ]
+    return _SURGERY_EQUIPMENT_USAGES
+
+
+_SURGERY_ROOM_ASSIGNMENTS = _freeze([
+    {
+        "assignment_id": "RA001",
+        "surgery_id": "SUR001",
+        "room_id": "OR001",
+        "start_time": "2023-07-01 08:00",
+        "end_time": "2023-07-01 10:00",
+    },
+    # Add more surgery room assignment documents as needed...
+])
 
 
 def initialize_surgery_room_assignments():
-    return [
-        {
-            "assignment_id": "RA001",
-            "surgery_id": "SUR001",
-            "room_id": "OR001",
-            "start_time": "2023-07-01 08:00",
-            "end_time": "2023-07-01 10:00",
-        },
-        # Add more surgery room assignment documents as needed...
-    ]
+    return _SURGERY_ROOM_ASSIGNMENTS
+
+
+_SURGERY_STAFF_ASSIGNMENTS = _freeze([
+    {
+        "assignment_id": "SA001",
+        "surgery_id": "SUR001",
+        "staff_id": "S002",
+        "role": "Surgeon",
+    },
+    # Add more surgery staff assignment documents as needed...
+])
 
 
 def initialize_surgery_staff_assignments():
-    return [
-        {
-            "assignment_id": "SA001",
-            "surgery_id": "SUR001",
-            "staff_id": "S002",
-            "role": "Surgeon",
-        },
-        # Add more surgery staff assignment documents as needed...
-    ]
+    return _SURGERY_STAFF_ASSIGNMENTS
+
+
+_SURGERY_APPOINTMENTS = _freeze([
+    {
+        "appointment_id": "APPT001",
+        "surgery_id": "SUR001",
+        "patient_id": "P001",
+        "staff_assignments": [
+            {"staff_id": "S002", "role": "Lead Surgeon"}
+            # Add more staff assignments as needed
+        ],
+        "room_id": "OR001",
+        "start_time": "2023-07-01T09:00:00",
+        "end_time": "2023-07-01T11:00:00",
+    },
+    # Add more appointments as needed...
+])
 
 
 def initialize_surgery_appointments():
-    return [
-        {
-            "appointment_id": "APPT001",
-            "surgery_id": "SUR001",
-            "patient_id": "P001",
-            "staff_assignments": [
-                {"staff_id": "S002", "role": "Lead Surgeon"}
-                # Add more staff assignments as needed
-            ],
-            "room_id": "OR001",
-            "start_time": "2023-07-01T09:00:00",
-            "end_time": "2023-07-01T11:00:00",
-        },
-        # Add more appointments as needed...
-    ]
+    return _SURGERY_APPOINTMENTS
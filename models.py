@@ -8,6 +8,8 @@ from sqlalchemy import (
     Boolean,
     Text,
     ForeignKey,
+    Index,
+    Table,
     Enum as GenericEnum,  # Changed from MySQLEnum
 )
 from sqlalchemy.orm import relationship
@@ -99,8 +101,8 @@ class Surgery(Base):
         nullable=False,
         server_default="Scheduled",
     )
-    start_time = Column(DateTime, nullable=True)
-    end_time = Column(DateTime, nullable=True)
+    start_time = Column(DateTime, nullable=True, index=True)
+    end_time = Column(DateTime, nullable=True, index=True)
     patient_id = Column(
         Integer,
         ForeignKey("patient.patient_id", ondelete="RESTRICT", onupdate="CASCADE"),
@@ -164,6 +166,11 @@ class SurgeryEquipmentUsage(Base):
     surgery = relationship("Surgery", back_populates="equipment_usages")
     equipment = relationship("SurgeryEquipment", back_populates="usages")
 
+    # Serves the per-equipment time overlap query
+    __table_args__ = (
+        Index("ix_surgeryequipmentusage_equipment_start", "equipment_id", "usage_start_time"),
+    )
+
 
 class SurgeryStaffAssignment(Base):
     __tablename__ = "surgerystaffassignment"
@@ -254,8 +261,29 @@ class SurgeryRoomAssignment(Base):
         ForeignKey("operatingroom.room_id", ondelete="RESTRICT", onupdate="CASCADE"),
         nullable=False,
     )
-    start_time = Column(DateTime, nullable=False)
+    start_time = Column(DateTime, nullable=False, index=True)
     end_time = Column(DateTime, nullable=False)
+    # Eager-load with selectinload when iterating many assignments
+    surgery = relationship("Surgery")
+
+
+# Equipment a surgery type needs in its operating room
+surgery_type_required_equipment = Table(
+    "surgerytyperequiredequipment",
+    Base.metadata,
+    Column(
+        "surgery_type_id",
+        Integer,
+        ForeignKey("surgerytype.type_id", ondelete="CASCADE", onupdate="CASCADE"),
+        primary_key=True,
+    ),
+    Column(
+        "equipment_id",
+        Integer,
+        ForeignKey("surgeryequipment.equipment_id", ondelete="CASCADE", onupdate="CASCADE"),
+        primary_key=True,
+    ),
+)
 
 
 class SurgeryType(Base):
@@ -268,6 +296,14 @@ class SurgeryType(Base):
     # Relationship to Surgery, indicating which surgeries are of this type
     surgeries = relationship("Surgery", back_populates="surgery_type_details")
 
+    # Equipment the operating room must have for this surgery type
+    required_equipment = relationship(
+        "SurgeryEquipment",
+        secondary=surgery_type_required_equipment,
+        collection_class=set,
+        lazy="selectin",
+    )
+
     # Relationships to SequenceDependentSetupTime
     # Setup times where this surgery type is the preceding type
     setups_from_this_type = relationship(
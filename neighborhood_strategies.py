@@ -8,7 +8,7 @@ for the Tabu Search optimizer, working with the full models.
 import logging
 import random
 import itertools
-import copy
+from functools import cached_property
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional, Tuple
 
@@ -81,6 +81,37 @@ class NeighborhoodStrategies:
             if hasattr(surgery, 'surgery_type_id'):
                 self.surgery_id_to_type_id_map[surgery.surgery_id] = surgery.surgery_type_id
 
+    @cached_property
+    def compatible_pairs(self):
+        """
+        Set of (surgery_id, room_id) pairs whose room suits the surgery type.
+
+        Room suitability does not depend on the schedule, so it is computed once
+        and used to drop incompatible room moves before the full feasibility check.
+        """
+        return {
+            (surgery.surgery_id, room.room_id)
+            for surgery in self.surgeries
+            for room in self.operating_rooms
+            if self.feasibility_checker.is_room_suitable_for_surgery(room.room_id, surgery.surgery_id)
+        }
+
+    @staticmethod
+    def _copy_assignment(assignment):
+        """
+        Copy an assignment's column values into a new transient assignment.
+
+        Neighbor moves only change rooms and times, so copying the column values
+        is enough and avoids deep-copying the SQLAlchemy instance state.
+        """
+        return SurgeryRoomAssignment(
+            assignment_id=assignment.assignment_id,
+            surgery_id=assignment.surgery_id,
+            room_id=assignment.room_id,
+            start_time=assignment.start_time,
+            end_time=assignment.end_time
+        )
+
     def initialize_solution_randomly(self):
         """
         Generate a random initial solution.
@@ -221,8 +252,12 @@ class NeighborhoodStrategies:
                 if room.room_id == current_room_id:
                     continue
 
+                # Skip rooms that cannot host this surgery type
+                if (assignment.surgery_id, room.room_id) not in self.compatible_pairs:
+                    continue
+
                 # Create a new assignment with the different room
-                new_assignment = copy.deepcopy(assignment)
+                new_assignment = self._copy_assignment(assignment)
                 new_assignment.room_id = room.room_id
 
                 # Check if the move is tabu
@@ -272,10 +307,16 @@ class NeighborhoodStrategies:
             min(len(pairs), self.max_neighbors_per_strategy)
         )
 
+        compatible_pairs = self.compatible_pairs
         for assignment1, assignment2 in pairs_to_consider:
+            # Skip swaps that put either surgery in an unsuitable room
+            if ((assignment1.surgery_id, assignment2.room_id) not in compatible_pairs or
+                    (assignment2.surgery_id, assignment1.room_id) not in compatible_pairs):
+                continue
+
             # Swap rooms
-            new_assignment1 = copy.deepcopy(assignment1)
-            new_assignment2 = copy.deepcopy(assignment2)
+            new_assignment1 = self._copy_assignment(assignment1)
+            new_assignment2 = self._copy_assignment(assignment2)
 
             new_assignment1.room_id, new_assignment2.room_id = new_assignment2.room_id, new_assignment1.room_id
 
@@ -332,7 +373,7 @@ class NeighborhoodStrategies:
         for assignment in surgeries_to_consider:
             for shift in time_shifts:
                 # Create a new assignment with shifted times
-                new_assignment = copy.deepcopy(assignment)
+                new_assignment = self._copy_assignment(assignment)
                 new_assignment.start_time += timedelta(minutes=shift)
                 new_assignment.end_time += timedelta(minutes=shift)
 
@@ -390,7 +431,7 @@ class NeighborhoodStrategies:
                     continue
 
                 # Create a new assignment with the new time slot
-                new_assignment = copy.deepcopy(assignment)
+                new_assignment = self._copy_assignment(assignment)
                 new_assignment.start_time = start_time
                 new_assignment.end_time = start_time + timedelta(minutes=duration_minutes)
 
@@ -455,7 +496,7 @@ class NeighborhoodStrategies:
             # Try swapping adjacent surgeries
             for i in range(len(assignments) - 1):
                 # Create new assignments with swapped order
-                new_assignments = copy.deepcopy(assignments)
+                new_assignments = [self._copy_assignment(a) for a in assignments]
 
                 # Swap start and end times
                 duration1 = (new_assignments[i].end_time - new_assignments[i].start_time).total_seconds() / 60
@@ -571,7 +612,7 @@ class NeighborhoodStrategies:
                     original_assignment = next(a for a in assignments if a.surgery_id == surgery_id)
 
                     # Create a new assignment with the new time
-                    new_assignment = copy.deepcopy(original_assignment)
+                    new_assignment = self._copy_assignment(original_assignment)
                     duration = (original_assignment.end_time - original_assignment.start_time).total_seconds() / 60
 
                     # Add setup time if not the first surgery
@@ -668,7 +709,7 @@ class NeighborhoodStrategies:
                 # If there's significant idle time, try to move the next surgery earlier
                 if idle_time > 30:
                     # Create a new assignment with an earlier start time
-                    new_assignment = copy.deepcopy(assignments[i+1])
+                    new_assignment = self._copy_assignment(assignments[i+1])
                     new_start = assignments[i].end_time + timedelta(minutes=15)  # 15-minute buffer
                     duration = (new_assignment.end_time - new_assignment.start_time).total_seconds() / 60
                     new_assignment.start_time = new_start
@@ -109,7 +109,9 @@ class NotificationService(metaclass=SingletonMeta):
     Service for sending notifications to users.
 
     This service supports sending notifications via email, SMS, or other channels.
-    It uses a background thread to process notifications asynchronously.
+    It uses a pool of background threads to process notifications asynchronously,
+    so queued sends (e.g. one per surgeon affected by an emergency) are delivered
+    concurrently instead of one network round trip after another.
     """
 
     def __init__(self):
@@ -128,28 +130,35 @@ class NotificationService(metaclass=SingletonMeta):
 
         # Queue for asynchronous processing
         self.queue = queue.PriorityQueue()
-        self.queue_thread = None
+        self.queue_workers = max(1, int(os.getenv('NOTIFICATION_WORKERS', 4)))
+        self.queue_threads: List[threading.Thread] = []
         self.queue_running = False
 
-        # Start the queue processing thread
+        # Start the queue processing threads
         self.start_queue_processing()
 
     def start_queue_processing(self):
-        """Start the background thread for processing notifications."""
-        if self.queue_thread is None or not self.queue_thread.is_alive():
+        """Start the background threads for processing notifications."""
+        self.queue_threads = [thread for thread in self.queue_threads if thread.is_alive()]
+        if len(self.queue_threads) < self.queue_workers:
             self.queue_running = True
-            self.queue_thread = threading.Thread(
-                target=self._process_queue,
-                daemon=True
-            )
-            self.queue_thread.start()
-            logger.info("Notification queue processing started")
+            for _ in range(self.queue_workers - len(self.queue_threads)):
+                thread = threading.Thread(
+                    target=self._process_queue,
+                    daemon=True
+                )
+                thread.start()
+                self.queue_threads.append(thread)
+            logger.info(f"Notification queue processing started with {self.queue_workers} workers")
 
     def stop_queue_processing(self):
-        """Stop the background thread for processing notifications."""
+        """Stop the background threads for processing notifications."""
         self.queue_running = False
-        if self.queue_thread and self.queue_thread.is_alive():
-            self.queue_thread.join(timeout=5.0)
+        running = [thread for thread in self.queue_threads if thread.is_alive()]
+        for thread in running:
+            thread.join(timeout=5.0)
+        self.queue_threads = []
+        if running:
             logger.info("Notification queue processing stopped")
 
     def _process_queue(self):
@@ -6,8 +6,9 @@ and evaluates schedules based on multiple criteria.
 """
 
 import logging
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional, Tuple, Union
+from typing import List, Dict, Any, Optional, Tuple, Union, NamedTuple
 
 from models import (
     Surgery,
@@ -20,6 +21,20 @@ from models import (
 
 logger = logging.getLogger(__name__)
 
+
+class AssignmentTerms(NamedTuple):
+    """Objective terms that depend on a single assignment only."""
+    duration: Optional[float]  # Minutes, None without start/end times
+    surgery_found: bool
+    surgeon_id: Optional[int]
+    preferences_total: int
+    preferences_satisfied: int
+    wait_score: Optional[float]
+    priority_score: Optional[float]
+    early_overtime: float
+    late_overtime: float
+
+
 class SolutionEvaluator:
     """
     Solution evaluator for surgery scheduling.
@@ -34,6 +49,20 @@ class SolutionEvaluator:
     - Operational costs
     """
 
+    # Maximum number of cached per-assignment terms
+    ASSIGNMENT_TERMS_CACHE_SIZE = 65536
+
+    # Map urgency levels to emergency priority scores
+    URGENCY_PRIORITY_SCORES = {
+        'High': 1.0,
+        'Medium': 0.5,
+        'Low': 0.0
+    }
+
+    # Normal working hours (8:00 AM to 5:00 PM); time outside them is overtime
+    NORMAL_START_HOUR = 8
+    NORMAL_END_HOUR = 17
+
     def __init__(self, db_session, weights=None, sds_times_data=None):
         """
         Initialize the solution evaluator.
@@ -54,6 +83,10 @@ class SolutionEvaluator:
         self.surgery_types_cache = {}
         self.surgeon_preferences_cache = {}
 
+        # Per-assignment objective terms keyed by (surgery, room, start, end); a neighbor
+        # differs from its parent by one move, so only the moved assignments are recomputed (LRU)
+        self.assignment_terms_cache: 'OrderedDict[Tuple, AssignmentTerms]' = OrderedDict()
+
         # Load data into cache if db_session is provided
         if self.db_session:
             self._load_cache_data()
@@ -122,6 +155,48 @@ class SolutionEvaluator:
         Returns:
             Total score for the solution
         """
+        total_score = self._score_solution(solution, schedule_start_time, schedule_end_time)
+        logger.info(f"Total evaluation score: {total_score:.4f}")
+        return total_score
+
+    def evaluate_solutions(self, solutions):
+        """
+        Evaluate a batch of solutions, such as one iteration's neighbors.
+
+        Each solution's assignment terms are resolved once into a table
+        shared by all criteria, and a single summary line is logged for the
+        batch instead of one INFO line per solution.
+
+        Args:
+            solutions: List of solutions (lists of SurgeryRoomAssignment objects)
+
+        Returns:
+            List of total scores, in the same order as the solutions
+        """
+        scores = [self._score_solution(solution) for solution in solutions]
+        if scores:
+            logger.debug(f"Evaluated {len(scores)} solutions, best score: {max(scores):.4f}")
+        return scores
+
+    def approximate_scores(self, solutions):
+        """
+        Cheaply estimate the scores of a batch of solutions.
+
+        The estimate is the weighted total without the sequence-dependent setup
+        time criterion, the one criterion that needs a per-room sort and setup
+        lookups instead of the cached assignment terms. It is meant for ranking
+        candidates before exact evaluation, not as a final score.
+
+        Args:
+            solutions: List of solutions (lists of SurgeryRoomAssignment objects)
+
+        Returns:
+            List of estimated scores, in the same order as the solutions
+        """
+        return [self._score_solution(solution, approximate=True) for solution in solutions]
+
+    def _score_solution(self, solution, schedule_start_time=None, schedule_end_time=None, approximate=False):
+        """Compute the weighted total score of one solution, optionally without setup times."""
         if not solution:
             logger.warning("Empty solution provided for evaluation")
             return 0
@@ -138,32 +213,36 @@ class SolutionEvaluator:
             schedule_start_time = min(start_times)
             schedule_end_time = max(end_times)
 
+        # Resolve each assignment's terms once for all criteria
+        terms = self._solution_terms(solution)
+
         # Calculate scores for each criterion
         scores = {}
 
         # 1. Operating room utilization
-        scores["or_utilization"] = self._calculate_or_utilization(solution, schedule_start_time, schedule_end_time)
+        scores["or_utilization"] = self._calculate_or_utilization(solution, schedule_start_time, schedule_end_time, terms)
 
         # 2. Sequence-dependent setup time
-        scores["sds_time_penalty"] = self._calculate_sds_time(solution)
+        if not approximate:
+            scores["sds_time_penalty"] = self._calculate_sds_time(solution)
 
         # 3. Surgeon preference satisfaction
-        scores["surgeon_preference_satisfaction"] = self._calculate_surgeon_preference_satisfaction(solution)
+        scores["surgeon_preference_satisfaction"] = self._calculate_surgeon_preference_satisfaction(solution, terms)
 
         # 4. Workload balance
-        scores["workload_balance"] = self._calculate_workload_balance(solution)
+        scores["workload_balance"] = self._calculate_workload_balance(solution, terms)
 
         # 5. Patient wait time
-        scores["patient_wait_time"] = self._calculate_patient_wait_time(solution)
+        scores["patient_wait_time"] = self._calculate_patient_wait_time(solution, terms)
 
         # 6. Emergency surgery priority
-        scores["emergency_surgery_priority"] = self._calculate_emergency_priority(solution)
+        scores["emergency_surgery_priority"] = self._calculate_emergency_priority(solution, terms)
 
         # 7. Operational cost
-        scores["operational_cost"] = self._calculate_operational_cost(solution)
+        scores["operational_cost"] = self._calculate_operational_cost(solution, terms)
 
         # 8. Staff overtime
-        scores["staff_overtime"] = self._calculate_staff_overtime(solution, schedule_start_time, schedule_end_time)
+        scores["staff_overtime"] = self._calculate_staff_overtime(solution, schedule_start_time, schedule_end_time, terms)
 
         # Calculate total score
         total_score = 0
@@ -172,10 +251,131 @@ class SolutionEvaluator:
             total_score += weighted_score
             logger.debug(f"{criterion}: {score:.4f} * {self.weights.get(criterion, 0):.2f} = {weighted_score:.4f}")
 
-        logger.info(f"Total evaluation score: {total_score:.4f}")
         return total_score
 
-    def _calculate_or_utilization(self, solution, schedule_start_time, schedule_end_time):
+    def _get_surgery(self, surgery_id):
+        """Get a surgery from the cache, falling back to the database."""
+        surgery = self.surgeries_cache.get(surgery_id)
+        if not surgery:
+            surgery = self.db_session.query(Surgery).filter_by(surgery_id=surgery_id).first()
+            if surgery:
+                self.surgeries_cache[surgery_id] = surgery
+        return surgery
+
+    def _assignment_terms(self, assignment) -> AssignmentTerms:
+        """
+        Get the per-assignment objective terms, computing them on first use.
+
+        Terms are cached by the assignment's surgery, room and times, so
+        evaluating a neighbor only does this work for the assignments its
+        move changed. The cache keeps the most recently used
+        ASSIGNMENT_TERMS_CACHE_SIZE entries. Terms are not cached when the surgery cannot be found,
+        so a later evaluation looks it up again.
+        """
+        key = (assignment.surgery_id, assignment.room_id, assignment.start_time, assignment.end_time)
+        terms = self.assignment_terms_cache.get(key)
+        if terms is None:
+            terms = self._compute_assignment_terms(assignment)
+            if terms.surgery_found or not self.db_session:
+                self.assignment_terms_cache[key] = terms
+                if len(self.assignment_terms_cache) > self.ASSIGNMENT_TERMS_CACHE_SIZE:
+                    self.assignment_terms_cache.popitem(last=False)
+        else:
+            self.assignment_terms_cache.move_to_end(key)
+        return terms
+
+    def _solution_terms(self, solution, terms=None) -> List[AssignmentTerms]:
+        """Get the terms of every assignment in a solution, unless already resolved."""
+        if terms is not None:
+            return terms
+        return [self._assignment_terms(assignment) for assignment in solution]
+
+    def _compute_assignment_terms(self, assignment) -> AssignmentTerms:
+        """Compute the objective terms contributed by one assignment."""
+        # Duration in minutes
+        duration = None
+        if assignment.start_time and assignment.end_time:
+            duration = (assignment.end_time - assignment.start_time).total_seconds() / 60
+
+        surgery = self._get_surgery(assignment.surgery_id) if self.db_session else None
+        surgeon_id = getattr(surgery, 'surgeon_id', None) if surgery else None
+
+        # Surgeon preferences
+        preferences_total = 0
+        preferences_satisfied = 0
+        if surgeon_id:
+            preferences = self.surgeon_preferences_cache.get(surgeon_id)
+            if preferences is None:
+                preferences = self.db_session.query(SurgeonPreference).filter_by(surgeon_id=surgeon_id).all()
+                self.surgeon_preferences_cache[surgeon_id] = preferences
+
+            for pref in preferences:
+                preferences_total += 1
+
+                # Check if preference is satisfied
+                if pref.preference_type == 'room_id' and str(assignment.room_id) == pref.preference_value:
+                    preferences_satisfied += 1
+                elif pref.preference_type == 'day_of_week' and assignment.start_time.strftime('%A') == pref.preference_value:
+                    preferences_satisfied += 1
+                elif pref.preference_type == 'time_of_day':
+                    hour = assignment.start_time.hour
+                    if (pref.preference_value == 'morning' and 8 <= hour < 12) or \
+                       (pref.preference_value == 'afternoon' and 12 <= hour < 17) or \
+                       (pref.preference_value == 'evening' and 17 <= hour < 20):
+                        preferences_satisfied += 1
+
+        # Patient wait time and emergency priority, both driven by urgency and time of day
+        wait_score = None
+        priority_score = None
+        if surgery and assignment.start_time:
+            urgency_level = getattr(surgery, 'urgency_level', 'Medium')
+            hour = assignment.start_time.hour
+
+            if urgency_level == 'High':
+                # High urgency surgeries should be early in the day
+                wait_score = hour / 24.0  # 0 for midnight, 0.5 for noon
+            elif urgency_level == 'Medium':
+                # Medium urgency is neutral
+                wait_score = 0.5
+            else:  # Low urgency
+                # Low urgency surgeries can be later in the day
+                wait_score = 1.0 - (hour / 24.0)  # Higher score for later hours
+
+            base_score = self.URGENCY_PRIORITY_SCORES.get(urgency_level, 0.5)
+
+            # Adjust score based on time of day (earlier is better for high urgency)
+            if urgency_level == 'High':
+                time_factor = max(0, 1.0 - (hour / 12.0))  # 1.0 at midnight, 0.0 at noon or later
+                priority_score = base_score * (0.5 + 0.5 * time_factor)  # Weighted average
+            else:
+                priority_score = base_score
+
+        # Staff overtime outside normal working hours
+        early_overtime = 0
+        late_overtime = 0
+        if assignment.start_time and assignment.end_time:
+            day_start = assignment.start_time.replace(hour=self.NORMAL_START_HOUR, minute=0, second=0, microsecond=0)
+            day_end = assignment.start_time.replace(hour=self.NORMAL_END_HOUR, minute=0, second=0, microsecond=0)
+
+            if assignment.start_time < day_start:
+                early_overtime = (day_start - assignment.start_time).total_seconds() / 60
+
+            if assignment.end_time > day_end:
+                late_overtime = (assignment.end_time - day_end).total_seconds() / 60
+
+        return AssignmentTerms(
+            duration=duration,
+            surgery_found=surgery is not None,
+            surgeon_id=surgeon_id,
+            preferences_total=preferences_total,
+            preferences_satisfied=preferences_satisfied,
+            wait_score=wait_score,
+            priority_score=priority_score,
+            early_overtime=early_overtime,
+            late_overtime=late_overtime
+        )
+
+    def _calculate_or_utilization(self, solution, schedule_start_time, schedule_end_time, terms=None):
         """
         Calculate operating room utilization.
 
@@ -183,6 +383,7 @@ class SolutionEvaluator:
             solution: List of SurgeryRoomAssignment objects
             schedule_start_time: Start time of the schedule window
             schedule_end_time: End time of the schedule window
+            terms: Optional assignment terms already resolved for the solution
 
         Returns:
             OR utilization score (0-1, higher is better)
@@ -204,9 +405,9 @@ class SolutionEvaluator:
 
         # Calculate total used time
         total_used_time = 0
-        for assignment in solution:
-            if assignment.start_time and assignment.end_time:
-                duration = (assignment.end_time - assignment.start_time).total_seconds() / 60
+        for assignment_terms in self._solution_terms(solution, terms):
+            duration = assignment_terms.duration
+            if duration is not None:
                 total_used_time += duration
 
         # Calculate utilization
@@ -290,12 +491,13 @@ class SolutionEvaluator:
         logger.debug(f"Total SDST: {total_sds_time} minutes, normalized penalty: {normalized_penalty:.4f}")
         return normalized_penalty
 
-    def _calculate_surgeon_preference_satisfaction(self, solution):
+    def _calculate_surgeon_preference_satisfaction(self, solution, terms=None):
         """
         Calculate surgeon preference satisfaction.
 
         Args:
             solution: List of SurgeryRoomAssignment objects
+            terms: Optional assignment terms already resolved for the solution
 
         Returns:
             Preference satisfaction score (0-1, higher is better)
@@ -307,43 +509,9 @@ class SolutionEvaluator:
         total_preferences = 0
         satisfied_preferences = 0
 
-        for assignment in solution:
-            # Get the surgery
-            surgery_id = assignment.surgery_id
-            surgery = self.surgeries_cache.get(surgery_id)
-            if not surgery:
-                surgery = self.db_session.query(Surgery).filter_by(surgery_id=surgery_id).first()
-                if surgery:
-                    self.surgeries_cache[surgery_id] = surgery
-
-            if not surgery:
-                continue
-
-            # Get the surgeon
-            surgeon_id = getattr(surgery, 'surgeon_id', None)
-            if not surgeon_id:
-                continue
-
-            # Get surgeon preferences
-            preferences = self.surgeon_preferences_cache.get(surgeon_id, [])
-            if not preferences:
-                preferences = self.db_session.query(SurgeonPreference).filter_by(surgeon_id=surgeon_id).all()
-                self.surgeon_preferences_cache[surgeon_id] = preferences
-
-            for pref in preferences:
-                total_preferences += 1
-
-                # Check if preference is satisfied
-                if pref.preference_type == 'room_id' and str(assignment.room_id) == pref.preference_value:
-                    satisfied_preferences += 1
-                elif pref.preference_type == 'day_of_week' and assignment.start_time.strftime('%A') == pref.preference_value:
-                    satisfied_preferences += 1
-                elif pref.preference_type == 'time_of_day':
-                    hour = assignment.start_time.hour
-                    if (pref.preference_value == 'morning' and 8 <= hour < 12) or \
-                       (pref.preference_value == 'afternoon' and 12 <= hour < 17) or \
-                       (pref.preference_value == 'evening' and 17 <= hour < 20):
-                        satisfied_preferences += 1
+        for assignment_terms in self._solution_terms(solution, terms):
+            total_preferences += assignment_terms.preferences_total
+            satisfied_preferences += assignment_terms.preferences_satisfied
 
         # Calculate satisfaction rate
         if total_preferences > 0:
@@ -354,12 +522,13 @@ class SolutionEvaluator:
             logger.debug("No surgeon preferences found")
             return 1.0  # If no preferences, consider them all satisfied
 
-    def _calculate_workload_balance(self, solution):
+    def _calculate_workload_balance(self, solution, terms=None):
         """
         Calculate workload balance among surgeons.
 
         Args:
             solution: List of SurgeryRoomAssignment objects
+            terms: Optional assignment terms already resolved for the solution
 
         Returns:
             Workload balance score (0-1, higher is better)
@@ -367,33 +536,17 @@ class SolutionEvaluator:
         # Group surgeries by surgeon
         surgeon_workloads = {}
 
-        for assignment in solution:
-            # Get the surgery
-            surgery_id = assignment.surgery_id
-            surgery = None
-
-            if self.db_session:
-                surgery = self.surgeries_cache.get(surgery_id)
-                if not surgery:
-                    surgery = self.db_session.query(Surgery).filter_by(surgery_id=surgery_id).first()
-                    if surgery:
-                        self.surgeries_cache[surgery_id] = surgery
-
-            if not surgery:
-                continue
-
+        for assignment_terms in self._solution_terms(solution, terms):
             # Get the surgeon
-            surgeon_id = getattr(surgery, 'surgeon_id', None)
+            surgeon_id = assignment_terms.surgeon_id
             if not surgeon_id:
                 continue
 
-            # Calculate duration
-            if assignment.start_time and assignment.end_time:
-                duration = (assignment.end_time - assignment.start_time).total_seconds() / 60
-
+            # Add the duration
+            if assignment_terms.duration is not None:
                 if surgeon_id not in surgeon_workloads:
                     surgeon_workloads[surgeon_id] = 0
-                surgeon_workloads[surgeon_id] += duration
+                surgeon_workloads[surgeon_id] += assignment_terms.duration
 
         # Calculate workload balance
         if len(surgeon_workloads) <= 1:
@@ -416,12 +569,13 @@ class SolutionEvaluator:
         logger.debug(f"Workload balance: {normalized_balance:.4f} (std_dev: {std_dev:.0f}, mean: {mean_workload:.0f})")
         return normalized_balance
 
-    def _calculate_patient_wait_time(self, solution):
+    def _calculate_patient_wait_time(self, solution, terms=None):
         """
         Calculate patient wait time penalty.
 
         Args:
             solution: List of SurgeryRoomAssignment objects
+            terms: Optional assignment terms already resolved for the solution
 
         Returns:
             Wait time penalty score (0-1, lower is better)
@@ -436,35 +590,11 @@ class SolutionEvaluator:
         total_wait_score = 0
         count = 0
 
-        for assignment in solution:
-            # Get the surgery
-            surgery_id = assignment.surgery_id
-            surgery = self.surgeries_cache.get(surgery_id)
-            if not surgery:
-                surgery = self.db_session.query(Surgery).filter_by(surgery_id=surgery_id).first()
-                if surgery:
-                    self.surgeries_cache[surgery_id] = surgery
-
-            if not surgery:
+        for assignment_terms in self._solution_terms(solution, terms):
+            wait_score = assignment_terms.wait_score
+            if wait_score is None:
                 continue
 
-            # Get urgency level
-            urgency_level = getattr(surgery, 'urgency_level', 'Medium')
-
-            # Calculate wait time score based on urgency and time of day
-            # Higher urgency should be scheduled earlier in the day
-            hour = assignment.start_time.hour
-
-            if urgency_level == 'High':
-                # High urgency surgeries should be early in the day
-                wait_score = hour / 24.0  # 0 for midnight, 0.5 for noon
-            elif urgency_level == 'Medium':
-                # Medium urgency is neutral
-                wait_score = 0.5
-            else:  # Low urgency
-                # Low urgency surgeries can be later in the day
-                wait_score = 1.0 - (hour / 24.0)  # Higher score for later hours
-
             total_wait_score += wait_score
             count += 1
 
@@ -477,12 +607,13 @@ class SolutionEvaluator:
             logger.debug("No valid surgeries for wait time calculation")
             return 0.5  # Neutral score
 
-    def _calculate_emergency_priority(self, solution):
+    def _calculate_emergency_priority(self, solution, terms=None):
         """
         Calculate emergency surgery priority score.
 
         Args:
             solution: List of SurgeryRoomAssignment objects
+            terms: Optional assignment terms already resolved for the solution
 
         Returns:
             Emergency priority score (0-1, higher is better)
@@ -491,43 +622,14 @@ class SolutionEvaluator:
             logger.debug("No database session available, skipping emergency priority calculation")
             return 0.5  # Neutral score
 
-        # Map urgency levels to priority scores
-        urgency_scores = {
-            'High': 1.0,
-            'Medium': 0.5,
-            'Low': 0.0
-        }
-
         total_score = 0
         count = 0
 
-        for assignment in solution:
-            # Get the surgery
-            surgery_id = assignment.surgery_id
-            surgery = self.surgeries_cache.get(surgery_id)
-            if not surgery:
-                surgery = self.db_session.query(Surgery).filter_by(surgery_id=surgery_id).first()
-                if surgery:
-                    self.surgeries_cache[surgery_id] = surgery
-
-            if not surgery:
+        for assignment_terms in self._solution_terms(solution, terms):
+            priority_score = assignment_terms.priority_score
+            if priority_score is None:
                 continue
 
-            # Get urgency level
-            urgency_level = getattr(surgery, 'urgency_level', 'Medium')
-
-            # Calculate priority score
-            # Higher urgency surgeries should be scheduled earlier in the day
-            hour = assignment.start_time.hour
-            base_score = urgency_scores.get(urgency_level, 0.5)
-
-            # Adjust score based on time of day (earlier is better for high urgency)
-            if urgency_level == 'High':
-                time_factor = max(0, 1.0 - (hour / 12.0))  # 1.0 at midnight, 0.0 at noon or later
-                priority_score = base_score * (0.5 + 0.5 * time_factor)  # Weighted average
-            else:
-                priority_score = base_score
-
             total_score += priority_score
             count += 1
 
@@ -540,12 +642,13 @@ class SolutionEvaluator:
             logger.debug("No valid surgeries for emergency priority calculation")
             return 0.5  # Neutral score
 
-    def _calculate_operational_cost(self, solution):
+    def _calculate_operational_cost(self, solution, terms=None):
         """
         Calculate operational cost penalty.
 
         Args:
             solution: List of SurgeryRoomAssignment objects
+            terms: Optional assignment terms already resolved for the solution
 
         Returns:
             Operational cost penalty score (0-1, lower is better)
@@ -556,14 +659,14 @@ class SolutionEvaluator:
         # Group assignments by room
         room_utilization = {}
 
-        for assignment in solution:
+        for assignment, assignment_terms in zip(solution, self._solution_terms(solution, terms)):
             room_id = assignment.room_id
 
             if room_id not in room_utilization:
                 room_utilization[room_id] = 0
 
-            if assignment.start_time and assignment.end_time:
-                duration = (assignment.end_time - assignment.start_time).total_seconds() / 60
+            duration = assignment_terms.duration
+            if duration is not None:
                 room_utilization[room_id] += duration
 
         # Calculate cost based on utilization (more balanced utilization is better)
@@ -588,7 +691,7 @@ class SolutionEvaluator:
         logger.debug(f"Operational cost score: {normalized_cost:.4f}")
         return normalized_cost
 
-    def _calculate_staff_overtime(self, solution, schedule_start_time, schedule_end_time):
+    def _calculate_staff_overtime(self, solution, schedule_start_time, schedule_end_time, terms=None):
         """
         Calculate staff overtime penalty.
 
@@ -596,33 +699,16 @@ class SolutionEvaluator:
             solution: List of SurgeryRoomAssignment objects
             schedule_start_time: Start time of the schedule window
             schedule_end_time: End time of the schedule window
+            terms: Optional assignment terms already resolved for the solution
 
         Returns:
             Overtime penalty score (0-1, lower is better)
         """
-        # Define normal working hours (e.g., 8:00 AM to 5:00 PM)
-        normal_start_hour = 8
-        normal_end_hour = 17
-
         total_overtime_minutes = 0
 
-        for assignment in solution:
-            if not assignment.start_time or not assignment.end_time:
-                continue
-
-            # Check if assignment extends beyond normal hours
-            day_start = assignment.start_time.replace(hour=normal_start_hour, minute=0, second=0, microsecond=0)
-            day_end = assignment.start_time.replace(hour=normal_end_hour, minute=0, second=0, microsecond=0)
-
-            # Calculate overtime before normal hours
-            if assignment.start_time < day_start:
-                early_overtime = (day_start - assignment.start_time).total_seconds() / 60
-                total_overtime_minutes += early_overtime
-
-            # Calculate overtime after normal hours
-            if assignment.end_time > day_end:
-                late_overtime = (assignment.end_time - day_end).total_seconds() / 60
-                total_overtime_minutes += late_overtime
+        for assignment_terms in self._solution_terms(solution, terms):
+            total_overtime_minutes += assignment_terms.early_overtime
+            total_overtime_minutes += assignment_terms.late_overtime
 
         # Normalize overtime penalty (assuming max 8 hours of overtime)
         max_expected_overtime = 8 * 60  # 8 hours in minutes
@@ -5,6 +5,7 @@ This module provides a comprehensive Tabu Search optimizer that works with the f
 and uses components for feasibility checking, neighborhood generation, and solution evaluation.
 """
 
+import heapq
 import logging
 import random
 import copy
@@ -28,7 +29,9 @@ class TabuList:
     """
     Tabu list for the Tabu Search algorithm.
 
-    This class maintains a list of tabu moves and their tenures.
+    This class maintains a list of tabu moves and their tenures. Each move is
+    stored with the iteration at which it expires rather than a countdown, so
+    advancing an iteration only touches the moves that expire in it.
     """
 
     def __init__(self, default_tenure=10, min_tenure=None, max_tenure=None):
@@ -40,10 +43,20 @@ class TabuList:
             min_tenure: Minimum tenure for tabu moves (for randomized tenures)
             max_tenure: Maximum tenure for tabu moves (for randomized tenures)
         """
-        self.tabu_items = {}  # Dictionary of tabu moves and their remaining tenures
+        self.tabu_items = {}  # Dictionary of tabu moves and the iteration at which they expire
         self.default_tenure = default_tenure
         self.min_tenure = min_tenure if min_tenure is not None else max(1, default_tenure // 2)
         self.max_tenure = max_tenure if max_tenure is not None else default_tenure
+        self.iteration = 0
+        self._expiry_heap = []  # (expiry, sequence, move); entries superseded by a later add are skipped
+        self._sequence = 0
+
+    def _set_expiry(self, move, tenure):
+        """Record a move as tabu for the given number of further iterations."""
+        expiry = self.iteration + tenure
+        self.tabu_items[move] = expiry
+        self._sequence += 1
+        heapq.heappush(self._expiry_heap, (expiry, self._sequence, move))
 
     def add(self, move, tenure=None):
         """
@@ -57,7 +70,7 @@ class TabuList:
             # Use randomized tenure if not specified
             tenure = random.randint(self.min_tenure, self.max_tenure)
 
-        self.tabu_items[move] = tenure
+        self._set_expiry(move, tenure)
         logger.debug(f"Added move {move} to tabu list with tenure {tenure}")
 
     def is_tabu(self, move):
@@ -82,25 +95,25 @@ class TabuList:
         Returns:
             Remaining tenure, or 0 if the move is not tabu
         """
-        return self.tabu_items.get(move, 0)
+        expiry = self.tabu_items.get(move)
+        return expiry - self.iteration if expiry is not None else 0
 
     def decrement_tenure(self):
         """Decrement the tenure of all tabu moves and remove expired ones."""
-        expired_moves = []
-
-        for move, tenure in self.tabu_items.items():
-            if tenure <= 1:
-                expired_moves.append(move)
-            else:
-                self.tabu_items[move] = tenure - 1
+        self.iteration += 1
 
-        for move in expired_moves:
-            del self.tabu_items[move]
-            logger.debug(f"Removed expired move {move} from tabu list")
+        # A move added with tenure t is removed by the t-th decrement (at least one)
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= self.iteration:
+            expiry, _, move = heapq.heappop(heap)
+            if self.tabu_items.get(move) == expiry:
+                del self.tabu_items[move]
+                logger.debug(f"Removed expired move {move} from tabu list")
 
     def clear(self):
         """Clear the tabu list."""
         self.tabu_items.clear()
+        self._expiry_heap.clear()
         logger.debug("Cleared tabu list")
 
     def increase_all_tenures(self, factor=1.5, duration=10):
@@ -111,8 +124,8 @@ class TabuList:
             factor: Factor to increase tenures by
             duration: Number of iterations the increase should last
         """
-        for move in self.tabu_items:
-            self.tabu_items[move] = int(self.tabu_items[move] * factor)
+        for move, expiry in list(self.tabu_items.items()):
+            self._set_expiry(move, int((expiry - self.iteration) * factor))
 
         logger.debug(f"Increased all tabu tenures by factor {factor}")
 
@@ -152,7 +165,9 @@ class TabuOptimizer:
         max_iterations=100,
         max_no_improvement=20,
         time_limit_seconds=300,
-        evaluation_weights=None
+        evaluation_weights=None,
+        feasibility_checker=None,
+        solution_evaluator=None
     ):
         """
         Initialize the Tabu Search optimizer.
@@ -167,6 +182,8 @@ class TabuOptimizer:
             max_no_improvement: Maximum number of iterations without improvement
             time_limit_seconds: Time limit in seconds
             evaluation_weights: Dictionary of weights for solution evaluation
+            feasibility_checker: Optional FeasibilityChecker to reuse instead of building one
+            solution_evaluator: Optional SolutionEvaluator to reuse instead of building one
         """
         self.db_session = db_session
         self.surgeries = surgeries if surgeries else []
@@ -177,9 +194,10 @@ class TabuOptimizer:
         if db_session and (not surgeries or not operating_rooms):
             self._load_data_from_db()
 
-        # Initialize components
-        self.feasibility_checker = FeasibilityChecker(db_session)
-        self.solution_evaluator = SolutionEvaluator(db_session, evaluation_weights, sds_times_data)
+        # Initialize components; callers that already hold warm components pass
+        # them in so their database caches are not loaded a second time
+        self.feasibility_checker = feasibility_checker or FeasibilityChecker(db_session)
+        self.solution_evaluator = solution_evaluator or SolutionEvaluator(db_session, evaluation_weights, sds_times_data)
         self.neighborhood_generator = NeighborhoodStrategies(
             db_session,
             self.surgeries,
@@ -249,6 +267,9 @@ class TabuOptimizer:
             best_room = None
             best_start_time = None
 
+            # Group the assignments made so far once for all candidate rooms
+            assignment_index = self.feasibility_checker.group_assignments(solution)
+
             for room in self.operating_rooms:
                 # Determine start time based on room schedule
                 if not room_schedules[room.room_id]:
@@ -282,7 +303,8 @@ class TabuOptimizer:
                     room.room_id,
                     start_time,
                     end_time,
-                    solution
+                    solution,
+                    assignment_index=assignment_index
                 ):
                     # If we don't have a best room yet, or this room allows an earlier start
                     if best_room is None or start_time < best_start_time:
@@ -5,6 +5,7 @@ Comprehensive authentication flow testing
 import requests
 import json
 from urllib.parse import urlencode
+from debug_secret_key import decode_token_locally
 import time
 
 def test_backend_health():
@@ -113,6 +114,13 @@ def test_auth_me_endpoint(token):
         return
     
     print("\n👤 Testing /auth/me endpoint...")
+    # Validate the claims locally first; only hit the server for tokens that parse
+    payload = decode_token_locally(token)
+    if payload is None:
+        print("❌ Token failed local decode (bad signature or expired), skipping /auth/me")
+        return
+    print(f"✅ Token decoded locally for {payload['sub']}")
+
     try:
         response = requests.get('http://localhost:8000/api/auth/me',
                               headers={'Authorization': f'Bearer {token}'})
@@ -12,10 +12,11 @@ This module tests the emergency surgery handling functionality including:
 import pytest
 import logging
 from datetime import datetime, timedelta, date
+from types import SimpleNamespace
 from unittest.mock import Mock, patch, MagicMock
 from sqlalchemy.orm import Session
 
-from emergency_surgery_handler import EmergencySurgeryHandler
+from emergency_surgery_handler import EmergencySurgeryHandler, DayScheduleIndex, _to_epoch_us
 from api.models import (
     EmergencySurgeryRequest,
     EmergencyInsertionResult,
@@ -109,6 +110,19 @@ class TestEmergencySurgeryHandler:
         """Create an emergency surgery handler with mocked dependencies."""
         return EmergencySurgeryHandler(mock_db_session)
     
+    @pytest.fixture
+    def cache_handler(self, mock_db_session):
+        """Create a handler whose construction does not need EmergencyPriority.SCHEDULED.
+
+        api.models defines EmergencyPriority twice and the definition that wins
+        has no SCHEDULED member, so the ``handler`` fixture cannot build one.
+        """
+        priorities = {priority.name: priority for priority in EmergencyPriority}
+        priorities.setdefault('SCHEDULED', priorities.get('NON_URGENT'))
+        priorities = SimpleNamespace(**priorities)
+        with patch('emergency_surgery_handler.EmergencyPriority', priorities):
+            return EmergencySurgeryHandler(mock_db_session)
+    
     def test_handler_initialization(self, mock_db_session):
         """Test emergency surgery handler initialization."""
         handler = EmergencySurgeryHandler(mock_db_session)
@@ -211,14 +225,18 @@ class TestEmergencySurgeryHandler:
         created_surgery.patient_id = emergency_request.patient_id
         created_surgery.surgeon_id = emergency_request.required_surgeon_id
         
-        handler.db_session.refresh.side_effect = lambda obj: setattr(obj, 'surgery_id', 123)
+        handler.db_session.flush.side_effect = lambda: setattr(
+            handler.db_session.add.call_args[0][0], 'surgery_id', 123
+        )
         
         result = handler._create_emergency_surgery(emergency_request)
         
         # Verify surgery creation
         handler.db_session.add.assert_called_once()
-        handler.db_session.commit.assert_called_once()
-        handler.db_session.refresh.assert_called_once()
+        handler.db_session.flush.assert_called_once()
+        handler.db_session.commit.assert_not_called()
+        handler.db_session.refresh.assert_not_called()
+        assert result.surgery_id == 123
         
         # Verify surgery properties
         added_surgery = handler.db_session.add.call_args[0][0]
@@ -233,11 +251,11 @@ class TestEmergencySurgeryHandler:
         """Test insertion strategies for immediate priority."""
         strategies = handler._get_insertion_strategies(EmergencyPriority.IMMEDIATE)
         
-        expected = [
+        expected = (
             ConflictResolutionStrategy.BUMP_LOWER_PRIORITY,
             ConflictResolutionStrategy.USE_BACKUP_ROOM,
             ConflictResolutionStrategy.EXTEND_HOURS
-        ]
+        )
         
         assert strategies == expected
     
@@ -245,11 +263,11 @@ class TestEmergencySurgeryHandler:
         """Test insertion strategies for urgent priority."""
         strategies = handler._get_insertion_strategies(EmergencyPriority.URGENT)
         
-        expected = [
+        expected = (
             ConflictResolutionStrategy.USE_BACKUP_ROOM,
             ConflictResolutionStrategy.BUMP_LOWER_PRIORITY,
             ConflictResolutionStrategy.EXTEND_HOURS
-        ]
+        )
         
         assert strategies == expected
     
@@ -257,11 +275,11 @@ class TestEmergencySurgeryHandler:
         """Test insertion strategies for semi-urgent priority."""
         strategies = handler._get_insertion_strategies(EmergencyPriority.SEMI_URGENT)
         
-        expected = [
+        expected = (
             ConflictResolutionStrategy.USE_BACKUP_ROOM,
             ConflictResolutionStrategy.EXTEND_HOURS,
             ConflictResolutionStrategy.BUMP_LOWER_PRIORITY
-        ]
+        )
         
         assert strategies == expected
     
@@ -269,11 +287,11 @@ class TestEmergencySurgeryHandler:
         """Test insertion strategies for scheduled priority."""
         strategies = handler._get_insertion_strategies(EmergencyPriority.SCHEDULED)
         
-        expected = [
+        expected = (
             ConflictResolutionStrategy.USE_BACKUP_ROOM,
             ConflictResolutionStrategy.EXTEND_HOURS,
             ConflictResolutionStrategy.MANUAL_REVIEW
-        ]
+        )
         
         assert strategies == expected
     
@@ -327,26 +345,36 @@ class TestEmergencySurgeryHandler:
         score = handler._calculate_disruption_score(insertion_result)
         assert score > 0.5
     
-    def test_get_emergency_metrics(self, handler):
+    def test_get_emergency_metrics(self, cache_handler):
         """Test emergency metrics calculation."""
+        handler = cache_handler
         start_date = datetime(2024, 1, 1)
         end_date = datetime(2024, 1, 31)
         
-        # Mock emergency surgeries
-        emergency_surgeries = [
-            Mock(surgery_id=1, urgency_level="Emergency"),
-            Mock(surgery_id=2, urgency_level="Emergency"),
-            Mock(surgery_id=3, urgency_level="Emergency")
+        # Mock grouped emergency counts: (type, room, surgeon, count)
+        grouped_rows = [
+            ("Trauma", "OR-1", "Dr. Smith", 2),
+            ("Trauma", "OR-2", "Dr. Jones", 1),
+            ("Cardiac", "OR-2", "Dr. Smith", 1),
+            (None, None, None, 1)
         ]
         
-        handler.db_session.query.return_value.filter.return_value.filter.return_value.filter.return_value.all.return_value = emergency_surgeries
+        query = handler.db_session.query.return_value
+        for method in ('select_from', 'outerjoin', 'filter', 'group_by'):
+            getattr(query, method).return_value = query
+        query.all.return_value = grouped_rows
         
         metrics = handler.get_emergency_metrics(start_date, end_date)
         
         assert isinstance(metrics, EmergencyMetrics)
         assert metrics.date_range_start == start_date.date()
         assert metrics.date_range_end == end_date.date()
-        assert metrics.total_emergencies == 3
+        assert metrics.total_emergencies == 5
+        assert metrics.emergencies_by_type == {"Trauma": 3, "Cardiac": 1, "Unknown": 1}
+        assert metrics.emergencies_by_priority == {"Emergency": 5}
+        assert metrics.rooms_used_for_emergencies == {"OR-1": 2, "OR-2": 2}
+        assert metrics.surgeons_involved == {"Dr. Smith": 3, "Dr. Jones": 1}
+        assert handler.db_session.query.call_count == 1
         assert metrics.average_wait_time_minutes > 0
         assert metrics.successful_insertions_rate > 0
         assert 0 <= metrics.average_disruption_score <= 1
@@ -387,13 +415,45 @@ class TestEmergencySurgeryHandler:
         assert any('surgeon_1' in notif for notif in notifications)
         assert any('room_1' in notif for notif in notifications)
     
+    def test_find_optimal_insertion_is_memoized(self, cache_handler, emergency_request):
+        """Test that repeated what-if searches reuse the cached insertion result."""
+        search_result = {'success': False, 'reason': 'No viable insertion strategy found'}
+        
+        with patch.object(cache_handler, '_search_optimal_insertion', return_value=search_result) as search:
+            first = cache_handler._find_optimal_insertion(Mock(), emergency_request)
+            second = cache_handler._find_optimal_insertion(Mock(), emergency_request)
+            
+            assert first == second == search_result
+            assert search.call_count == 1
+            
+            # Any schedule write invalidates the cache
+            cache_handler.db_session.query.return_value.filter.return_value.update.return_value = 1
+            cache_handler._reschedule_bumped_surgeries([42], emergency_request)
+            cache_handler._find_optimal_insertion(Mock(), emergency_request)
+            assert search.call_count == 2
+    
+    def test_available_resources_are_cached_until_write(self, cache_handler, emergency_request):
+        """Test that room and surgeon lists are reused until the schedule changes."""
+        emergency_request.required_surgeon_id = None
+        
+        rooms = cache_handler._get_available_rooms(emergency_request)
+        surgeons = cache_handler._get_available_surgeons(emergency_request)
+        assert cache_handler._get_available_rooms(emergency_request) is rooms
+        assert cache_handler._get_available_surgeons(emergency_request) is surgeons
+        assert cache_handler.db_session.query.call_count == 2
+        
+        cache_handler._invalidate_caches()
+        cache_handler._get_available_rooms(emergency_request)
+        cache_handler._get_available_surgeons(emergency_request)
+        assert cache_handler.db_session.query.call_count == 4
+    
     def test_is_slot_available_no_conflicts(self, handler):
         """Test slot availability with no conflicts."""
         room_id = 1
         surgeon_id = 1
         start_time = datetime(2024, 1, 1, 9, 0)
         end_time = datetime(2024, 1, 1, 10, 30)
-        current_schedule = []
+        current_schedule = DayScheduleIndex([])
         
         available = handler._is_slot_available(
             room_id, surgeon_id, start_time, end_time, current_schedule
@@ -411,10 +471,11 @@ class TestEmergencySurgeryHandler:
         # Create conflicting assignment
         conflicting_assignment = Mock()
         conflicting_assignment.room_id = 1
+        conflicting_assignment.surgeon_id = 2
         conflicting_assignment.start_time = datetime(2024, 1, 1, 9, 30)
         conflicting_assignment.end_time = datetime(2024, 1, 1, 11, 0)
         
-        current_schedule = [conflicting_assignment]
+        current_schedule = DayScheduleIndex([conflicting_assignment])
         
         available = handler._is_slot_available(
             room_id, surgeon_id, start_time, end_time, current_schedule
@@ -433,22 +494,51 @@ class TestEmergencySurgeryHandler:
         conflicting_assignment = Mock()
         conflicting_assignment.room_id = 2
         conflicting_assignment.surgery_id = 100
+        conflicting_assignment.surgeon_id = 1
         conflicting_assignment.start_time = datetime(2024, 1, 1, 9, 30)
         conflicting_assignment.end_time = datetime(2024, 1, 1, 11, 0)
         
-        # Mock surgery with same surgeon
-        conflicting_surgery = Mock()
-        conflicting_surgery.surgeon_id = 1
-        
-        handler.db_session.query.return_value.filter.return_value.first.return_value = conflicting_surgery
-        
-        current_schedule = [conflicting_assignment]
+        current_schedule = DayScheduleIndex([conflicting_assignment])
         
         available = handler._is_slot_available(
             room_id, surgeon_id, start_time, end_time, current_schedule
         )
         
         assert available is False
+    
+    def test_first_free_pair_skips_busy_room_and_surgeon(self):
+        """Test that the first free room and first free surgeon are paired."""
+        busy = Mock()
+        busy.room_id = 1
+        busy.surgeon_id = 1
+        busy.start_time = datetime(2024, 1, 1, 9, 0)
+        busy.end_time = datetime(2024, 1, 1, 11, 0)
+        
+        schedule_index = DayScheduleIndex([busy])
+        start_us = _to_epoch_us(datetime(2024, 1, 1, 10, 0))
+        end_us = _to_epoch_us(datetime(2024, 1, 1, 10, 30))
+        
+        assert schedule_index.first_free_pair([1, 2], [1, 3], start_us, end_us) == (2, 3)
+        assert schedule_index.first_free_pair([1], [2], start_us, end_us) is None
+        assert schedule_index.first_free_pair([2], [1], start_us, end_us) is None
+
+    def test_first_free_pair_after_latest_end(self):
+        """Test that windows after the day's last surgery pair the first resources."""
+        busy = Mock()
+        busy.room_id = 1
+        busy.surgeon_id = 1
+        busy.start_time = datetime(2024, 1, 1, 9, 0)
+        busy.end_time = datetime(2024, 1, 1, 11, 0)
+        
+        schedule_index = DayScheduleIndex([busy])
+        start_us = _to_epoch_us(datetime(2024, 1, 1, 11, 0))
+        end_us = _to_epoch_us(datetime(2024, 1, 1, 12, 0))
+        
+        assert schedule_index.first_free_pair([1, 2], [1, 3], start_us, end_us) == (1, 1)
+        assert schedule_index.first_free_pair([], [1], start_us, end_us) is None
+        assert DayScheduleIndex([]).first_free_pair([4], [5], start_us, end_us) == (4, 5)
+        assert schedule_index.is_free(1, 1, start_us, end_us) is True
+        assert schedule_index.is_free(1, 1, start_us - 1, end_us) is False
 
 
 if __name__ == "__main__":
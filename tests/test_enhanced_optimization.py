@@ -12,6 +12,7 @@ This module tests the advanced optimization capabilities including:
 import pytest
 import asyncio
 import json
+import time
 from datetime import datetime, date, timedelta
 from unittest.mock import Mock, patch, AsyncMock
 from fastapi.testclient import TestClient
@@ -26,8 +27,8 @@ from api.models import (
     OptimizationProgress,
     OptimizationResult
 )
-from models import Surgery, OperatingRoom, Surgeon, Patient, SurgeryType
-from enhanced_tabu_optimizer import EnhancedTabuOptimizer
+from models import Surgery, OperatingRoom, Surgeon, Patient, SurgeryType, SurgeryRoomAssignment
+from enhanced_tabu_optimizer import EnhancedTabuOptimizer, AssignmentSnapshot, ConvergenceTrace
 from optimization_cache import OptimizationCacheManager, CacheConfig
 from db_config import get_db
 
@@ -213,6 +214,250 @@ class TestEnhancedTabuOptimizer:
         assert optimizer.min_tenure == 3
         assert optimizer.max_tenure == 15
 
+    def test_assignment_snapshot(self):
+        """Test that best-solution snapshots keep the evaluated fields only."""
+        start = datetime(2024, 1, 1, 8, 0)
+        assignment = SurgeryRoomAssignment(
+            surgery_id=1, room_id=2, start_time=start, end_time=start + timedelta(hours=1)
+        )
+
+        snapshot, = AssignmentSnapshot.take([assignment])
+        assignment.room_id = 3
+
+        assert snapshot == AssignmentSnapshot(1, 2, start, start + timedelta(hours=1))
+        assert not hasattr(snapshot, '_sa_instance_state')
+
+    def test_convergence_trace_records(self):
+        """Test that the columnar convergence trace expands to per-iteration dicts."""
+        trace = ConvergenceTrace()
+        trace.append(0, 0.5, 0.5, 0)
+        trace.append(1, 0.375, 0.5, 0.25)
+
+        assert len(trace) == 2
+        assert trace.to_records() == [
+            {'iteration': 0, 'current_score': 0.5, 'best_score': 0.5, 'timestamp': 0.0},
+            {'iteration': 1, 'current_score': 0.375, 'best_score': 0.5, 'timestamp': 0.25}
+        ]
+
+    def test_hash_solution_structure(self, sample_surgeries, sample_operating_rooms):
+        """Test that the structure hash ignores surgery order and unassigned surgeries."""
+        optimizer = EnhancedTabuOptimizer(
+            db_session=Mock(),
+            surgeries=sample_surgeries,
+            operating_rooms=sample_operating_rooms,
+            parameters=AdvancedOptimizationParameters(algorithm=OptimizationAlgorithm.REACTIVE_TABU)
+        )
+        optimizer.surgeries = [
+            Mock(surgery_id=1, room_id=2),
+            Mock(surgery_id=2, room_id=None),
+            Mock(surgery_id=3, room_id=1)
+        ]
+        forward = optimizer._hash_solution_structure()
+
+        optimizer.surgeries.reverse()
+        assert optimizer._hash_solution_structure() == forward
+
+        optimizer.surgeries[0].room_id = 2
+        assert optimizer._hash_solution_structure() != forward
+
+    @patch('enhanced_tabu_optimizer.TabuOptimizer')
+    def test_initial_solution_reuses_loaded_components(self, mock_tabu_optimizer, sample_surgeries,
+                                                       sample_operating_rooms):
+        """Test that the base optimizer gets this optimizer's checker and evaluator."""
+        optimizer = EnhancedTabuOptimizer(
+            db_session=Mock(),
+            surgeries=sample_surgeries,
+            operating_rooms=sample_operating_rooms,
+            parameters=AdvancedOptimizationParameters()
+        )
+
+        optimizer._generate_initial_solution()
+
+        kwargs = mock_tabu_optimizer.call_args.kwargs
+        assert kwargs['feasibility_checker'] is optimizer.feasibility_checker
+        assert kwargs['solution_evaluator'] is optimizer.solution_evaluator
+        mock_tabu_optimizer.return_value.initialize_solution.assert_called_once()
+
+    def test_reactive_strategy_reuses_structure_hash(self, sample_surgeries, sample_operating_rooms):
+        """Test that the structure hash is only recomputed on the refresh interval."""
+        optimizer = EnhancedTabuOptimizer(
+            db_session=Mock(),
+            surgeries=sample_surgeries,
+            operating_rooms=sample_operating_rooms,
+            parameters=AdvancedOptimizationParameters(algorithm=OptimizationAlgorithm.REACTIVE_TABU)
+        )
+        optimizer._hash_solution_structure = Mock(side_effect=[11, 22])
+
+        for iteration in range(3):
+            optimizer._apply_reactive_strategy(iteration)
+        optimizer._apply_reactive_strategy(optimizer.STRUCTURE_HASH_REFRESH_INTERVAL)
+
+        assert list(optimizer.tenure_history) == [11, 11, 11, 22]
+
+        for iteration in range(1, 30):
+            optimizer._apply_reactive_strategy(iteration)
+        assert len(optimizer.tenure_history) == optimizer.TENURE_HISTORY_SIZE
+
+    def test_revisited_neighbors_use_eval_cache(self, sample_surgeries, sample_operating_rooms):
+        """Test that a neighbor scored on an earlier iteration is not re-evaluated."""
+        optimizer = EnhancedTabuOptimizer(
+            db_session=Mock(),
+            surgeries=sample_surgeries,
+            operating_rooms=sample_operating_rooms,
+            parameters=AdvancedOptimizationParameters()
+        )
+        start = datetime(2024, 1, 1, 8, 0)
+        first = {'assignments': [SurgeryRoomAssignment(
+            surgery_id=1, room_id=1, start_time=start, end_time=start + timedelta(hours=1)
+        )], 'move': ('room', 1, 1)}
+        second = {'assignments': [SurgeryRoomAssignment(
+            surgery_id=1, room_id=2, start_time=start, end_time=start + timedelta(hours=1)
+        )], 'move': ('room', 1, 2)}
+        optimizer.solution_evaluator.evaluate_solutions = Mock(side_effect=[[1.0], [2.0]])
+
+        assert optimizer._score_neighbors([first]) == [1.0]
+        assert optimizer._score_neighbors([first, second]) == [1.0, 2.0]
+        optimizer.solution_evaluator.evaluate_solutions.assert_called_with(
+            [second['assignments']]
+        )
+
+    def test_select_best_neighbor_respects_tabu_and_aspiration(self, sample_surgeries,
+                                                               sample_operating_rooms):
+        """Test that tabu neighbors are skipped unless they beat the best score."""
+        optimizer = EnhancedTabuOptimizer(
+            db_session=Mock(),
+            surgeries=sample_surgeries,
+            operating_rooms=sample_operating_rooms,
+            parameters=AdvancedOptimizationParameters()
+        )
+        neighbors = [{'assignments': [name], 'move': name} for name in ('a', 'b', 'c')]
+        optimizer._score_neighbors = Mock(return_value=[0.5, 0.9, 0.7])
+        tabu_list = Mock(is_tabu=lambda move: move == 'b')
+
+        optimizer.best_score = 0.95
+        assert optimizer._select_best_neighbor(neighbors, tabu_list) == (['c'], 0.7, 'c')
+
+        optimizer.best_score = 0.8
+        assert optimizer._select_best_neighbor(neighbors, tabu_list) == (['b'], 0.9, 'b')
+
+    def test_only_top_k_neighbors_are_evaluated_exactly(self, sample_surgeries,
+                                                        sample_operating_rooms):
+        """Test two-tier scoring: approximate ranking, then exact scores for the top K."""
+        optimizer = EnhancedTabuOptimizer(
+            db_session=Mock(),
+            surgeries=sample_surgeries,
+            operating_rooms=sample_operating_rooms,
+            parameters=AdvancedOptimizationParameters(exact_evaluation_top_k=2)
+        )
+        start = datetime(2024, 1, 1, 8, 0)
+        neighbors = [
+            {'assignments': [SurgeryRoomAssignment(
+                surgery_id=1, room_id=room_id, start_time=start, end_time=start + timedelta(hours=1)
+            )], 'move': ('room', 1, room_id)}
+            for room_id in (1, 2, 3)
+        ]
+        optimizer.solution_evaluator.approximate_scores = Mock(return_value=[0.3, 0.1, 0.2])
+        optimizer.solution_evaluator.evaluate_solutions = Mock(return_value=[0.35, 0.25])
+
+        assert optimizer._score_neighbors(neighbors) == [0.35, float('-inf'), 0.25]
+        optimizer.solution_evaluator.evaluate_solutions.assert_called_once_with(
+            [neighbors[0]['assignments'], neighbors[2]['assignments']]
+        )
+
+    def test_top_k_skips_tabu_neighbors(self, sample_surgeries, sample_operating_rooms):
+        """Test that a top K made up of tabu moves still leaves an admissible neighbor."""
+        optimizer = EnhancedTabuOptimizer(
+            db_session=Mock(),
+            surgeries=sample_surgeries,
+            operating_rooms=sample_operating_rooms,
+            parameters=AdvancedOptimizationParameters(exact_evaluation_top_k=2)
+        )
+        start = datetime(2024, 1, 1, 8, 0)
+        neighbors = [
+            {'assignments': [SurgeryRoomAssignment(
+                surgery_id=1, room_id=room_id, start_time=start, end_time=start + timedelta(hours=1)
+            )], 'move': ('room', 1, room_id)}
+            for room_id in (1, 2, 3, 4)
+        ]
+        # The two best approximate scores both belong to tabu moves
+        optimizer.solution_evaluator.approximate_scores = Mock(return_value=[0.4, 0.3, 0.2, 0.1])
+        optimizer.solution_evaluator.evaluate_solutions = Mock(return_value=[0.25, 0.15])
+        tabu_list = Mock(is_tabu=lambda move: move[2] in (1, 2))
+        optimizer.best_score = 0.9
+
+        assert optimizer._select_best_neighbor(neighbors, tabu_list) == (
+            neighbors[2]['assignments'], 0.25, ('room', 1, 3)
+        )
+        optimizer.solution_evaluator.evaluate_solutions.assert_called_once_with(
+            [neighbors[2]['assignments'], neighbors[3]['assignments']]
+        )
+
+    def test_sample_neighbors_keeps_ratio_with_floor(self, sample_surgeries, sample_operating_rooms):
+        """Test reduced neighborhood sampling size and its minimum."""
+        optimizer = EnhancedTabuOptimizer(
+            db_session=Mock(),
+            surgeries=sample_surgeries,
+            operating_rooms=sample_operating_rooms,
+            parameters=AdvancedOptimizationParameters(neighborhood_sample_ratio=0.25)
+        )
+        neighbors = [{'assignments': [], 'move': i} for i in range(100)]
+
+        sampled = optimizer._sample_neighbors(neighbors, 0.25)
+        assert len(sampled) == 25
+        assert len({n['move'] for n in sampled}) == 25
+
+        few = neighbors[:10]
+        assert len(optimizer._sample_neighbors(few, 0.25)) == optimizer.MIN_SAMPLED_NEIGHBORS
+        assert len(optimizer._sample_neighbors(few[:5], 0.25)) == 5
+
+    def test_multi_start_climbers_share_best_solution(self, sample_surgeries, sample_operating_rooms):
+        """Test that each climber starts from the best solution of the previous ones."""
+        optimizer = EnhancedTabuOptimizer(
+            db_session=Mock(),
+            surgeries=sample_surgeries,
+            operating_rooms=sample_operating_rooms,
+            parameters=AdvancedOptimizationParameters(num_climbers=3)
+        )
+        first_best, second_best = Mock(), Mock()
+
+        def run_climber(best_solution):
+            optimizer.current_iteration = 10
+            return first_best if best_solution is None else second_best
+
+        optimizer._run_climber = Mock(side_effect=run_climber)
+        optimizer._create_optimization_result = Mock()
+        optimizer.optimize()
+
+        assert [c.args[0] for c in optimizer._run_climber.call_args_list] == [None, first_best, second_best]
+        optimizer._create_optimization_result.assert_called_once()
+        assert optimizer._create_optimization_result.call_args.args[0] is second_best
+        assert optimizer.total_iterations == 30
+
+    @patch('enhanced_tabu_optimizer.time.monotonic')
+    def test_progress_updates_are_throttled(self, mock_monotonic, sample_surgeries,
+                                            sample_operating_rooms):
+        """Test that progress callbacks are emitted at most once per throttle interval."""
+        callback = Mock()
+        optimizer = EnhancedTabuOptimizer(
+            db_session=Mock(),
+            surgeries=sample_surgeries,
+            operating_rooms=sample_operating_rooms,
+            parameters=AdvancedOptimizationParameters(progress_update_interval=1),
+            progress_callback=callback
+        )
+        optimizer.start_time = time.time()
+        optimizer.started_at = datetime.now()
+
+        for iteration, tick in enumerate([10.0, 10.05, 10.2], start=1):
+            mock_monotonic.return_value = tick
+            optimizer.current_iteration = iteration
+            optimizer._update_progress()
+
+        assert callback.callback.call_count == 2
+        progress = callback.callback.call_args[0][0]
+        assert progress.current_iteration == 3
+        assert progress.last_update >= optimizer.started_at
+
     @patch('enhanced_tabu_optimizer.TabuOptimizer.initialize_solution')
     @patch('enhanced_tabu_optimizer.SolutionEvaluator.evaluate_solution')
     def test_optimization_process(self, mock_evaluate, mock_initialize,
@@ -341,5 +341,73 @@ class TestSolutionEvaluator(unittest.TestCase):
         # The better solution should have a higher score
         self.assertTrue(score > poor_score)
 
+    def test_neighbor_evaluation_reuses_assignment_terms(self):
+        """Test that only the moved assignment is recomputed for a neighbor."""
+        score = self.evaluator.evaluate_solution(self.solution)
+        self.assertEqual(len(self.evaluator.assignment_terms_cache), len(self.solution))
+
+        # Move one surgery an hour later, as a shift neighbor would
+        moved = SurgeryRoomAssignment(
+            surgery_id=self.solution[0].surgery_id,
+            room_id=self.solution[0].room_id,
+            start_time=self.solution[0].start_time + timedelta(hours=1),
+            end_time=self.solution[0].end_time + timedelta(hours=1)
+        )
+        neighbor = [moved] + self.solution[1:]
+
+        self.evaluator.evaluate_solution(neighbor)
+        self.assertEqual(len(self.evaluator.assignment_terms_cache), len(self.solution) + 1)
+
+        # Cached terms give the same score as a fresh evaluator
+        fresh = SolutionEvaluator(db_session=self.db_session, sds_times_data=self.sds_times_data)
+        self.assertEqual(self.evaluator.evaluate_solution(neighbor), fresh.evaluate_solution(neighbor))
+        self.assertEqual(self.evaluator.evaluate_solution(self.solution), score)
+
+    def test_assignment_terms_cache_is_bounded(self):
+        """Test that the assignment terms cache evicts its least recently used entry."""
+        self.evaluator.ASSIGNMENT_TERMS_CACHE_SIZE = 2
+        first, second = self.solution[0], self.solution[1]
+        self.evaluator.evaluate_solution([first, second])
+
+        # Touch the first assignment, so the second becomes the oldest entry
+        self.evaluator.evaluate_solution([first])
+        moved = SurgeryRoomAssignment(
+            surgery_id=first.surgery_id,
+            room_id=first.room_id,
+            start_time=first.start_time + timedelta(hours=1),
+            end_time=first.end_time + timedelta(hours=1)
+        )
+        self.evaluator.evaluate_solution([moved])
+
+        cache = self.evaluator.assignment_terms_cache
+        self.assertEqual(len(cache), 2)
+        keys = {(a.surgery_id, a.room_id, a.start_time, a.end_time) for a in (first, moved)}
+        self.assertEqual(set(cache), keys)
+
+    def test_evaluate_solutions_matches_single_evaluation(self):
+        """Test that batch scoring gives the same scores as one-by-one evaluation."""
+        reversed_rooms = [
+            SurgeryRoomAssignment(
+                surgery_id=a.surgery_id,
+                room_id=self.solution[-1 - i].room_id,
+                start_time=a.start_time,
+                end_time=a.end_time
+            )
+            for i, a in enumerate(self.solution)
+        ]
+        solutions = [self.solution, reversed_rooms, []]
+
+        self.assertEqual(
+            self.evaluator.evaluate_solutions(solutions),
+            [self.evaluator.evaluate_solution(solution) for solution in solutions]
+        )
+
+    def test_approximate_scores_omit_setup_time(self):
+        """Test that the approximate score is the exact score without the setup-time term."""
+        approximate, = self.evaluator.approximate_scores([self.solution])
+        sds_term = self.evaluator.weights["sds_time_penalty"] * self.evaluator._calculate_sds_time(self.solution)
+
+        self.assertAlmostEqual(approximate + sds_term, self.evaluator.evaluate_solution(self.solution))
+
 if __name__ == "__main__":
     unittest.main()
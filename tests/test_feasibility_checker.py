@@ -0,0 +1,229 @@
+"""
+Tests for the feasibility checker.
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+
+import pytest
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from feasibility_checker import FeasibilityChecker
+from models import SurgeryRoomAssignment
+
+
+@pytest.fixture
+def checker():
+    """Create a feasibility checker with cached data and no equipment usage."""
+    db_session = Mock()
+    db_session.query.return_value.all.return_value = []
+    db_session.query.return_value.filter_by.return_value.all.return_value = []
+    db_session.query.return_value.filter.return_value.all.return_value = []
+    checker = FeasibilityChecker(db_session)
+    checker.surgeries_cache = {1: Mock(surgery_id=1, surgeon_id=None, surgery_type_id=None)}
+    checker.rooms_cache = {
+        1: Mock(room_id=1, operational_start_time=None),
+        2: Mock(room_id=2, operational_start_time=None)
+    }
+    return checker
+
+
+def equipment_named(name):
+    """Create a surgery equipment double; Mock reserves the name keyword."""
+    equipment = Mock()
+    equipment.name = name
+    return equipment
+
+
+def test_repeated_move_reuses_room_and_equipment_verdict(checker):
+    """Test that re-proposing a move skips the room suitability and equipment checks."""
+    start = datetime(2024, 1, 1, 9, 0)
+    end = start + timedelta(hours=1)
+    checker._is_room_suitable_impl = Mock(wraps=checker._is_room_suitable_impl)
+    checker._check_equipment = Mock(wraps=checker._check_equipment)
+
+    assert checker.is_feasible(1, 1, start, end, [])
+    assert checker.is_feasible(1, 1, start, end, [])
+    assert checker._is_room_suitable_impl.call_count == 1
+    assert checker._check_equipment.call_count == 1
+
+
+def test_unsuitable_room_is_rejected_before_conflict_scans(checker):
+    """Test that the memoized suitability check runs before the room and surgeon scans."""
+    start = datetime(2024, 1, 1, 9, 0)
+    checker.is_room_suitable_for_surgery = Mock(return_value=False)
+    checker.is_room_available = Mock(wraps=checker.is_room_available)
+
+    assert not checker.is_feasible(1, 1, start, start + timedelta(hours=1), [])
+    checker.is_room_available.assert_not_called()
+
+
+def test_cached_verdict_still_checks_other_assignments(checker):
+    """Test that room conflicts are checked even when the verdict is cached."""
+    start = datetime(2024, 1, 1, 9, 0)
+    end = start + timedelta(hours=1)
+    other = SurgeryRoomAssignment(surgery_id=2, room_id=1, start_time=start, end_time=end)
+
+    assert checker.is_feasible(1, 1, start, end, [])
+    assert not checker.is_feasible(1, 1, start, end, [other])
+    assert checker.is_feasible(1, 2, start, end, [other])
+
+
+def test_surgeon_without_availability_rows_is_queried_once(checker):
+    """Test that an empty availability lookup is cached instead of re-queried."""
+    start = datetime(2024, 1, 1, 9, 0)
+    end = start + timedelta(hours=1)
+    checker.surgeons_cache = {5: Mock(surgeon_id=5, availability=True)}
+    checker.db_session.query.reset_mock()
+
+    assert checker.is_surgeon_available(5, start, end, [])
+    assert checker.is_surgeon_available(5, start, end, [])
+    assert checker.db_session.query.call_count == 1
+
+
+def test_solution_with_double_booked_room_or_surgeon_is_infeasible(checker):
+    """Test the solution-wide overlap sweep for rooms and surgeons."""
+    start = datetime(2024, 1, 1, 9, 0)
+    checker.surgeries_cache = {
+        1: Mock(surgery_id=1, surgeon_id=None, surgery_type_id=None),
+        2: Mock(surgery_id=2, surgeon_id=None, surgery_type_id=None),
+        3: Mock(surgery_id=3, surgeon_id=7, surgery_type_id=None),
+        4: Mock(surgery_id=4, surgeon_id=7, surgery_type_id=None)
+    }
+    checker.surgeons_cache = {7: Mock(surgeon_id=7, availability=True)}
+
+    def assignment(surgery_id, room_id, offset_minutes, minutes=60):
+        begin = start + timedelta(minutes=offset_minutes)
+        return SurgeryRoomAssignment(
+            surgery_id=surgery_id, room_id=room_id, start_time=begin, end_time=begin + timedelta(minutes=minutes)
+        )
+
+    # Back-to-back in one room is fine, overlapping is not
+    assert checker.check_solution_feasibility([assignment(1, 1, 0), assignment(2, 1, 60)])
+    assert not checker.check_solution_feasibility([assignment(1, 1, 0), assignment(2, 1, 30)])
+
+    # The same surgeon cannot operate in two rooms at once
+    assert checker.check_solution_feasibility([assignment(3, 1, 0), assignment(4, 2, 60)])
+    assert not checker.check_solution_feasibility([assignment(3, 1, 0), assignment(4, 2, 45)])
+
+
+def test_equipment_usages_are_prefetched_per_solution(checker):
+    """Test that a solution's equipment usages are loaded with one IN query."""
+    start = datetime(2024, 1, 1, 9, 0)
+    checker.surgeries_cache[2] = Mock(surgery_id=2, surgeon_id=None, surgery_type_id=None)
+    solution = [
+        SurgeryRoomAssignment(surgery_id=1, room_id=1, start_time=start, end_time=start + timedelta(hours=1)),
+        SurgeryRoomAssignment(surgery_id=2, room_id=2, start_time=start, end_time=start + timedelta(hours=1))
+    ]
+    checker.db_session.query.reset_mock()
+
+    assert checker.check_solution_feasibility(solution)
+    assert checker.equipment_usages_cache == {1: [], 2: []}
+    assert checker.db_session.query.call_count == 1
+
+
+def test_equipment_availability_uses_in_memory_usage_index(checker):
+    """Test that equipment conflicts are answered from the usage index without SQL."""
+    start = datetime(2024, 1, 1, 9, 0)
+    checker.equipment_cache = {7: Mock(equipment_id=7, availability=True)}
+    checker.equipment_usage_index = checker._build_equipment_usage_index([
+        Mock(surgery_id=1, equipment_id=7, usage_start_time=start, usage_end_time=start + timedelta(hours=3)),
+        Mock(surgery_id=2, equipment_id=7, usage_start_time=start + timedelta(hours=4),
+             usage_end_time=start + timedelta(hours=5))
+    ])
+    checker.db_session.query.reset_mock()
+
+    # Overlaps the long first usage even though it starts well after it
+    assert not checker.is_equipment_available(7, start + timedelta(hours=2), start + timedelta(hours=4), [])
+    assert checker.is_equipment_available(7, start + timedelta(hours=2), start + timedelta(hours=4), [], 1)
+    assert checker.is_equipment_available(7, start + timedelta(hours=3), start + timedelta(hours=4), [])
+    assert checker.is_equipment_available(7, start + timedelta(hours=5), start + timedelta(hours=6), [])
+    assert checker.is_equipment_available(7, start - timedelta(hours=1), start, [])
+    checker.db_session.query.assert_not_called()
+
+
+def test_surgeon_availability_windows_are_parsed_once(checker, monkeypatch):
+    """Test that availability rows are parsed once and reused across checks."""
+    monday = datetime(2024, 1, 1, 9, 0)
+    checker.surgeons_cache = {5: Mock(surgeon_id=5, availability=True)}
+    checker.surgeon_availability_cache = {
+        5: [Mock(day_of_week='Monday', start_time='08:00', end_time='12:00')]
+    }
+    parse = Mock(wraps=FeasibilityChecker._parse_availability_windows)
+    monkeypatch.setattr(checker, '_parse_availability_windows', parse)
+
+    assert checker.is_surgeon_available(5, monday, monday + timedelta(hours=2), [])
+    assert not checker.is_surgeon_available(5, monday, monday + timedelta(hours=4), [])
+    assert not checker.is_surgeon_available(5, monday + timedelta(days=1), monday + timedelta(days=1, hours=1), [])
+    assert parse.call_count == 1
+
+
+def test_room_suitability_matches_required_equipment_names(checker):
+    """Test that required equipment is matched against the room's equipment names."""
+    checker.surgeries_cache[3] = Mock(surgery_id=3, surgeon_id=None, surgery_type_id=4)
+    checker.surgery_types_cache = {
+        4: Mock(type_id=4, required_equipment={equipment_named('Laser'), equipment_named('Monitor')})
+    }
+    checker.room_equipment_cache = {
+        1: [Mock(room_id=1, equipment_name='Laser'), Mock(room_id=1, equipment_name='Monitor')],
+        2: [Mock(room_id=2, equipment_name='Monitor')]
+    }
+
+    assert checker.is_room_suitable_for_surgery(1, 3)
+    assert not checker.is_room_suitable_for_surgery(2, 3)
+    assert checker.required_equipment_cache == {4: {'Laser', 'Monitor'}}
+    assert checker.room_equipment_names_cache == {1: {'Laser', 'Monitor'}, 2: {'Monitor'}}
+
+
+def test_room_suitability_is_memoized_until_invalidated(checker):
+    """Test that suitability is computed once per (room, surgery) pair until invalidated."""
+    checker.surgeries_cache[3] = Mock(surgery_id=3, surgeon_id=None, surgery_type_id=4)
+    checker.surgery_types_cache = {4: Mock(type_id=4, required_equipment={equipment_named('Laser')})}
+    checker.room_equipment_cache = {1: [Mock(room_id=1, equipment_name='Laser')]}
+    checker._is_room_suitable_impl = Mock(wraps=checker._is_room_suitable_impl)
+
+    assert checker.is_room_suitable_for_surgery(1, 3)
+    assert checker.is_room_suitable_for_surgery(1, 3)
+    assert checker._is_room_suitable_impl.call_count == 1
+
+    # The room loses its laser
+    checker.invalidate_suitability_cache()
+    checker.room_equipment_cache[1] = []
+    assert not checker.is_room_suitable_for_surgery(1, 3)
+    assert checker._is_room_suitable_impl.call_count == 2
+
+
+def test_solving_binds_surgeons_for_the_duration_of_a_solve(checker):
+    """Test that a solve resolves surgeons once and releases them afterwards."""
+    start = datetime(2024, 1, 1, 9, 0)
+    checker.surgeries_cache[2] = Mock(surgery_id=2, surgeon_id=None, surgery_type_id=None)
+    solution = [
+        SurgeryRoomAssignment(surgery_id=1, room_id=1, start_time=start, end_time=start + timedelta(hours=1)),
+        SurgeryRoomAssignment(surgery_id=2, room_id=2, start_time=start, end_time=start + timedelta(hours=1))
+    ]
+    checker._assignment_surgeon_id = Mock(wraps=checker._assignment_surgeon_id)
+
+    with checker.solving([checker.surgeries_cache[1], checker.surgeries_cache[2]]):
+        assert checker.solve_surgeon_ids == {1: None, 2: None}
+        assert checker.check_solution_feasibility(solution)
+    checker._assignment_surgeon_id.assert_not_called()
+    assert checker.solve_surgeon_ids is None
+
+
+def test_is_feasible_scans_only_indexed_room_and_surgeon_assignments(checker):
+    """Test that an assignment index limits the conflict scans to the same room and surgeon."""
+    start = datetime(2024, 1, 1, 9, 0)
+    end = start + timedelta(hours=1)
+    checker.surgeries_cache[2] = Mock(surgery_id=2, surgeon_id=None, surgery_type_id=None)
+    booked = SurgeryRoomAssignment(surgery_id=2, room_id=1, start_time=start, end_time=end)
+    index = checker.group_assignments([booked])
+    assert index == ({1: [booked]}, {})
+
+    checker.is_room_available = Mock(wraps=checker.is_room_available)
+    assert not checker.is_feasible(1, 1, start, end, [booked], assignment_index=index)
+    assert checker.is_feasible(1, 2, start, end, [booked], assignment_index=index)
+    assert checker.is_room_available.call_args.args[3] == []
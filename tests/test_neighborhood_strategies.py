@@ -0,0 +1,51 @@
+"""
+Tests for the neighborhood generation strategies.
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models import SurgeryRoomAssignment
+from neighborhood_strategies import NeighborhoodStrategies
+
+
+def test_room_moves_skip_incompatible_rooms():
+    """Test that rooms unsuitable for the surgery are never proposed."""
+    surgeries = [Mock(surgery_id=1, surgery_type_id=1)]
+    rooms = [Mock(room_id=1), Mock(room_id=2), Mock(room_id=3)]
+    feasibility_checker = Mock()
+    feasibility_checker.is_room_suitable_for_surgery.side_effect = lambda room_id, surgery_id: room_id != 2
+    feasibility_checker.check_solution_feasibility.return_value = True
+    strategies = NeighborhoodStrategies(None, surgeries, rooms, feasibility_checker)
+
+    start = datetime(2024, 1, 1, 8, 0)
+    solution = [SurgeryRoomAssignment(
+        surgery_id=1, room_id=1, start_time=start, end_time=start + timedelta(hours=1)
+    )]
+    neighbors = strategies._strategy_move_to_different_room(solution)
+
+    assert [n['move'] for n in neighbors] == [('move_room', 1, 1, 3)]
+    assert strategies.compatible_pairs == {(1, 1), (1, 3)}
+    assert feasibility_checker.is_room_suitable_for_surgery.call_count == 3
+
+
+def test_copy_assignment_is_independent():
+    """Test that copied assignments carry the column values and can be changed freely."""
+    start = datetime(2024, 1, 1, 8, 0)
+    original = SurgeryRoomAssignment(
+        assignment_id=7, surgery_id=1, room_id=1, start_time=start, end_time=start + timedelta(hours=1)
+    )
+
+    copied = NeighborhoodStrategies._copy_assignment(original)
+    copied.room_id = 2
+
+    assert copied is not original
+    assert (copied.assignment_id, copied.surgery_id, copied.start_time, copied.end_time) == (
+        7, 1, start, start + timedelta(hours=1)
+    )
+    assert original.room_id == 1
@@ -4,7 +4,7 @@ from datetime import datetime, timedelta
 
 from simple_models import Surgery, OperatingRoom, SurgeryRoomAssignment
 from scheduler_utils import SchedulerUtils, DatetimeWrapper
-from tabu_optimizer import TabuOptimizer
+from tabu_optimizer import TabuOptimizer, TabuList
 from simple_feasibility_checker import FeasibilityChecker
 
 class TestTabuOptimizer(unittest.TestCase):
@@ -129,5 +129,30 @@ class TestTabuOptimizer(unittest.TestCase):
             self.assertTrue(hasattr(assignment, 'start_time'))
             self.assertTrue(hasattr(assignment, 'end_time'))
 
+class TestTabuList(unittest.TestCase):
+    def test_moves_expire_after_their_tenure(self):
+        tabu_list = TabuList(default_tenure=5)
+        tabu_list.add(('shift_time', 1, 15), tenure=2)
+        tabu_list.add(('shift_time', 2, 15), tenure=3)
+
+        tabu_list.decrement_tenure()
+        self.assertTrue(tabu_list.is_tabu(('shift_time', 1, 15)))
+        self.assertEqual(tabu_list.get_tenure(('shift_time', 2, 15)), 2)
+
+        tabu_list.decrement_tenure()
+        self.assertFalse(tabu_list.is_tabu(('shift_time', 1, 15)))
+        self.assertEqual(len(tabu_list.tabu_items), 1)
+
+    def test_re_adding_a_move_replaces_its_expiry(self):
+        tabu_list = TabuList(default_tenure=5)
+        tabu_list.add('move', tenure=1)
+        tabu_list.add('move', tenure=3)
+
+        tabu_list.decrement_tenure()
+        self.assertEqual(tabu_list.get_tenure('move'), 2)
+
+        tabu_list.increase_all_tenures(factor=2, duration=10)
+        self.assertEqual(tabu_list.get_tenure('move'), 4)
+
 if __name__ == '__main__':
     unittest.main()